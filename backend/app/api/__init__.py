@@ -1,6 +1,6 @@
 """
 API package initialization.
 """
-from app.api import health, statistics, data, query
+from app.api import health, statistics, data, query, pool, metrics
 
-__all__ = ['health', 'statistics', 'data', 'query']
+__all__ = ['health', 'statistics', 'data', 'query', 'pool', 'metrics']
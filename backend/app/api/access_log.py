@@ -0,0 +1,161 @@
+"""
+Structured, sampled access logging.
+
+``AccessLogMiddleware`` writes at most one JSON line per request to the
+``app.access`` logger: a ``ACCESS_LOG_SAMPLE_RATE`` fraction of ordinary
+requests, plus every request slower than ``ACCESS_LOG_SLOW_MS`` or answered
+with a 5xx. ``setup_logging()`` sends every log record through a
+``QueueHandler``; formatting and stream I/O happen on a ``QueueListener``
+thread, so logging never blocks the event loop.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from typing import Optional
+
+from app.metrics import current_timings, route_template
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+ACCESS_LOGGER_NAME = "app.access"
+
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` that enqueues records unformatted.
+
+    The stock handler formats each record in the emitting thread; here the
+    listener thread does it. Callers must not mutate objects passed as
+    message arguments or ``extra`` after logging them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class AccessLogFormatter(logging.Formatter):
+    """Renders ``app.access`` records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"ts": self.formatTime(record), "level": record.levelname}
+        entry.update(getattr(record, "access", {}))
+        return json.dumps(entry, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def _is_access(record: logging.LogRecord) -> bool:
+    return record.name == ACCESS_LOGGER_NAME
+
+
+def _is_not_access(record: logging.LogRecord) -> bool:
+    return record.name != ACCESS_LOGGER_NAME
+
+
+def setup_logging(level: int):
+    """
+    Route all logging through a queue drained by a background listener thread.
+
+    Application records keep the usual text format at ``level``; access
+    records are always emitted (sampling is decided by the middleware) as JSON.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    app_handler = logging.StreamHandler()
+    app_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    app_handler.addFilter(_is_not_access)
+
+    access_handler = logging.StreamHandler()
+    access_handler.setFormatter(AccessLogFormatter())
+    access_handler.addFilter(_is_access)
+
+    log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+    access_logger.setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, app_handler, access_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware emitting sampled single-line access records.
+
+    Status and response size are read from the outgoing ASGI messages, so
+    streaming responses are measured until their last chunk.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_ms: float = 1000.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            slow = duration_ms >= self.slow_ms
+            if slow or status >= 500 or random.random() < self.sample_rate:
+                client = scope.get("client")
+                entry = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route_template(scope),
+                    "query": scope.get("query_string", b"").decode("latin-1") or None,
+                    "status": status,
+                    "duration_ms": round(duration_ms, 2),
+                    "bytes": size,
+                    "client": client[0] if client else None,
+                    "slow": slow,
+                    "sample_rate": self.sample_rate
+                }
+                # Phase breakdown collected by MetricsMiddleware, when it wraps this one
+                timings = current_timings()
+                if timings is not None:
+                    entry["phases_ms"] = {
+                        phase: round(seconds * 1000, 2)
+                        for phase, seconds in timings.breakdown(duration_ms / 1000).items()
+                    }
+                access_logger.log(
+                    logging.WARNING if slow or status >= 500 else logging.INFO,
+                    "access",
+                    extra={"access": entry}
+                )
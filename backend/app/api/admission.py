@@ -0,0 +1,49 @@
+"""
+Request admission per workload class (see ``app.services.admission``).
+"""
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+from app.services.admission import AdmissionRejected, admission_controller
+
+
+@asynccontextmanager
+async def admitted(workload: str):
+    """
+    Hold a slot of ``workload`` for the body of the ``async with`` block.
+
+    Used directly by endpoints that only need the slot around their database
+    work; shed requests get 503 with a ``Retry-After`` header.
+    """
+    if not admission_controller.enabled:
+        yield
+        return
+    workload_class = admission_controller.get(workload)
+    try:
+        await workload_class.acquire()
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy: {e}. Retry later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        workload_class.release(time.perf_counter() - start)
+
+
+def admission_slot(workload: str):
+    """
+    Router or endpoint dependency holding a slot of ``workload`` while the
+    request is handled (until its response, streamed or not, has been sent).
+
+    Shed requests get 503 with a ``Retry-After`` header.
+    """
+    async def hold_admission_slot():
+        async with admitted(workload):
+            yield
+    return hold_admission_slot
@@ -3,16 +3,22 @@ AI Analysis API endpoints
 Provides endpoints for AI-powered data analysis with statistical context.
 """
 import logging
-import re
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 
-from app.database.connection import get_db_connection
+from app.api.admission import admitted
+from app.api.disconnect import run_until_disconnect
+from app.config import settings
+from app.database.connection import is_call_timeout, is_query_error, run_with_connection, statement_timeout
+from app.metrics import PHASE_DB, phase_timer
+from app.services.admission import AI
 from app.services.ai_analysis_service import AIAnalysisService
+from app.services.sql_validator import apply_row_limit, validate_select_query
+from app.services.workload import query_workload
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(statement_timeout(settings.DB_CALL_TIMEOUT_ADHOC_MS))])
 
 # Initialize AI service
 ai_service = AIAnalysisService()
@@ -27,32 +33,35 @@ class AIAnalysisRequest(BaseModel):
     @validator('query')
     def validate_query(cls, v):
         """Validate that the query is safe to execute."""
-        query_upper = v.upper().strip()
-        
-        # Solo permitir SELECT
-        if not query_upper.startswith('SELECT'):
-            raise ValueError("Only SELECT queries are allowed")
-        
-        # Prohibir palabras clave peligrosas
-        dangerous_keywords = [
-            'DROP', 'DELETE', 'TRUNCATE', 'INSERT', 'UPDATE', 
-            'CREATE', 'ALTER', 'GRANT', 'REVOKE', 'EXECUTE',
-            'EXEC', 'CALL', 'MERGE', 'RENAME'
-        ]
-        
-        for keyword in dangerous_keywords:
-            # Buscar la palabra clave como palabra completa
-            pattern = r'\b' + keyword + r'\b'
-            if re.search(pattern, query_upper):
-                raise ValueError(f"Keyword '{keyword}' is not allowed in queries")
-        
-        # Prohibir múltiples statements (;)
-        if ';' in v.strip().rstrip(';'):
-            raise ValueError("Multiple statements are not allowed")
-        
+        validate_select_query(v)
         return v
 
 
+def _fetch_analysis_rows(connection, query: str) -> List[Dict[str, Any]]:
+    """
+    Execute the analysis query and return rows as dicts.
+    Runs on the DB executor via ``run_with_connection``.
+    """
+    cursor = connection.cursor()
+    try:
+        with phase_timer(PHASE_DB), query_workload.track("ai", query) as execution:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            execution.rows = len(rows)
+        columns = [desc[0] for desc in cursor.description]
+    finally:
+        cursor.close()
+    
+    # Transform to list of dicts
+    data = []
+    for row in rows:
+        row_dict = {}
+        for i, value in enumerate(row):
+            row_dict[columns[i]] = value
+        data.append(row_dict)
+    return data
+
+
 class AIAnalysisResponse(BaseModel):
     """Response model for AI analysis."""
     success: bool
@@ -65,8 +74,8 @@ class AIAnalysisResponse(BaseModel):
 
 @router.post("/analyze", response_model=AIAnalysisResponse)
 async def analyze_with_ai(
-    request: AIAnalysisRequest,
-    connection=Depends(get_db_connection)
+    http_request: Request,
+    request: AIAnalysisRequest
 ):
     """
     Analyze data with AI-powered insights.
@@ -79,38 +88,21 @@ async def analyze_with_ai(
     
     Args:
         request: AIAnalysisRequest with query and optional question
-        connection: Database connection (injected)
         
     Returns:
         AIAnalysisResponse with statistics and AI insights
     """
     try:
         # La validación se hace automáticamente por Pydantic en el modelo
-        logger.info(f"AI Analysis requested for query: {request.query[:100]}...")
-        
-        # Execute query
-        cursor = connection.cursor()
+        logger.debug("AI Analysis requested for query: %s...", request.query[:100])
         
         # Add limit to query if not present
-        query = request.query.strip()
-        if not any(keyword in query.upper() for keyword in ['FETCH FIRST', 'ROWNUM', 'LIMIT']):
-            query += f" FETCH FIRST {request.limit} ROWS ONLY"
-        
-        cursor.execute(query)
-        
-        # Fetch results
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        # Transform to list of dicts
-        data = []
-        for row in rows:
-            row_dict = {}
-            for i, value in enumerate(row):
-                row_dict[columns[i]] = value
-            data.append(row_dict)
+        query = apply_row_limit(request.query.strip(), request.limit)
         
-        cursor.close()
+        # Execute query on the DB executor (cancelled if the client disconnects).
+        # The AI admission slot covers only this step, not the LLM call below.
+        async with admitted(AI):
+            data = await run_until_disconnect(http_request, run_with_connection(_fetch_analysis_rows, query))
         
         if not data:
             raise HTTPException(
@@ -118,7 +110,7 @@ async def analyze_with_ai(
                 detail="Query returned no results. Cannot perform analysis."
             )
         
-        logger.info(f"Query returned {len(data)} rows. Analyzing...")
+        logger.debug("Query returned %d rows. Analyzing...", len(data))
         
         # Perform AI analysis
         analysis_result = await ai_service.analyze_data(
@@ -127,7 +119,7 @@ async def analyze_with_ai(
             user_question=request.user_question
         )
         
-        logger.info("AI analysis completed successfully")
+        logger.debug("AI analysis completed successfully")
         
         return AIAnalysisResponse(
             success=True,
@@ -141,6 +133,15 @@ async def analyze_with_ai(
     except HTTPException:
         raise
     except Exception as e:
+        if is_call_timeout(e):
+            logger.warning(f"AI analysis query timed out: {str(e)}")
+            raise HTTPException(
+                status_code=504,
+                detail=f"Query exceeded the {settings.DB_CALL_TIMEOUT_ADHOC_MS} ms statement timeout"
+            )
+        if is_query_error(e):
+            logger.warning(f"AI analysis query rejected by the database: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
         logger.error(f"AI analysis failed: {str(e)}")
         raise HTTPException(
             status_code=500,
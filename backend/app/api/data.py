@@ -1,19 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
+from typing import List, Optional
 import oracledb
 
+from app.api.admission import admission_slot
+from app.api.responses import FastJSONResponse
 from app.models.schemas import PacienteResumen, IngresoResumen, ErrorResponse
-from app.database.connection import get_db_connection
+from app.database.connection import get_async_db_connection
+from app.services.admission import DATA
 from app.services.health_data_service import HealthDataService
 
-router = APIRouter(prefix="/data", tags=["Data"])
+router = APIRouter(
+    prefix="/data",
+    tags=["Data"],
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(admission_slot(DATA))]
+)
+
+# Response header carrying the continuation token of keyset-paginated lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.get(
     "/pacientes",
     response_model=List[PacienteResumen],
     summary="Get patients list",
-    description="Retrieve a paginated list of patients from the database.",
+    description="Retrieve a paginated list of patients from the database. "
+                "Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next page.",
     responses={
         200: {"description": "Successfully retrieved patients list"},
         400: {"model": ErrorResponse, "description": "Invalid pagination parameters"},
@@ -21,9 +33,10 @@ router = APIRouter(prefix="/data", tags=["Data"])
     }
 )
 async def get_pacientes(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored when cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    connection=Depends(get_db_connection)
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page's X-Next-Cursor header"),
+    connection=Depends(get_async_db_connection)
 ):
     """
     Get paginated list of patients.
@@ -31,13 +44,18 @@ async def get_pacientes(
     Parameters:
     - skip: Number of records to skip (default: 0)
     - limit: Maximum number of records to return (default: 100, max: 1000)
+    - cursor: Continuation token; seeks directly past the previous page, so deep pages cost the same as the first
     
     Returns:
     - List of patient summaries with name, age, sex, community, and birth date
+    - X-Next-Cursor header with the token for the next page (absent on the last page)
     """
     try:
-        results = HealthDataService.get_pacientes_list(connection, skip, limit)
-        return results
+        results, next_cursor = await HealthDataService.get_pacientes_page_async(connection, limit, cursor, skip)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return FastJSONResponse(results, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -57,7 +75,7 @@ async def get_pacientes(
 async def get_diagnosticos(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    connection=Depends(get_db_connection)
+    connection=Depends(get_async_db_connection)
 ):
     """
     Get paginated list of diagnoses grouped by principal diagnosis.
@@ -70,8 +88,8 @@ async def get_diagnosticos(
     - List of unique diagnoses with category and case count
     """
     try:
-        results = HealthDataService.get_diagnosticos_list(connection, skip, limit)
-        return results
+        results = await HealthDataService.get_diagnosticos_list_async(connection, skip, limit)
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -82,7 +100,8 @@ async def get_diagnosticos(
     "/ingresos",
     response_model=List[IngresoResumen],
     summary="Get hospital admissions list",
-    description="Retrieve a paginated list of hospital admissions from the database.",
+    description="Retrieve a paginated list of hospital admissions from the database, newest first. "
+                "Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next page.",
     responses={
         200: {"description": "Successfully retrieved admissions list"},
         400: {"model": ErrorResponse, "description": "Invalid pagination parameters"},
@@ -90,9 +109,10 @@ async def get_diagnosticos(
     }
 )
 async def get_ingresos(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored when cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    connection=Depends(get_db_connection)
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page's X-Next-Cursor header"),
+    connection=Depends(get_async_db_connection)
 ):
     """
     Get paginated list of hospital admissions.
@@ -100,13 +120,18 @@ async def get_ingresos(
     Parameters:
     - skip: Number of records to skip (default: 0)
     - limit: Maximum number of records to return (default: 100, max: 1000)
+    - cursor: Continuation token; seeks directly past the previous page, so deep pages cost the same as the first
     
     Returns:
     - List of admissions with patient name, dates, diagnosis, service, etc.
+    - X-Next-Cursor header with the token for the next page (absent on the last page)
     """
     try:
-        results = HealthDataService.get_ingresos_list(connection, skip, limit)
-        return results
+        results, next_cursor = await HealthDataService.get_ingresos_page_async(connection, limit, cursor, skip)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return FastJSONResponse(results, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -0,0 +1,51 @@
+"""
+Stop request work when the HTTP client goes away.
+
+Starlette does not notice a disconnect until it writes the response, so a
+slow ad-hoc query keeps its pooled connection busy for a browser that has
+already given up. ``run_until_disconnect`` awaits the work while polling
+``request.is_disconnected()``; on disconnect it cancels the work, which
+makes ``run_with_connection`` cancel the running statement, and answers
+499 (Client Closed Request) for the access log and metrics.
+"""
+import asyncio
+import logging
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLIENT_CLOSED_REQUEST = 499
+
+T = TypeVar("T")
+
+
+async def run_until_disconnect(request: Request, work: Awaitable[T]) -> T:
+    """
+    Await ``work``, cancelling it if the client disconnects first.
+
+    Raises:
+        HTTPException: 499 when the client disconnected
+    """
+    task = asyncio.ensure_future(work)
+    if not settings.CANCEL_ON_CLIENT_DISCONNECT:
+        return await task
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.CLIENT_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    task.cancel()
+    await asyncio.wait({task})
+    if not task.cancelled():
+        task.exception()  # finished (or failed) before the cancellation landed
+    logger.warning("Client disconnected from %s; its database work was cancelled", request.url.path)
+    raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
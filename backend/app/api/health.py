@@ -3,7 +3,7 @@ from datetime import datetime
 import oracledb
 
 from app.models.schemas import HealthStatus
-from app.database.connection import get_db_connection
+from app.database.connection import get_async_db_connection
 from app.config import settings
 from app.services.health_data_service import HealthDataService
 
@@ -16,7 +16,7 @@ router = APIRouter(tags=["Health"])
     summary="Health check endpoint",
     description="Check the health status of the API and database connection."
 )
-async def health_check(connection=Depends(get_db_connection)):
+async def health_check(connection=Depends(get_async_db_connection)):
     """
     Health check endpoint.
     
@@ -32,12 +32,12 @@ async def health_check(connection=Depends(get_db_connection)):
     
     try:
         cursor = connection.cursor()
-        cursor.execute("SELECT 1 FROM DUAL")
-        cursor.fetchone()
+        await cursor.execute("SELECT 1 FROM DUAL")
+        await cursor.fetchone()
         cursor.close()
         
         # Get total records count
-        total_registros = HealthDataService.count_total_registros(connection)
+        total_registros = await HealthDataService.count_total_registros_async(connection)
     except oracledb.Error:
         db_status = "disconnected"
     except Exception:
@@ -0,0 +1,144 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.config import settings
+from app.database.connection import db_connection, db_executor
+from app.metrics import format_family, render_request_metrics
+from app.services.admission import admission_controller
+from app.services.cache import query_cache, statistics_cache
+from app.services.refresher import statistics_refresher
+from app.services.single_flight import query_flight, statistics_flight
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _pool_metrics() -> List[str]:
+    """Connection pool occupancy and acquire counters."""
+    stats = db_connection.stats()
+    occupancy = []
+    for pool in ("pool", "async_pool"):
+        if stats[pool]:
+            occupancy += [((pool, state), stats[pool][state]) for state in ("opened", "busy", "min", "max")]
+    acquires = []
+    for pool, key in (("pool", "acquire"), ("async_pool", "async_acquire")):
+        metrics = getattr(db_connection, f"{key}_metrics")
+        for outcome, value in (("acquired", metrics.acquired), ("timeout", metrics.timeouts), ("error", metrics.errors)):
+            acquires.append(((pool, outcome), value))
+    
+    executor = db_executor.stats()
+    lines = format_family(
+        "db_pool_connections", "Pool connections by state (opened, busy) and configured limits.",
+        "gauge", ("pool", "state"), occupancy
+    )
+    lines += format_family(
+        "db_pool_max_sessions", "Configured session limit per pool (ORACLE_POOL_MAX split between the pools).",
+        "gauge", ("pool",),
+        [(("total",), settings.ORACLE_POOL_MAX), (("pool",), settings.oracle_blocking_pool_max),
+         (("async_pool",), settings.oracle_async_pool_max)]
+    )
+    lines += format_family(
+        "db_pool_acquires_total", "Pool acquire attempts by outcome.",
+        "counter", ("pool", "outcome"), acquires
+    )
+    lines += format_family(
+        "db_executor_tasks", "DB executor tasks waiting for or holding a worker.",
+        "gauge", ("state",), [(("queued",), executor["queue_depth"]), (("running",), executor["running"])]
+    )
+    lines += format_family(
+        "db_executor_tasks_total", "DB executor tasks by outcome.",
+        "counter", ("outcome",),
+        [(("submitted",), executor["submitted"]), (("completed",), executor["completed"]),
+         (("cancelled",), executor["cancelled"])]
+    )
+    lines += format_family(
+        "db_executor_workers", "DB executor worker threads.", "gauge", (), [((), executor["max_workers"])]
+    )
+    return lines
+
+
+def _cache_metrics() -> List[str]:
+    """Result cache, single-flight and background refresh counters."""
+    caches = [statistics_cache.cache.stats(), query_cache.stats()]
+    lines = format_family(
+        "cache_lookups_total", "Result cache lookups by outcome.", "counter", ("cache", "result"),
+        [((c["name"], result), c[key]) for c in caches for result, key in (("hit", "hits"), ("miss", "misses"))]
+    )
+    lines += format_family(
+        "cache_hit_ratio", "Result cache hits over lookups since start.", "gauge", ("cache",),
+        [((c["name"],), c["hit_ratio"]) for c in caches]
+    )
+    lines += format_family(
+        "cache_entries", "Entries held by each result cache.", "gauge", ("cache",),
+        [((c["name"],), c["entries"]) for c in caches]
+    )
+    lines += format_family(
+        "cache_bytes", "Approximate size of each result cache.", "gauge", ("cache",),
+        [((c["name"],), c["bytes"]) for c in caches]
+    )
+    lines += format_family(
+        "cache_evictions_total", "Entries evicted to stay under the size limit.", "counter", ("cache",),
+        [((c["name"],), c["evictions"]) for c in caches]
+    )
+    lines += format_family(
+        "cache_stale_served_total", "Statistics served stale while being refreshed.", "counter", (),
+        [((), statistics_cache.stale_served)]
+    )
+    
+    flights = [statistics_flight, query_flight]
+    lines += format_family(
+        "single_flight_calls_total", "Single-flight calls that executed or joined an in-flight call.",
+        "counter", ("flight", "outcome"),
+        [((f.name, outcome), getattr(f, outcome)) for f in flights for outcome in ("executions", "coalesced")]
+    )
+    
+    refresher = statistics_refresher.stats()
+    lines += format_family(
+        "statistics_refreshes_total", "Background statistics refresh runs by outcome.", "counter", ("outcome",),
+        [(("ok",), refresher["refreshes"]), (("failed",), refresher["failures"])]
+    )
+    return lines
+
+
+def _admission_metrics() -> List[str]:
+    """Admission control occupancy and outcomes per workload class."""
+    classes = admission_controller.stats()["classes"]
+    lines = format_family(
+        "admission_requests", "Requests holding a slot or queued, per workload class.",
+        "gauge", ("workload", "state"),
+        [((name, state), c[key]) for name, c in classes.items()
+         for state, key in (("running", "running"), ("queued", "queue_depth"))]
+    )
+    lines += format_family(
+        "admission_requests_total", "Admission decisions per workload class.",
+        "counter", ("workload", "outcome"),
+        [((name, outcome), c[key]) for name, c in classes.items()
+         for outcome, key in (("admitted", "admitted"), ("queue_full", "rejected_queue_full"),
+                              ("timeout", "rejected_timeout"))]
+    )
+    return lines
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Request counts, latency and phase histograms per route, pool gauges and cache hit ratios.",
+    response_class=Response
+)
+async def get_metrics():
+    """
+    Metrics in the Prometheus text exposition format.
+    
+    Returns:
+    - Request counts by route, method and status
+    - Latency histograms by route, and per phase (db_acquire, db_execute, processing, serialization)
+    - Pool occupancy, acquire outcomes and DB executor queue
+    - Cache hit ratios, single-flight and background refresh counters
+    - Admission control occupancy and shed requests per workload class
+    """
+    lines = render_request_metrics() + _pool_metrics() + _cache_metrics() + _admission_metrics()
+    lines.append("")
+    return Response("\n".join(lines), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from app.database.connection import db_connection, db_executor
+from app.services.admission import admission_controller
+from app.services.query_log import query_log
+
+router = APIRouter(prefix="/pool", tags=["Pool"])
+
+
+@router.get(
+    "/stats",
+    summary="Connection pool statistics",
+    description="Pool configuration, opened/busy connections, acquire wait percentiles, timeouts and DB executor queue."
+)
+async def get_pool_stats():
+    """
+    Get connection pool statistics.
+    
+    Returns:
+    - Effective pool configuration (sizing, getmode, wait timeout, ping interval, statement cache)
+    - Opened and busy connections for the blocking and asyncio pools
+    - Acquire counts, timeouts, errors and wait time percentiles (ms)
+    - DB executor queue depth and queue wait times
+    """
+    stats = db_connection.stats()
+    stats["executor"] = db_executor.stats()
+    return stats
+
+
+@router.get(
+    "/queries",
+    summary="Service query log",
+    description="Per-statement totals and the slowest executions of the dashboard, data and export queries."
+)
+async def get_query_log(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of slowest executions returned")
+):
+    """
+    Get the service-layer query log.
+    
+    Returns:
+    - Per statement (by total time): SQL id, name, text, calls, errors, rows,
+      estimated round trips, execute/fetch/total/mean/max time (ms)
+    - Slowest executions: SQL id, name, bind names and types, rows, round trips,
+      execute/fetch time and timestamp
+    """
+    return query_log.stats(limit)
+
+
+@router.get(
+    "/admission",
+    summary="Admission control status",
+    description="Concurrency budget, queue depth, admitted and shed requests per workload class."
+)
+async def get_admission_stats():
+    """
+    Get admission control statistics.
+    
+    Returns per workload class (statistics, data, query, ai):
+    - Concurrency budget, queue size and max queue wait
+    - Running requests and queue depth
+    - Admitted, queued and shed requests (queue full / wait expired)
+    - Average and maximum queue wait and average slot hold time (ms)
+    """
+    return admission_controller.stats()
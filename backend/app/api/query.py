@@ -1,16 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Tuple, Union
 from pydantic import BaseModel, Field, validator
+from datetime import datetime
 import oracledb
+import anyio
+import csv
+import io
+import json
 import logging
-import re
+import time
 
-from app.database.connection import get_db_connection
+from app.api.admission import admission_slot
+from app.api.disconnect import run_until_disconnect
+from app.api.responses import FastJSONResponse
+from app.config import settings
+from app.database.connection import (
+    db_connection, is_call_timeout, is_query_error, native_types_handler, run_with_connection, statement_timeout
+)
+from app.metrics import PHASE_DB, phase_timer
+from app.services.admission import QUERY
+from app.services.arrow_format import (
+    BINARY_MEDIA_TYPES, PYARROW_MISSING_DETAIL, ArrowBatchWriter, arrow_available, negotiate_binary_format
+)
+from app.services.cache import MISSING, dataset_version, query_cache, query_cache_key
+from app.services.query_log import query_log
+from app.services.single_flight import query_flight
+from app.services.sql_validator import apply_row_limit, parameterize_literals, validate_select_query
+from app.services.workload import SORT_KEYS, query_workload
 from app.models.schemas import ErrorResponse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/query", tags=["Custom Queries"])
+router = APIRouter(
+    prefix="/query",
+    tags=["Custom Queries"],
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(statement_timeout(settings.DB_CALL_TIMEOUT_ADHOC_MS))]
+)
+
+
+RESULT_FORMATS = ("rows", "columnar")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    **BINARY_MEDIA_TYPES
+}
+
+# Rows per Arrow record batch / Parquet row group in /query/execute
+ARROW_BATCH_SIZE = 1000
 
 
 class SQLQueryRequest(BaseModel):
@@ -18,33 +57,45 @@ class SQLQueryRequest(BaseModel):
     query: str = Field(..., description="SQL query to execute", min_length=10, max_length=5000)
     params: Optional[Dict[str, Any]] = Field(None, description="Query parameters for prepared statements")
     limit: Optional[int] = Field(100, description="Maximum number of rows to return", ge=1, le=10000)
+    use_cache: bool = Field(True, description="Serve identical queries from the result cache while the dataset is unchanged")
+    format: str = Field("rows", description="Result layout: 'rows' (one object per row) or 'columnar' (columns, types and row arrays)")
+    parameterize: Optional[bool] = Field(None, description="Rewrite literals into bind variables before execution (default: QUERY_AUTO_PARAMETERIZE)")
     
     @validator('query')
     def validate_query(cls, v):
         """Validate that the query is safe to execute."""
-        query_upper = v.upper().strip()
-        
-        # Solo permitir SELECT
-        if not query_upper.startswith('SELECT'):
-            raise ValueError("Only SELECT queries are allowed")
-        
-        # Prohibir palabras clave peligrosas
-        dangerous_keywords = [
-            'DROP', 'DELETE', 'TRUNCATE', 'INSERT', 'UPDATE', 
-            'CREATE', 'ALTER', 'GRANT', 'REVOKE', 'EXECUTE',
-            'EXEC', 'CALL', 'MERGE', 'RENAME'
-        ]
-        
-        for keyword in dangerous_keywords:
-            # Buscar la palabra clave como palabra completa
-            pattern = r'\b' + keyword + r'\b'
-            if re.search(pattern, query_upper):
-                raise ValueError(f"Keyword '{keyword}' is not allowed in queries")
-        
-        # Prohibir múltiples statements (;)
-        if ';' in v.strip().rstrip(';'):
-            raise ValueError("Multiple statements are not allowed")
-        
+        validate_select_query(v)
+        return v
+    
+    @validator('format')
+    def validate_format(cls, v):
+        """Validate the result layout."""
+        v = v.lower()
+        if v not in RESULT_FORMATS:
+            raise ValueError(f"Unsupported format '{v}' (use one of: {', '.join(RESULT_FORMATS)})")
+        return v
+
+
+class SQLExportRequest(BaseModel):
+    """Request model for streamed exports of custom SQL queries."""
+    query: str = Field(..., description="SQL query to export", min_length=10, max_length=5000)
+    params: Optional[Dict[str, Any]] = Field(None, description="Query parameters for prepared statements")
+    format: str = Field("csv", description="Output format: csv, ndjson, arrow (Arrow IPC stream) or parquet")
+    limit: Optional[int] = Field(None, description="Optional maximum number of rows (no limit by default)", ge=1)
+    batch_size: int = Field(1000, description="Rows fetched from the database per round trip", ge=1, le=50000)
+    
+    @validator('query')
+    def validate_query(cls, v):
+        """Validate that the query is safe to execute."""
+        validate_select_query(v)
+        return v
+    
+    @validator('format')
+    def validate_format(cls, v):
+        """Validate the export format."""
+        v = v.lower()
+        if v not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported format '{v}' (use one of: {', '.join(EXPORT_MEDIA_TYPES)})")
         return v
 
 
@@ -58,6 +109,357 @@ class SQLQueryResponse(BaseModel):
     message: Optional[str] = Field(None, description="Additional message or warning")
 
 
+class SQLQueryColumnarResponse(BaseModel):
+    """Response model for custom SQL queries with format=columnar."""
+    success: bool = Field(..., description="Whether the query executed successfully")
+    rows_returned: int = Field(..., description="Number of rows returned")
+    columns: List[str] = Field(..., description="Column names")
+    types: List[str] = Field(..., description="Column types: number, string, datetime, binary or unknown")
+    rows: List[List[Any]] = Field(..., description="Row values in column order")
+    query_executed: str = Field(..., description="The query that was executed")
+    message: Optional[str] = Field(None, description="Additional message or warning")
+
+
+# Columnas de SALUD_MENTAL_FEATURED (GET /query/schema)
+TABLE_SCHEMA_SQL = """
+SELECT 
+    COLUMN_NAME,
+    DATA_TYPE,
+    DATA_LENGTH,
+    NULLABLE
+FROM USER_TAB_COLUMNS
+WHERE TABLE_NAME = 'SALUD_MENTAL_FEATURED'
+ORDER BY COLUMN_ID
+"""
+
+
+def _fetch_custom_query(connection, query: str, params: Optional[Dict[str, Any]]):
+    """
+    Blocking part of a custom query: execute and fetch on a pooled connection.
+    Runs on the DB executor via ``run_with_connection``.
+    """
+    # Set autocommit for SELECT queries (should be read-only)
+    connection.autocommit = True
+    
+    cursor = connection.cursor()
+    try:
+        # Ejecutar query con o sin parámetros
+        with phase_timer(PHASE_DB), query_workload.track("query", query) as execution:
+            if params:
+                cursor.execute(query, **params)
+            else:
+                cursor.execute(query)
+            rows = cursor.fetchall()
+            execution.rows = len(rows)
+        
+        # Obtener nombres de columnas, tipos y resultados
+        columns = [desc[0] for desc in cursor.description]
+        types = _column_types(cursor.description, rows)
+    finally:
+        cursor.close()
+    
+    return columns, types, rows
+
+
+def _fetch_table_schema(connection) -> List[tuple]:
+    """
+    Column metadata of SALUD_MENTAL_FEATURED. Runs on the DB executor; kept
+    apart from ``_fetch_custom_query`` so it is not counted in the workload.
+    """
+    cursor = connection.cursor()
+    try:
+        with phase_timer(PHASE_DB):
+            cursor.execute(TABLE_SCHEMA_SQL)
+            return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _fetch_binary_query(connection, query: str, params: Optional[Dict[str, Any]], fmt: str) -> bytes:
+    """
+    Blocking Arrow IPC / Parquet variant of ``_fetch_custom_query``: each
+    ``fetchmany`` batch becomes one record batch, so rows never go through
+    per-value Python conversion.
+    """
+    connection.autocommit = True
+    
+    cursor = connection.cursor()
+    cursor.arraysize = ARROW_BATCH_SIZE
+    # Arrow wants typed dates/numbers, not the JSON-ready text of the connection handler
+    cursor.outputtypehandler = native_types_handler
+    try:
+        with query_workload.track("query", query) as execution:
+            with phase_timer(PHASE_DB):
+                if params:
+                    cursor.execute(query, **params)
+                else:
+                    cursor.execute(query)
+            
+            columns = [desc[0] for desc in cursor.description]
+            writer = ArrowBatchWriter(fmt, columns, cursor.description)
+            chunks = []
+            while True:
+                with phase_timer(PHASE_DB):
+                    rows = cursor.fetchmany(ARROW_BATCH_SIZE)
+                if not rows:
+                    break
+                chunks.append(writer.write(rows))
+            chunks.append(writer.close())
+            execution.rows = writer.rows_written
+    finally:
+        cursor.close()
+    
+    logger.debug("🏹 Resultado %s: %d filas", fmt, writer.rows_written)
+    return b"".join(chunks)
+
+
+def _column_types(description, rows: List[tuple]) -> List[str]:
+    """
+    Portable column types of the returned values.
+    
+    oracledb reports a DbType per column (DATE/TIMESTAMP are fetched as
+    datetime, CLOBs as str by the connection's output type handler);
+    backends without one (SQLite) get the type of the first non-NULL value
+    in the column.
+    """
+    types = []
+    for i, desc in enumerate(description):
+        type_code = desc[1]
+        if type_code is None:
+            sample = next((row[i] for row in rows if row[i] is not None), None)
+            if hasattr(sample, 'isoformat'):
+                types.append("datetime")
+            elif isinstance(sample, (bytes, bytearray)):
+                types.append("binary")
+            elif isinstance(sample, str):
+                types.append("string")
+            elif isinstance(sample, (int, float)):
+                types.append("number")
+            else:
+                types.append("unknown")
+        elif type_code == oracledb.NUMBER:
+            types.append("number")
+        elif type_code == oracledb.DATETIME:
+            types.append("datetime")
+        elif type_code == oracledb.STRING or type_code in (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_NCLOB):
+            types.append("string")
+        elif type_code == oracledb.BINARY:
+            types.append("binary")
+        else:
+            types.append("unknown")
+    return types
+
+
+def _to_text(value: Any) -> str:
+    return value.decode('utf-8', errors='ignore')
+
+
+# Conversión a JSON decidida una vez por columna (no por celda). Los números ya
+# llegan como int/float desde el output type handler de la conexión y las fechas
+# (datetime) las serializa FastJSONResponse en ISO 8601.
+TYPE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "binary": _to_text
+}
+
+
+def _convert_rows(types: List[str], rows: List[tuple]) -> List[Any]:
+    """
+    Convert only the columns whose type needs it; other values pass through.
+    Returns the fetched tuples untouched when no column needs conversion.
+    """
+    converters: List[Tuple[int, Callable[[Any], Any]]] = [
+        (i, TYPE_CONVERTERS[t]) for i, t in enumerate(types) if t in TYPE_CONVERTERS
+    ]
+    if not converters:
+        return rows
+    converted = []
+    for row in rows:
+        row = list(row)
+        for i, convert in converters:
+            if row[i] is not None:
+                row[i] = convert(row[i])
+        converted.append(row)
+    return converted
+
+
+def _rows_to_dicts(columns: List[str], types: List[str], rows: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Convert fetched rows to JSON-friendly dictionaries.
+    """
+    return [dict(zip(columns, row)) for row in _convert_rows(types, rows)]
+
+
+async def _execute_query(query: str, params: Optional[Dict[str, Any]], limit: int, result_format: str,
+                         cache_key: tuple, cache_version: Any):
+    """
+    Run a custom query on the DB executor and convert the rows.
+    
+    Shared by concurrent identical requests through ``query_flight``; the
+    result is stored in ``query_cache`` unless ``cache_version`` is MISSING.
+    """
+    columns, types, rows = await run_with_connection(_fetch_custom_query, query, params)
+    
+    if result_format == "columnar":
+        data = _convert_rows(types, rows)
+    else:
+        data = _rows_to_dicts(columns, types, rows)
+    logger.debug("📊 %d filas, %d columnas", len(data), len(columns))
+    
+    # Mensaje de advertencia si se alcanzó el límite
+    message = None
+    if len(data) == limit:
+        message = f"Results limited to {limit} rows. Use a more specific query or increase the limit."
+    
+    result = (columns, types, data, message)
+    if cache_version is not MISSING:
+        query_cache.put(cache_key, cache_version, result)
+    return result
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a fetched value for CSV/NDJSON export."""
+    if hasattr(value, 'isoformat'):  # datetime/date
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):  # binary
+        return value.decode('utf-8', errors='ignore')
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """``json.dumps`` fallback for dates, binary and Decimal values."""
+    converted = _export_value(value)
+    if converted is value:
+        return str(value)
+    return converted
+
+
+def _encode_csv(rows: List[tuple]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(columns: List[str], rows: List[tuple]) -> bytes:
+    lines = [
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False)
+        for row in rows
+    ]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _record_export(query: str, params: Optional[Dict[str, Any]], rows: int, round_trips: int,
+                   execute_s: float, fetch_s: float, error: Optional[Exception] = None):
+    """
+    Report an export to the workload fingerprints (source ``export``) and the
+    query log, as ``/query/execute`` and the service queries are. Both keep
+    a bounded number of entries, so arbitrary export SQL cannot grow them.
+    """
+    query_workload.record("export", query, execute_s + fetch_s, rows, failed=error is not None)
+    query_log.record(query, params, rows, round_trips, execute_s, fetch_s, error)
+
+
+class _ExportStream:
+    """
+    One running export: the executed cursor, its pooled connection and the
+    fetch counters.
+    
+    ``chunks()`` yields the export one ``fetchmany`` batch at a time, so
+    memory stays bounded by ``batch_size`` whatever the result size.
+    ``release()`` cancels an unfinished statement on the server, returns the
+    connection to the pool and records the execution (``execute_s`` plus the
+    time spent in fetches); it runs once, from the body's ``finally`` or,
+    when the body was never iterated, from ``_ExportResponse``.
+    """
+    
+    def __init__(self, connection, cursor, fmt: str, batch_size: int,
+                 query: str, params: Optional[Dict[str, Any]], execute_s: float):
+        self.connection = connection
+        self.cursor = cursor
+        self.columns = [desc[0] for desc in cursor.description]
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.query = query
+        self.params = params
+        self.execute_s = execute_s
+        self.rows_sent = 0
+        self.fetches = 0
+        self.fetch_s = 0.0
+        self.completed = False
+        self.released = False
+    
+    async def chunks(self) -> AsyncIterator[bytes]:
+        error = None
+        # Arrow/Parquet: one record batch (row group) per fetched batch
+        writer = (
+            ArrowBatchWriter(self.fmt, self.columns, self.cursor.description)
+            if self.fmt in BINARY_MEDIA_TYPES else None
+        )
+        try:
+            if self.fmt == "csv":
+                yield _encode_csv([tuple(self.columns)])
+            while True:
+                fetch_start = time.perf_counter()
+                try:
+                    with phase_timer(PHASE_DB):
+                        rows = await self.cursor.fetchmany(self.batch_size)
+                finally:
+                    self.fetches += 1
+                    self.fetch_s += time.perf_counter() - fetch_start
+                if not rows:
+                    break
+                self.rows_sent += len(rows)
+                if writer is not None:
+                    yield writer.write(rows)
+                else:
+                    yield _encode_csv(rows) if self.fmt == "csv" else _encode_ndjson(self.columns, rows)
+            if writer is not None:
+                yield writer.close()
+            self.completed = True
+            logger.debug("📦 Exportación completada: %d filas (%s)", self.rows_sent, self.fmt)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await self.release(error)
+    
+    async def release(self, error: Optional[BaseException] = None):
+        if self.released:
+            return
+        self.released = True
+        if not self.completed:
+            logger.warning(f"⚠️ Exportación interrumpida tras {self.rows_sent} filas; cancelando la consulta")
+            error = error or RuntimeError("export stream closed before the last batch")
+            try:
+                self.connection.cancel()
+            except Exception as e:
+                logger.warning(f"Could not cancel export statement: {str(e)}")
+        # Release the connection even while the request task is being cancelled
+        with anyio.CancelScope(shield=True):
+            self.cursor.close()
+            await self.connection.close()
+        _record_export(self.query, self.params, self.rows_sent, 1 + self.fetches, self.execute_s, self.fetch_s, error)
+
+
+class _ExportResponse(StreamingResponse):
+    """
+    ``StreamingResponse`` over an ``_ExportStream`` that releases it even if
+    the body is never iterated (client gone before the first chunk, failed
+    send of the headers), when the generator's ``finally`` would not run.
+    """
+    
+    def __init__(self, export: _ExportStream, **kwargs):
+        super().__init__(export.chunks(), **kwargs)
+        self.export = export
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.export.release()
+
+
 class QueryExample(BaseModel):
     """Example query model."""
     name: str = Field(..., description="Name of the example")
@@ -67,7 +469,8 @@ class QueryExample(BaseModel):
 
 @router.post(
     "/execute",
-    response_model=SQLQueryResponse,
+    response_model=Union[SQLQueryResponse, SQLQueryColumnarResponse],
+    dependencies=[Depends(admission_slot(QUERY))],
     summary="Execute custom SQL query",
     description="""
     Execute a custom SELECT query on the SALUD_MENTAL_FEATURED table.
@@ -83,20 +486,36 @@ class QueryExample(BaseModel):
     - Never use quotes for column names - all are plain SQL identifiers
     - Use parameters for dynamic values to prevent SQL injection
     - The limit parameter will be applied automatically if not in your query
+    - Use `"format": "columnar"` for large results: column names and types are
+      sent once and rows come as value arrays instead of one object per row
+    - Send `Accept: application/vnd.apache.arrow.stream` (or
+      `application/vnd.apache.parquet`) to receive the result as an Arrow IPC
+      stream (or Parquet file) instead of JSON; requires the optional `pyarrow`
+      package
+    - `"parameterize": true` rewrites literals (`EDAD > 50`, `'M'`) into bind
+      variables, so variants of the same query share one parsed statement;
+      `query_executed` shows the rewritten text
     """,
     responses={
-        200: {"description": "Query executed successfully"},
+        200: {
+            "description": "Query executed successfully",
+            "content": {"application/vnd.apache.arrow.stream": {}, "application/vnd.apache.parquet": {}}
+        },
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet requested but pyarrow is not installed"},
         400: {"model": ErrorResponse, "description": "Invalid query or parameters"},
-        500: {"model": ErrorResponse, "description": "Database error"}
+        500: {"model": ErrorResponse, "description": "Database error"},
+        503: {"model": ErrorResponse, "description": "Too many custom queries; retry after the Retry-After delay"},
+        504: {"model": ErrorResponse, "description": "Statement timeout (DB_CALL_TIMEOUT_ADHOC_MS) exceeded"}
     }
 )
 async def execute_custom_query(
+    http_request: Request,
     request: SQLQueryRequest = Body(..., example={
         "query": 'SELECT CATEGORIA, COUNT(*) as total FROM SALUD_MENTAL_FEATURED WHERE EDAD > :edad GROUP BY CATEGORIA ORDER BY total DESC',
         "params": {"edad": 50},
         "limit": 100
     }),
-    connection=Depends(get_db_connection)
+    accept: Optional[str] = Header(None, description="application/vnd.apache.arrow.stream or application/vnd.apache.parquet for a binary result")
 ):
     """
     Execute a custom SQL query with safety checks.
@@ -126,129 +545,228 @@ async def execute_custom_query(
        GROUP BY SERVICIO
        ```
     """
+    binary_format = negotiate_binary_format(accept)
+    if binary_format and not arrow_available():
+        raise HTTPException(status_code=406, detail=PYARROW_MISSING_DETAIL)
+    
     try:
         query = request.query.strip()
         
-        # Log detallado de la petición
-        logger.info("=" * 80)
-        logger.info("🔍 [CUSTOM QUERY] Nueva petición recibida")
-        logger.info(f"📝 Query original: {query}")
-        logger.info(f"🔑 Parámetros: {request.params}")
-        logger.info(f"📊 Límite: {request.limit}")
-        logger.info("=" * 80)
+        # Agregar FETCH FIRST si la consulta no limita ya sus filas (fuera de literales y comentarios)
+        query = apply_row_limit(query, request.limit)
         
-        # Agregar LIMIT si no está presente (para Oracle usamos FETCH FIRST)
-        query_upper = query.upper()
-        if 'FETCH FIRST' not in query_upper and 'ROWNUM' not in query_upper:
-            # Agregar limit automáticamente
-            query = f"{query} FETCH FIRST {request.limit} ROWS ONLY"
-            logger.info(f"➕ Límite añadido automáticamente: FETCH FIRST {request.limit} ROWS ONLY")
+        # Literales -> variables bind: las variantes de una misma consulta comparten cursor y clave de caché
+        params = request.params
+        parameterize = request.parameterize if request.parameterize is not None else settings.QUERY_AUTO_PARAMETERIZE
+        if parameterize:
+            query, params = parameterize_literals(query, params)
         
-        logger.info(f"✅ Query final a ejecutar: {query}")
+        logger.debug("🔍 [CUSTOM QUERY] %s | params=%s", query, params)
         
-        # Set autocommit for SELECT queries (should be read-only)
-        connection.autocommit = True
+        # Arrow IPC / Parquet: codificado directamente desde los lotes del cursor, sin caché JSON
+        if binary_format:
+            content = await run_until_disconnect(
+                http_request, run_with_connection(_fetch_binary_query, query, params, binary_format)
+            )
+            return Response(content=content, media_type=BINARY_MEDIA_TYPES[binary_format])
         
-        cursor = connection.cursor()
+        # Consultar la caché (texto normalizado + parámetros + límite, misma versión del dataset)
+        cached = MISSING
+        cache_key = query_cache_key(query, params, request.limit) + (request.format,)
+        version = MISSING
+        if request.use_cache:
+            version = await dataset_version.current()
+            cached = query_cache.get(cache_key, version)
         
-        try:
-            # Ejecutar query con o sin parámetros
-            if request.params:
-                logger.info(f"🔐 Ejecutando con parámetros: {request.params}")
-                cursor.execute(query, **request.params)
-            else:
-                logger.info("📝 Ejecutando sin parámetros")
-                cursor.execute(query)
-            
-            logger.info("✅ Query ejecutado, obteniendo metadatos...")
-            
-            # Obtener nombres de columnas
-            columns = [desc[0] for desc in cursor.description]
-            logger.info(f"📋 Columnas obtenidas: {columns}")
-            
-            logger.info("📥 Fetching resultados...")
-            
-            # Obtener resultados
-            rows = cursor.fetchall()
-            logger.info(f"📊 Número de filas obtenidas: {len(rows)}")
-        finally:
-            cursor.close()
-            logger.info("✅ Cursor cerrado")
-        
-        # Mostrar primeras 3 filas para debugging
-        if rows:
-            logger.info(f"🔍 Primeras {min(3, len(rows))} filas:")
-            for i, row in enumerate(rows[:3]):
-                logger.info(f"   Fila {i+1}: {row}")
-        
-        logger.info("🔄 Convirtiendo resultados a diccionarios...")
-        
-        # Convertir a lista de diccionarios
-        data = []
-        for row in rows:
-            row_dict = {}
-            for i, col_name in enumerate(columns):
-                value = row[i]
-                # Convertir tipos especiales a strings/números
-                if hasattr(value, 'isoformat'):  # datetime/date
-                    value = value.isoformat()
-                elif isinstance(value, (bytes, bytearray)):  # binary
-                    value = value.decode('utf-8', errors='ignore')
-                row_dict[col_name] = value
-            data.append(row_dict)
+        if cached is not MISSING:
+            columns, types, data, message = cached
+            logger.debug("⚡ Resultado servido desde caché: %d filas", len(data))
+        else:
+            # Peticiones idénticas concurrentes comparten una única ejecución en curso
+            columns, types, data, message = await run_until_disconnect(http_request, query_flight.do(
+                cache_key, _execute_query, query, params, request.limit, request.format, cache_key, version
+            ))
         
-        logger.info(f"✅ Datos convertidos: {len(data)} registros")
-        
-        # Mensaje de advertencia si se alcanzó el límite
-        message = None
-        if len(data) == request.limit:
-            message = f"Results limited to {request.limit} rows. Use a more specific query or increase the limit."
-            logger.warning(f"⚠️ {message}")
-        
-        logger.info("✅ Query ejecutado exitosamente")
-        logger.info(f"📤 Retornando {len(data)} filas")
-        logger.info("=" * 80)
+        if request.format == "columnar":
+            return FastJSONResponse({
+                "success": True,
+                "rows_returned": len(data),
+                "columns": columns,
+                "types": types,
+                "rows": data,
+                "query_executed": query,
+                "message": message
+            })
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "rows_returned": len(data),
             "columns": columns,
             "data": data,
             "query_executed": query,
             "message": message
-        }
+        })
         
+    except HTTPException:
+        raise
     except oracledb.Error as e:
         error_obj, = e.args
-        logger.error("=" * 80)
-        logger.error(f"❌ [DATABASE ERROR] Error ejecutando query")
-        logger.error(f"Query: {query}")
-        logger.error(f"Params: {request.params}")
-        logger.error(f"Error: {error_obj.message}")
-        logger.error(f"Code: {error_obj.code}")
-        logger.error("=" * 80)
+        logger.error("❌ [DATABASE ERROR] %s (code %s) | query=%s | params=%s",
+                     error_obj.message, error_obj.code, query, params)
+        if is_call_timeout(e):
+            raise HTTPException(
+                status_code=504,
+                detail=f"Query exceeded the {settings.DB_CALL_TIMEOUT_ADHOC_MS} ms statement timeout"
+            )
+        if is_query_error(e):
+            raise HTTPException(status_code=400, detail=f"Invalid query: {error_obj.message}")
         raise HTTPException(
             status_code=500, 
             detail=f"Database error: {error_obj.message}"
         )
     except ValueError as e:
-        logger.warning("=" * 80)
-        logger.warning(f"⚠️ [VALIDATION ERROR] Query inválido rechazado")
-        logger.warning(f"Query: {request.query}")
-        logger.warning(f"Error: {str(e)}")
-        logger.warning("=" * 80)
+        logger.warning("⚠️ [VALIDATION ERROR] %s | query=%s", e, request.query)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error("=" * 80)
-        logger.error(f"❌ [UNEXPECTED ERROR] Error inesperado")
-        logger.error(f"Query: {query if 'query' in locals() else request.query}")
-        logger.error(f"Params: {request.params}")
-        logger.error(f"Error: {str(e)}")
-        logger.error(f"Type: {type(e).__name__}")
-        logger.error("=" * 80)
+        logger.error("❌ [UNEXPECTED ERROR] %s: %s | query=%s | params=%s",
+                     type(e).__name__, e, query if 'query' in locals() else request.query, request.params)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@router.post(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(admission_slot(QUERY))],
+    summary="Export custom SQL query results",
+    description="""
+    Stream the full result of a custom SELECT query as CSV, NDJSON, an Arrow
+    IPC stream or a Parquet file (`format`, or an Arrow/Parquet `Accept`
+    header; the binary formats need the optional `pyarrow` package).
+    
+    Rows are fetched from the database in `batch_size` batches and written to
+    the response as they arrive, so there is no 10,000 row cap and memory use
+    does not grow with the result size. Disconnecting stops the query.
+    The same security checks as `/query/execute` apply.
+    """,
+    responses={
+        200: {"description": "Streamed export", "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}},
+        406: {"model": ErrorResponse, "description": "Arrow/Parquet requested but pyarrow is not installed"},
+        400: {"model": ErrorResponse, "description": "Invalid query or parameters"},
+        500: {"model": ErrorResponse, "description": "Database error"},
+        503: {"model": ErrorResponse, "description": "Too many custom queries; retry after the Retry-After delay"},
+        504: {"model": ErrorResponse, "description": "Statement timeout (DB_CALL_TIMEOUT_ADHOC_MS) exceeded"}
+    }
+)
+async def export_custom_query(
+    request: SQLExportRequest = Body(..., example={
+        "query": 'SELECT NOMBRE_COMPLETO, EDAD, FECHA_INGRESO, CATEGORIA FROM SALUD_MENTAL_FEATURED WHERE EDAD > :edad',
+        "params": {"edad": 50},
+        "format": "csv"
+    }),
+    accept: Optional[str] = Header(None, description="application/vnd.apache.arrow.stream or application/vnd.apache.parquet overrides format")
+):
+    """
+    Export a custom SQL query as a streamed CSV, NDJSON, Arrow or Parquet download.
+    """
+    # Un Accept de Arrow/Parquet tiene prioridad sobre el campo format
+    fmt = negotiate_binary_format(accept) or request.format
+    if fmt in BINARY_MEDIA_TYPES and not arrow_available():
+        raise HTTPException(status_code=406, detail=PYARROW_MISSING_DETAIL)
+    
+    query = request.query.strip()
+    
+    # Límite opcional (por defecto se exporta el resultado completo)
+    query = apply_row_limit(query, request.limit)
+    
+    logger.debug("📦 [EXPORT] %s | batch=%d | query: %s", fmt, request.batch_size, query)
+    
+    # The connection stays checked out for the lifetime of the stream (released by _ExportStream)
+    connection = await db_connection.get_async_connection()
+    cursor = connection.cursor()
+    cursor.arraysize = request.batch_size
+    if fmt in BINARY_MEDIA_TYPES:
+        cursor.outputtypehandler = native_types_handler
+    start = time.perf_counter()
+    try:
+        with phase_timer(PHASE_DB):
+            if request.params:
+                await cursor.execute(query, **request.params)
+            else:
+                await cursor.execute(query)
+        export = _ExportStream(
+            connection, cursor, fmt, request.batch_size, query, request.params, time.perf_counter() - start
+        )
+    except Exception as e:
+        cursor.close()
+        await connection.close()
+        _record_export(query, request.params, 0, 1, time.perf_counter() - start, 0.0, e)
+        if isinstance(e, oracledb.Error):
+            error_obj, = e.args
+            logger.error(f"❌ [DATABASE ERROR] Error exportando query: {error_obj.message}")
+            if is_call_timeout(e):
+                raise HTTPException(
+                    status_code=504,
+                    detail=f"Query exceeded the {settings.DB_CALL_TIMEOUT_ADHOC_MS} ms statement timeout"
+                )
+            if is_query_error(e):
+                raise HTTPException(status_code=400, detail=f"Invalid query: {error_obj.message}")
+            raise HTTPException(status_code=500, detail=f"Database error: {error_obj.message}")
+        logger.error(f"❌ [UNEXPECTED ERROR] Error exportando query: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    
+    filename = f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    return _ExportResponse(
+        export,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/cache",
+    summary="Get query cache status",
+    description="Entries, memory use and hit/miss counters of the custom query result cache."
+)
+async def get_query_cache():
+    """
+    Get custom query cache status.
+    
+    Identical queries (whitespace/case-normalized text, same params and limit)
+    are served from memory until the dataset version changes; identical
+    queries arriving while one is running share its execution.
+    """
+    stats = query_cache.stats()
+    stats["single_flight"] = query_flight.stats()
+    stats["dataset_version"] = list(dataset_version.value) if dataset_version.value else None
+    return stats
+
+
+@router.get(
+    "/workload",
+    summary="Get custom query workload",
+    description="Top query shapes (literals stripped) of /query/execute, /query/export and /ai/analyze by database time, calls, latency or rows."
+)
+async def get_query_workload(
+    top: int = Query(20, ge=1, le=500, description="Number of fingerprints returned"),
+    sort: str = Query("total_ms", description=f"Sort key: {', '.join(SORT_KEYS)}"),
+    source: Optional[str] = Query(None, description="Only fingerprints seen from this source: query, export or ai")
+):
+    """
+    Get the custom query workload report.
+    
+    Every execution that reaches the database is grouped by fingerprint: the
+    statement with literals and bind names replaced by `?`, comments removed,
+    case and whitespace normalized and IN lists collapsed. Cache hits are not
+    counted. Per fingerprint:
+    - calls, errors and error rate
+    - total, mean, p95 (recent executions) and max latency (ms), share of total time
+    - rows fetched (total and mean)
+    """
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORT_KEYS)}")
+    return query_workload.top(limit=top, sort=sort, source=source)
+
+
 @router.get(
     "/examples",
     response_model=List[QueryExample],
@@ -331,7 +849,7 @@ ORDER BY sexo, rango_edad"""
         }
     ]
     
-    return examples
+    return FastJSONResponse(examples)
 
 
 @router.get(
@@ -339,30 +857,16 @@ ORDER BY sexo, rango_edad"""
     summary="Get table schema information",
     description="Get information about available columns in SALUD_MENTAL_FEATURED table."
 )
-async def get_table_schema(connection=Depends(get_db_connection)):
+async def get_table_schema():
     """
     Get schema information about the SALUD_MENTAL_FEATURED table.
     Returns column names, data types, and nullable status.
     """
     try:
-        cursor = connection.cursor()
-        
-        # Query para obtener información de columnas
-        query = """
-        SELECT 
-            COLUMN_NAME,
-            DATA_TYPE,
-            DATA_LENGTH,
-            NULLABLE
-        FROM USER_TAB_COLUMNS
-        WHERE TABLE_NAME = 'SALUD_MENTAL_FEATURED'
-        ORDER BY COLUMN_ID
-        """
-        
-        cursor.execute(query)
+        rows = await run_with_connection(_fetch_table_schema)
         
         columns_info = []
-        for row in cursor:
+        for row in rows:
             columns_info.append({
                 "column_name": row[0],
                 "data_type": row[1],
@@ -370,8 +874,6 @@ async def get_table_schema(connection=Depends(get_db_connection)):
                 "nullable": row[3] == 'Y'
             })
         
-        cursor.close()
-        
         return {
             "table_name": "SALUD_MENTAL_FEATURED",
             "total_columns": len(columns_info),
@@ -0,0 +1,59 @@
+"""
+Fast JSON responses for trusted service-layer output.
+
+Returning a ``Response`` from a route makes FastAPI skip the
+``response_model`` validation and ``jsonable_encoder`` pass, which for the
+data and statistics lists re-validates up to thousands of dicts that
+``HealthDataService`` already built in the right shape. Routes keep
+``response_model`` for the OpenAPI schema and return ``FastJSONResponse``.
+Encoding uses ``orjson`` (native date/datetime support) when installed and
+falls back to the standard library.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.metrics import PHASE_SERIALIZATION, phase_timer
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values neither encoder handles natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='ignore')
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (datetime, date, time)):  # stdlib json only
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    ``JSONResponse`` rendered with orjson.
+
+    Content must already have the documented shape: it is serialized as is,
+    without pydantic validation or filtering.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with phase_timer(PHASE_SERIALIZATION):
+            if orjson is not None:
+                return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+            return json.dumps(
+                content,
+                default=_default,
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":")
+            ).encode("utf-8")
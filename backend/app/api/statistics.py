@@ -3,7 +3,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import oracledb
 import statistics
+import asyncio
 import logging
+import time
 
 from app.models.schemas import (
     DiagnosticoStats,
@@ -13,15 +15,41 @@ from app.models.schemas import (
     EstanciaStats,
     ComunidadStats,
     ServicioStats,
+    DashboardStats,
     ErrorResponse
 )
-from app.database.connection import get_db_connection
-from app.services.health_data_service import HealthDataService
+from app.api.admission import admission_slot
+from app.api.responses import FastJSONResponse
+from app.config import settings
+from app.database.connection import statement_timeout
+from app.services.admission import STATISTICS
+from app.services.cache import statistics_cache
+from app.services.refresher import statistics_refresher
 from pydantic import BaseModel
 
-router = APIRouter(prefix="/statistics", tags=["Statistics"])
+router = APIRouter(
+    prefix="/statistics",
+    tags=["Statistics"],
+    default_response_class=FastJSONResponse,
+    dependencies=[
+        Depends(admission_slot(STATISTICS)),
+        Depends(statement_timeout(settings.DB_CALL_TIMEOUT_DASHBOARD_MS))
+    ]
+)
 logger = logging.getLogger(__name__)
 
+# Secciones de /statistics/dashboard: (campo de la respuesta, método de HealthDataService)
+DASHBOARD_SECTIONS = (
+    ("diagnosticos", "get_diagnosticos_stats"),
+    ("edad", "get_edad_distribution"),
+    ("sexo", "get_genero_distribution"),
+    ("circunstancia_contacto", "get_tipo_ingreso_stats"),
+    ("tendencia_mensual", "get_tendencia_mensual"),
+    ("duracion_estancia", "get_duracion_estancia"),
+    ("comunidad_autonoma", "get_comunidad_stats"),
+    ("servicio", "get_servicio_stats"),
+)
+
 class StatisticsResponse(BaseModel):
     """Response model for temporal statistics."""
     success: bool
@@ -112,9 +140,7 @@ def calcular_estadisticas_numericas(data: List[Dict[str, Any]], columnas_numeric
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_diagnosticos_stats(
-    connection=Depends(get_db_connection)
-):
+async def get_diagnosticos_stats():
     """
     Get diagnosis statistics grouped by category.
     
@@ -124,8 +150,8 @@ async def get_diagnosticos_stats(
     - Percentage of total diagnoses
     """
     try:
-        results = HealthDataService.get_diagnosticos_stats(connection)
-        return results
+        results = await statistics_cache.get("get_diagnosticos_stats")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -142,9 +168,7 @@ async def get_diagnosticos_stats(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_edad_distribution(
-    connection=Depends(get_db_connection)
-):
+async def get_edad_distribution():
     """
     Get age distribution statistics.
     
@@ -152,8 +176,8 @@ async def get_edad_distribution(
     - 0-17, 18-25, 26-35, 36-45, 46-55, 56-65, 65+
     """
     try:
-        results = HealthDataService.get_edad_distribution(connection)
-        return results
+        results = await statistics_cache.get("get_edad_distribution")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -170,17 +194,15 @@ async def get_edad_distribution(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_sexo_distribution(
-    connection=Depends(get_db_connection)
-):
+async def get_sexo_distribution():
     """
     Get sex distribution statistics.
     
     Returns patient count grouped by sex (1: Hombre, 2: Mujer) with percentages.
     """
     try:
-        results = HealthDataService.get_genero_distribution(connection)
-        return results
+        results = await statistics_cache.get("get_genero_distribution")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -197,17 +219,15 @@ async def get_sexo_distribution(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_circunstancia_stats(
-    connection=Depends(get_db_connection)
-):
+async def get_circunstancia_stats():
     """
     Get admission circumstance statistics.
     
     Returns admission counts grouped by circumstance of contact with percentages.
     """
     try:
-        results = HealthDataService.get_tipo_ingreso_stats(connection)
-        return results
+        results = await statistics_cache.get("get_tipo_ingreso_stats")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -226,8 +246,7 @@ async def get_circunstancia_stats(
     }
 )
 async def get_tendencia_mensual(
-    year: Optional[int] = Query(None, description="Filter by specific year", ge=2000, le=2100),
-    connection=Depends(get_db_connection)
+    year: Optional[int] = Query(None, description="Filter by specific year", ge=2000, le=2100)
 ):
     """
     Get monthly admission trends.
@@ -235,8 +254,8 @@ async def get_tendencia_mensual(
     Optionally filter by year. If no year is provided, returns last 12 months.
     """
     try:
-        results = HealthDataService.get_tendencia_mensual(connection, year)
-        return results
+        results = await statistics_cache.get("get_tendencia_mensual", year)
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -253,9 +272,7 @@ async def get_tendencia_mensual(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_duracion_estancia(
-    connection=Depends(get_db_connection)
-):
+async def get_duracion_estancia():
     """
     Get hospital stay duration statistics.
     
@@ -263,8 +280,8 @@ async def get_duracion_estancia(
     - 1-3 days, 4-7 days, 8-14 days, 15-30 days, 30+ days
     """
     try:
-        results = HealthDataService.get_duracion_estancia(connection)
-        return results
+        results = await statistics_cache.get("get_duracion_estancia")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -281,17 +298,15 @@ async def get_duracion_estancia(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_comunidad_stats(
-    connection=Depends(get_db_connection)
-):
+async def get_comunidad_stats():
     """
     Get statistics by Comunidad Autónoma.
     
     Returns patient count grouped by autonomous community with percentages.
     """
     try:
-        results = HealthDataService.get_comunidad_stats(connection)
-        return results
+        results = await statistics_cache.get("get_comunidad_stats")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -308,17 +323,15 @@ async def get_comunidad_stats(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_servicio_stats(
-    connection=Depends(get_db_connection)
-):
+async def get_servicio_stats():
     """
     Get statistics by service.
     
     Returns patient count grouped by hospital service with percentages (top 20).
     """
     try:
-        results = HealthDataService.get_servicio_stats(connection)
-        return results
+        results = await statistics_cache.get("get_servicio_stats")
+        return FastJSONResponse(results)
     except oracledb.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
@@ -335,9 +348,7 @@ async def get_servicio_stats(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
-async def get_temporal_trends(
-    connection=Depends(get_db_connection)
-):
+async def get_temporal_trends():
     """
     Get temporal trends with complete statistics.
     
@@ -346,42 +357,7 @@ async def get_temporal_trends(
     - Descriptive statistics (mean, median, mode, variance, quartiles, etc.) for each numeric column
     """
     try:
-        query = """
-        SELECT 
-          EXTRACT(YEAR FROM FECHA_INGRESO) as ano,
-          MES_INGRESO as mes,
-          COUNT(*) as total_ingresos,
-          ROUND(AVG(ESTANCIA_DIAS), 2) as estancia_promedio,
-          ROUND(AVG(COSTE_APR), 2) as coste_promedio,
-          ROUND(AVG(EDAD), 1) as edad_promedio,
-          COUNT(CASE WHEN NIVEL_SEVERIDAD_APR IN (3, 4) THEN 1 END) as casos_severos,
-          COUNT(CASE WHEN CIRCUNSTANCIA_CONTACTO = 1 THEN 1 END) as ingresos_urgentes,
-          ROUND(COUNT(CASE WHEN CIRCUNSTANCIA_CONTACTO = 1 THEN 1 END) * 100.0 / COUNT(*), 1) as porcentaje_urgentes,
-          COUNT(DISTINCT CATEGORIA) as categorias_distintas
-        FROM SALUD_MENTAL_FEATURED
-        WHERE MES_INGRESO IS NOT NULL 
-          AND FECHA_INGRESO IS NOT NULL
-        GROUP BY EXTRACT(YEAR FROM FECHA_INGRESO), MES_INGRESO
-        ORDER BY 
-          EXTRACT(YEAR FROM FECHA_INGRESO),
-          MES_INGRESO
-        """
-        
-        cursor = connection.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0].lower() for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        # Transformar a lista de diccionarios
-        data = []
-        for row in rows:
-            row_dict = {}
-            for i, value in enumerate(row):
-                row_dict[columns[i]] = value
-            data.append(row_dict)
-        
-        cursor.close()
+        data = await statistics_cache.get("get_temporal_trends")
         
         # Columnas numéricas para calcular estadísticas
         columnas_numericas = [
@@ -398,14 +374,14 @@ async def get_temporal_trends(
         # Calcular estadísticas descriptivas
         estadisticas = calcular_estadisticas_numericas(data, columnas_numericas)
         
-        logger.info(f"Temporal trends retrieved: {len(data)} records with statistics")
+        logger.debug("Temporal trends retrieved: %d records with statistics", len(data))
         
-        return StatisticsResponse(
-            success=True,
-            data=data,
-            estadisticas_numericas=estadisticas,
-            total_records=len(data)
-        )
+        return FastJSONResponse({
+            "success": True,
+            "data": data,
+            "estadisticas_numericas": estadisticas,
+            "total_records": len(data)
+        })
         
     except Exception as e:
         logger.error(f"Error fetching temporal trends: {str(e)}")
@@ -413,3 +389,92 @@ async def get_temporal_trends(
             status_code=500,
             detail=f"Error fetching temporal trends: {str(e)}"
         )
+
+
+async def _dashboard_section(method_name: str, *args, timeout: float) -> Any:
+    """
+    Fetch one dashboard section through the cache, giving up after ``timeout``.
+    
+    The lookup is shielded: a section that times out keeps running in the
+    background and still fills the cache for the next request.
+    """
+    task = asyncio.ensure_future(statistics_cache.get(method_name, *args))
+    # Retrieve the outcome so an abandoned task never logs "exception was never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+
+@router.get(
+    "/dashboard",
+    response_model=DashboardStats,
+    summary="Get all dashboard statistics",
+    description="Retrieve every dashboard distribution in one response. Sections are fetched concurrently; "
+                "a section that fails or exceeds the per-section timeout is returned empty and listed in `errores`.",
+    responses={
+        200: {"description": "Successfully retrieved dashboard statistics (possibly partial)"},
+        500: {"model": ErrorResponse, "description": "No section could be retrieved"}
+    }
+)
+async def get_dashboard(
+    year: Optional[int] = Query(None, description="Filter monthly trends by specific year", ge=2000, le=2100)
+):
+    """
+    Get all dashboard statistics in a single request.
+    
+    Returns diagnosis, age, sex, admission circumstance, monthly trend, stay
+    duration, community and service distributions. Each section runs on its
+    own pooled connection; a missing section is an empty list and
+    `parcial` is true.
+    """
+    start_time = time.perf_counter()
+    timeout = settings.STATISTICS_DASHBOARD_SECTION_TIMEOUT_SECONDS
+    
+    results = await asyncio.gather(
+        *(
+            _dashboard_section(method_name, *((year,) if method_name == "get_tendencia_mensual" else ()), timeout=timeout)
+            for _, method_name in DASHBOARD_SECTIONS
+        ),
+        return_exceptions=True
+    )
+    
+    response: Dict[str, Any] = {}
+    errores: Dict[str, str] = {}
+    for (field, _), result in zip(DASHBOARD_SECTIONS, results):
+        if isinstance(result, asyncio.TimeoutError):
+            errores[field] = f"Timeout after {timeout:g}s"
+        elif isinstance(result, oracledb.Error):
+            errores[field] = f"Database error: {str(result)}"
+        elif isinstance(result, Exception):
+            errores[field] = str(result)
+        else:
+            response[field] = result
+    
+    if errores:
+        logger.warning(f"Dashboard returned partial data, missing sections: {errores}")
+    if not response:
+        raise HTTPException(status_code=500, detail=f"Error fetching dashboard statistics: {errores}")
+    
+    return FastJSONResponse({
+        **{field: response.get(field, []) for field, _ in DASHBOARD_SECTIONS},
+        "errores": errores,
+        "parcial": bool(errores),
+        "tiempo_ms": round((time.perf_counter() - start_time) * 1000, 2)
+    })
+
+
+@router.get(
+    "/cache",
+    summary="Get statistics cache status",
+    description="Entries, memory use, hit/miss counters and dataset version of the statistics result cache."
+)
+async def get_statistics_cache():
+    """
+    Get statistics cache status.
+    
+    Returns cache size and budget, hits, misses, hit ratio, evictions, the
+    dataset version (row count, MAX(ORA_ROWSCN)) the entries belong to and
+    the state of the background refresher.
+    """
+    stats = statistics_cache.stats()
+    stats["refresher"] = statistics_refresher.stats()
+    return stats
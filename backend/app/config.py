@@ -1,5 +1,6 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 from pathlib import Path
 
@@ -10,13 +11,46 @@ class Settings(BaseSettings):
     All sensitive data (Oracle credentials, passwords) MUST be defined in .env file.
     """
     
-    # Oracle Database Configuration - REQUIRED from .env (no defaults for security)
-    ORACLE_USER: str
-    ORACLE_PASSWORD: str
-    ORACLE_DSN: str
-    ORACLE_CONFIG_DIR: str
-    ORACLE_WALLET_LOCATION: str
-    ORACLE_WALLET_PASSWORD: str
+    # Database backend: "oracle" (Autonomous DB) or "sqlite" (embedded, loaded from CSV)
+    DB_BACKEND: str = "oracle"
+    
+    # Embedded backend source: CSV produced by eda/notebooks/feature_engineering.ipynb
+    SQLITE_CSV_PATH: str = "../eda/cleaned_data/salud_mental_featured.csv"
+    
+    # Oracle Database Configuration - REQUIRED from .env when DB_BACKEND=oracle (no defaults for security)
+    ORACLE_USER: Optional[str] = None
+    ORACLE_PASSWORD: Optional[str] = None
+    ORACLE_DSN: Optional[str] = None
+    ORACLE_CONFIG_DIR: Optional[str] = None
+    ORACLE_WALLET_LOCATION: Optional[str] = None
+    ORACLE_WALLET_PASSWORD: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_backend(self) -> "Settings":
+        """Require Oracle credentials only when the Oracle backend is selected."""
+        backend = self.DB_BACKEND.lower()
+        if backend not in ("oracle", "sqlite"):
+            raise ValueError(f"Unsupported DB_BACKEND '{self.DB_BACKEND}' (use 'oracle' or 'sqlite')")
+        if backend == "oracle":
+            missing = [
+                name for name in (
+                    "ORACLE_USER", "ORACLE_PASSWORD", "ORACLE_DSN",
+                    "ORACLE_CONFIG_DIR", "ORACLE_WALLET_LOCATION", "ORACLE_WALLET_PASSWORD"
+                )
+                if not getattr(self, name)
+            ]
+            if missing:
+                raise ValueError(f"Missing Oracle settings in .env: {', '.join(missing)}")
+        return self
+    
+    @property
+    def sqlite_csv_path_absolute(self) -> str:
+        """Convert relative path to absolute path for the embedded backend CSV."""
+        if os.path.isabs(self.SQLITE_CSV_PATH):
+            return self.SQLITE_CSV_PATH
+        # Resolve relative to backend directory
+        backend_dir = Path(__file__).parent.parent
+        return str((backend_dir / self.SQLITE_CSV_PATH).resolve())
     
     @property
     def oracle_config_dir_absolute(self) -> str:
@@ -36,6 +70,100 @@ class Settings(BaseSettings):
         backend_dir = Path(__file__).parent.parent
         return str((backend_dir / self.ORACLE_WALLET_LOCATION).resolve())
     
+    # Oracle connection pool sizing and acquire behaviour
+    ORACLE_POOL_MIN: int = 2  # per pool
+    ORACLE_POOL_MAX: int = 10  # sessions across both pools
+    ORACLE_ASYNC_POOL_MAX: int = 4  # share of ORACLE_POOL_MAX for the asyncio pool (data pages, health, cache probes, exports)
+    ORACLE_POOL_INCREMENT: int = 1
+    ORACLE_POOL_GETMODE: str = "timedwait"  # wait | nowait | forceget | timedwait
+    ORACLE_POOL_WAIT_TIMEOUT_MS: int = 5000  # acquire timeout used by timedwait
+    ORACLE_POOL_PING_INTERVAL: int = 60  # seconds idle before a liveness ping
+    ORACLE_POOL_STMTCACHESIZE: int = 50
+    ORACLE_POOL_WARMUP: bool = True  # open min connections and pre-parse statements at startup
+    
+    @property
+    def oracle_async_pool_max(self) -> int:
+        """asyncio pool size: its share of ORACLE_POOL_MAX, leaving at least one session to the blocking pool."""
+        return max(1, min(self.ORACLE_ASYNC_POOL_MAX, self.ORACLE_POOL_MAX - 1))
+    
+    @property
+    def oracle_blocking_pool_max(self) -> int:
+        """Blocking pool size: the rest of ORACLE_POOL_MAX."""
+        return max(1, self.ORACLE_POOL_MAX - self.oracle_async_pool_max)
+    
+    # Cursor defaults applied to every pooled connection
+    ORACLE_ARRAYSIZE: int = 500
+    ORACLE_PREFETCHROWS: int = 100
+    ORACLE_JSON_FETCH_TYPES: bool = True  # fetch NUMBER as int/float and CLOB as str
+    
+    # Blocking DB work runs on a dedicated executor, sized to the blocking pool by default
+    DB_EXECUTOR_MAX_WORKERS: Optional[int] = None
+    
+    @property
+    def db_executor_max_workers(self) -> int:
+        """Executor size, falling back to the blocking pool max."""
+        return self.DB_EXECUTOR_MAX_WORKERS or self.oracle_blocking_pool_max
+    
+    # Result caching (invalidated by a row count + MAX(ORA_ROWSCN) dataset version probe)
+    CACHE_ENABLED: bool = True
+    CACHE_VERSION_CHECK_SECONDS: float = 30.0
+    CACHE_MAX_AGE_SECONDS: Optional[float] = 3600.0  # safety net for SYSDATE-relative queries
+    CACHE_STATISTICS_MAX_BYTES: int = 16 * 1024 * 1024
+    CACHE_QUERY_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # Background refresh of the dashboard statistics (stale-while-revalidate)
+    STATISTICS_STALE_WHILE_REVALIDATE: bool = True  # serve the last good result while refreshing it
+    STATISTICS_REFRESH_ENABLED: bool = True  # pre-warm at startup and refresh from a background task
+    STATISTICS_REFRESH_INTERVAL_SECONDS: float = 300.0  # also refreshed as soon as the dataset version changes
+    
+    # /statistics/dashboard: sections slower than this are returned empty and reported in "errores"
+    STATISTICS_DASHBOARD_SECTION_TIMEOUT_SECONDS: float = 10.0
+    
+    # Statement timeouts: oracledb call_timeout per database round trip (ms, 0 = no limit)
+    DB_CALL_TIMEOUT_MS: int = 0  # default: data pages, health checks, background refresh
+    DB_CALL_TIMEOUT_DASHBOARD_MS: int = 15000  # /statistics
+    DB_CALL_TIMEOUT_ADHOC_MS: int = 120000  # /query and /ai
+    
+    # Cancel the running statement of /query/execute and /ai/analyze when the client disconnects
+    CANCEL_ON_CLIENT_DISCONNECT: bool = True
+    CLIENT_DISCONNECT_POLL_SECONDS: float = 0.5
+    
+    # Admission control: concurrent requests and queue per workload class. Requests that cannot
+    # get a slot within the class's max wait (or find its queue full) get 503 + Retry-After.
+    # /query/execute and /ai run on the blocking pool: keep QUERY + AI below oracle_blocking_pool_max
+    # (ORACLE_POOL_MAX - ORACLE_ASYNC_POOL_MAX) so dashboards always find connections.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_QUEUE_SIZE: int = 100  # per class
+    ADMISSION_STATISTICS_CONCURRENCY: int = 8  # /statistics (mostly cache hits)
+    ADMISSION_STATISTICS_MAX_WAIT_SECONDS: float = 5.0
+    ADMISSION_DATA_CONCURRENCY: int = 4  # /data paging
+    ADMISSION_DATA_MAX_WAIT_SECONDS: float = 5.0
+    ADMISSION_QUERY_CONCURRENCY: int = 3  # /query/execute, /query/export
+    ADMISSION_QUERY_MAX_WAIT_SECONDS: float = 10.0
+    ADMISSION_AI_CONCURRENCY: int = 2  # /ai/analyze, held for its query only (not the LLM call)
+    ADMISSION_AI_MAX_WAIT_SECONDS: float = 15.0
+    
+    # Access log: one JSON line per sampled request; slow requests and 5xx are always logged
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1  # fraction of ordinary requests logged (0.0 - 1.0)
+    ACCESS_LOG_SLOW_MS: float = 500.0
+    
+    # Per-statement query log of the service layer (GET /pool/queries)
+    QUERY_LOG_SLOWEST_SIZE: int = 50  # slowest executions kept in memory
+    QUERY_LOG_MAX_STATEMENTS: int = 500  # per-statement totals kept (least recently run dropped first)
+    SLOW_QUERY_LOG_ENABLED: bool = False  # also log statements slower than SLOW_QUERY_LOG_MS
+    SLOW_QUERY_LOG_MS: float = 1000.0
+    
+    # /query/execute: rewrite literals into bind variables (one shared cursor per query shape);
+    # a request's "parameterize" field overrides it
+    QUERY_AUTO_PARAMETERIZE: bool = False
+    
+    # /query/workload: ad-hoc query shapes aggregated in memory
+    WORKLOAD_MAX_FINGERPRINTS: int = 1000
+    
+    # Prometheus metrics at GET /metrics (request latency per route and phase, pool and cache gauges)
+    METRICS_ENABLED: bool = True
+    
     # API Configuration
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "Malackathon 2025 - Health Mental Data API"
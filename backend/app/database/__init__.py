@@ -1,6 +1,18 @@
 """
 Database package initialization.
 """
-from app.database.connection import db_connection, get_db_connection
+from app.database.connection import (
+    db_connection,
+    db_executor,
+    get_db_connection,
+    get_async_db_connection,
+    run_with_connection
+)
 
-__all__ = ['db_connection', 'get_db_connection']
+__all__ = [
+    'db_connection',
+    'db_executor',
+    'get_db_connection',
+    'get_async_db_connection',
+    'run_with_connection'
+]
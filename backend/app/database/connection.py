@@ -1,24 +1,272 @@
 import oracledb
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Optional, Callable, Any, Iterable
 from app.config import settings
+from app.metrics import PHASE_ACQUIRE, record_phase
+import asyncio
+import contextvars
+import threading
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+POOL_GETMODES = {
+    "wait": oracledb.POOL_GETMODE_WAIT,
+    "nowait": oracledb.POOL_GETMODE_NOWAIT,
+    "forceget": oracledb.POOL_GETMODE_FORCEGET,
+    "timedwait": oracledb.POOL_GETMODE_TIMEDWAIT
+}
+
+
+def output_type_handler(cursor, metadata):
+    """
+    Connection-level fetch conversions that make fetched rows JSON-ready.
+    
+    Declared NUMBER(p,0) columns arrive as int and NUMBER(p,s>0) columns as
+    float, and CLOBs as str, so callers never convert values cell by cell.
+    Other NUMBER expressions keep the oracledb default (int when integral,
+    float otherwise). DATE/TIMESTAMP stay ``datetime`` (full time of day);
+    the JSON encoders write them as ISO 8601.
+    """
+    type_code = metadata.type_code
+    if type_code is oracledb.DB_TYPE_NUMBER:
+        if metadata.scale == 0 and metadata.precision:
+            return cursor.var(int, arraysize=cursor.arraysize)
+        if metadata.scale and metadata.scale > 0:
+            return cursor.var(float, arraysize=cursor.arraysize)
+    elif type_code in (oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_NCLOB):
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    return None
+
+
+def native_types_handler(cursor, metadata):
+    """
+    Cursor-level override of ``output_type_handler`` for consumers that want
+    oracledb's native Python types (e.g. the Arrow encoder).
+    """
+    return None
+
+
+def _percentile(values: Iterable[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of a sample (None for an empty sample).
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# Statement timeout of the current request (oracledb ``call_timeout``, ms; 0 = no limit)
+_call_timeout_ms: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "call_timeout_ms", default=settings.DB_CALL_TIMEOUT_MS
+)
+
+
+def current_call_timeout() -> int:
+    """``call_timeout`` (ms) applied to connections acquired in the current context."""
+    return _call_timeout_ms.get()
+
+
+def statement_timeout(timeout_ms: int):
+    """
+    Router or endpoint dependency: connections acquired while handling the
+    request get ``call_timeout = timeout_ms``, e.g.
+    ``APIRouter(dependencies=[Depends(statement_timeout(15000))])``.
+    """
+    async def apply_statement_timeout():
+        _call_timeout_ms.set(timeout_ms)
+    return apply_statement_timeout
+
+
+def is_call_timeout(error: Exception) -> bool:
+    """
+    Whether an oracledb error means a round trip exceeded ``call_timeout``.
+    """
+    if not isinstance(error, oracledb.Error) or not error.args:
+        return False
+    return getattr(error.args[0], "full_code", None) in ("DPY-4024", "DPI-1067")
+
+
+# Errors caused by the statement text or its binds rather than the server:
+# ORA-00900..00999 (parse and name resolution) plus these
+_QUERY_ERROR_CODES = frozenset((
+    1008,  # not all variables bound
+    1036,  # illegal variable name/number
+    1476,  # divisor is equal to zero
+    1722,  # invalid number
+    1756,  # quoted string not properly terminated
+    1830, 1840, 1841, 1843, 1847, 1858, 1861  # date literal does not match its format
+))
+
+
+def is_query_error(error: Exception) -> bool:
+    """
+    Whether an oracledb error was caused by the submitted SQL or binds
+    (answered with 400 rather than 500 by the custom query endpoints).
+    """
+    if not isinstance(error, oracledb.Error) or not error.args:
+        return False
+    full_code = getattr(error.args[0], "full_code", None) or ""
+    code = getattr(error.args[0], "code", None)
+    if not full_code.startswith("ORA-") or not isinstance(code, int):
+        return False
+    return 900 <= code <= 999 or code in _QUERY_ERROR_CODES
+
+
+def _is_acquire_timeout(error: Exception) -> bool:
+    """
+    Whether an oracledb error means the pool had no connection to hand out.
+    """
+    if not isinstance(error, oracledb.Error) or not error.args:
+        return False
+    return getattr(error.args[0], "full_code", None) == "DPY-4005"
+
+
+class AcquireMetrics:
+    """
+    Thread-safe counters and a rolling sample of pool acquire wait times.
+    """
+    
+    def __init__(self, sample_size: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self.acquired = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.max_wait = 0.0
+    
+    def record(self, wait: float, error: Optional[Exception] = None):
+        record_phase(PHASE_ACQUIRE, wait)
+        with self._lock:
+            if error is None:
+                self.acquired += 1
+                self._waits.append(wait)
+                self.max_wait = max(self.max_wait, wait)
+            elif _is_acquire_timeout(error):
+                self.timeouts += 1
+            else:
+                self.errors += 1
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = list(self._waits)
+            acquired, timeouts, errors, max_wait = self.acquired, self.timeouts, self.errors, self.max_wait
+        
+        def ms(value):
+            return round(value * 1000, 3) if value is not None else None
+        
+        return {
+            "acquired": acquired,
+            "timeouts": timeouts,
+            "errors": errors,
+            "wait_ms_p50": ms(_percentile(waits, 50)),
+            "wait_ms_p95": ms(_percentile(waits, 95)),
+            "wait_ms_p99": ms(_percentile(waits, 99)),
+            "wait_ms_max": ms(max_wait)
+        }
+
 
 class DatabaseConnection:
     """
     Oracle Database connection manager using singleton pattern.
+    
+    ``app.database.sqlite_backend.SQLiteDatabaseConnection`` implements the same
+    interface for ``DB_BACKEND=sqlite``.
     """
     
     _instance: Optional['DatabaseConnection'] = None
     _pool: Optional[oracledb.ConnectionPool] = None
+    _async_pool: Optional[oracledb.AsyncConnectionPool] = None
+    _warmup_statements: tuple = ()
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
+            cls._instance.acquire_metrics = AcquireMetrics()
+            cls._instance.async_acquire_metrics = AcquireMetrics()
         return cls._instance
     
+    @staticmethod
+    def _apply_cursor_defaults():
+        """
+        Set process-wide cursor fetch defaults (oracledb has no per-pool knob).
+        """
+        oracledb.defaults.arraysize = settings.ORACLE_ARRAYSIZE
+        oracledb.defaults.prefetchrows = settings.ORACLE_PREFETCHROWS
+    
+    @staticmethod
+    def _configure(connection):
+        """
+        Per-acquire connection settings (the pool hands out connections as they were left).
+        """
+        connection.outputtypehandler = output_type_handler if settings.ORACLE_JSON_FETCH_TYPES else None
+        connection.call_timeout = current_call_timeout()
+    
+    def register_warmup_statements(self, statements):
+        """
+        Register SQL texts to pre-parse into every new connection's statement cache.
+        """
+        self._warmup_statements = tuple(statements)
+    
+    def _init_session(self, connection, requested_tag):
+        """
+        Session callback for the blocking pool, run once per new connection.
+        Pre-parses the registered statements (session NLS settings are left
+        alone, so users' date literals keep the database defaults).
+        """
+        cursor = connection.cursor()
+        try:
+            for statement in self._warmup_statements:
+                try:
+                    cursor.parse(statement)
+                except oracledb.Error as e:
+                    logger.warning(f"Could not pre-parse warm-up statement: {str(e)}")
+        finally:
+            cursor.close()
+    
+    async def _init_session_async(self, connection, requested_tag):
+        """
+        Session callback for the asyncio pool (same work as ``_init_session``).
+        """
+        cursor = connection.cursor()
+        try:
+            for statement in self._warmup_statements:
+                try:
+                    await cursor.parse(statement)
+                except oracledb.Error as e:
+                    logger.warning(f"Could not pre-parse warm-up statement: {str(e)}")
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _pool_params(max_size: int) -> dict:
+        """
+        Connection parameters shared by the blocking and the asyncio pools.
+        
+        Args:
+            max_size: This pool's share of ``ORACLE_POOL_MAX``, so both pools
+                together never open more than ``ORACLE_POOL_MAX`` sessions
+        """
+        return dict(
+            user=settings.ORACLE_USER,
+            password=settings.ORACLE_PASSWORD,
+            dsn=settings.ORACLE_DSN,
+            config_dir=settings.oracle_config_dir_absolute,
+            wallet_location=settings.oracle_wallet_location_absolute,
+            wallet_password=settings.ORACLE_WALLET_PASSWORD,
+            min=min(settings.ORACLE_POOL_MIN, max_size),
+            max=max_size,
+            increment=settings.ORACLE_POOL_INCREMENT,
+            getmode=POOL_GETMODES[settings.ORACLE_POOL_GETMODE.lower()],
+            wait_timeout=settings.ORACLE_POOL_WAIT_TIMEOUT_MS,
+            ping_interval=settings.ORACLE_POOL_PING_INTERVAL,
+            stmtcachesize=settings.ORACLE_POOL_STMTCACHESIZE
+        )
+    
     def initialize_pool(self):
         """
         Initialize connection pool to Oracle Database using THIN mode with mTLS.
@@ -31,16 +279,10 @@ class DatabaseConnection:
                 logger.info(f"Wallet location (absolute): {settings.oracle_wallet_location_absolute}")
                 
                 # Conexión simple y directa
+                self._apply_cursor_defaults()
                 self._pool = oracledb.create_pool(
-                    user=settings.ORACLE_USER,
-                    password=settings.ORACLE_PASSWORD,
-                    dsn=settings.ORACLE_DSN,
-                    config_dir=settings.oracle_config_dir_absolute,
-                    wallet_location=settings.oracle_wallet_location_absolute,
-                    wallet_password=settings.ORACLE_WALLET_PASSWORD,
-                    min=2,
-                    max=10,
-                    increment=1
+                    session_callback=self._init_session,
+                    **self._pool_params(settings.oracle_blocking_pool_max)
                 )
                 
                 logger.info("Oracle Database connection pool initialized successfully with mTLS")
@@ -54,7 +296,132 @@ class DatabaseConnection:
         """
         if self._pool is None:
             self.initialize_pool()
-        return self._pool.acquire()
+        start = time.perf_counter()
+        try:
+            connection = self._pool.acquire()
+        except Exception as e:
+            self.acquire_metrics.record(time.perf_counter() - start, e)
+            raise
+        self.acquire_metrics.record(time.perf_counter() - start)
+        self._configure(connection)
+        return connection
+    
+    def initialize_async_pool(self):
+        """
+        Initialize the asyncio connection pool (THIN mode with mTLS).
+        
+        Connections acquired from this pool are ``oracledb.AsyncConnection``
+        objects, so queries awaited on them never block the event loop.
+        """
+        try:
+            if self._async_pool is None:
+                logger.info("Initializing Oracle Database asyncio connection pool with mTLS...")
+                self._apply_cursor_defaults()
+                self._async_pool = oracledb.create_pool_async(
+                    session_callback=self._init_session_async,
+                    **self._pool_params(settings.oracle_async_pool_max)
+                )
+                logger.info("Oracle Database asyncio connection pool initialized successfully")
+        except Exception as e:
+            logger.error(f"Error initializing asyncio database pool: {str(e)}")
+            raise
+    
+    async def get_async_connection(self):
+        """
+        Get an asyncio connection from the pool.
+        """
+        if self._async_pool is None:
+            self.initialize_async_pool()
+        start = time.perf_counter()
+        try:
+            connection = await self._async_pool.acquire()
+        except Exception as e:
+            self.async_acquire_metrics.record(time.perf_counter() - start, e)
+            raise
+        self.async_acquire_metrics.record(time.perf_counter() - start)
+        self._configure(connection)
+        return connection
+    
+    def _warm_up_pool(self) -> int:
+        """
+        Hold ``min`` connections at once so each is created (and initialized by
+        the session callback) now rather than on a user request.
+        """
+        connections = []
+        try:
+            for _ in range(min(settings.ORACLE_POOL_MIN, settings.oracle_blocking_pool_max)):
+                connections.append(self.get_connection())
+        finally:
+            for connection in connections:
+                connection.close()
+        return len(connections)
+    
+    async def _warm_up_async_pool(self) -> int:
+        """
+        Asyncio variant of ``_warm_up_pool``.
+        """
+        connections = []
+        try:
+            for _ in range(min(settings.ORACLE_POOL_MIN, settings.oracle_async_pool_max)):
+                connections.append(await self.get_async_connection())
+        finally:
+            for connection in connections:
+                await connection.close()
+        return len(connections)
+    
+    async def warm_up(self):
+        """
+        Open ``min`` connections on both pools eagerly, paying the mTLS handshake,
+        session setup and statement hard parses at startup.
+        """
+        start = time.perf_counter()
+        try:
+            opened = await db_executor.run(self._warm_up_pool)
+            opened_async = await self._warm_up_async_pool()
+        except Exception as e:
+            # A failed warm-up only costs latency; requests will open connections lazily
+            logger.warning(f"Connection pool warm-up failed: {str(e)}")
+            return
+        logger.info(
+            f"Connection pools warmed up: {opened} blocking + {opened_async} asyncio connections, "
+            f"{len(self._warmup_statements)} statements pre-parsed per connection "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+    
+    @staticmethod
+    def _describe_pool(pool) -> Optional[dict]:
+        if pool is None:
+            return None
+        return {
+            "opened": pool.opened,
+            "busy": pool.busy,
+            "min": pool.min,
+            "max": pool.max,
+            "increment": pool.increment
+        }
+    
+    def stats(self) -> dict:
+        """
+        Snapshot of pool configuration, occupancy and acquire wait times.
+        """
+        return {
+            "backend": "oracle",
+            "config": {
+                "min": settings.ORACLE_POOL_MIN,
+                "max": settings.ORACLE_POOL_MAX,
+                "blocking_max": settings.oracle_blocking_pool_max,
+                "async_max": settings.oracle_async_pool_max,
+                "increment": settings.ORACLE_POOL_INCREMENT,
+                "getmode": settings.ORACLE_POOL_GETMODE.lower(),
+                "wait_timeout_ms": settings.ORACLE_POOL_WAIT_TIMEOUT_MS,
+                "ping_interval_s": settings.ORACLE_POOL_PING_INTERVAL,
+                "stmtcachesize": settings.ORACLE_POOL_STMTCACHESIZE
+            },
+            "pool": self._describe_pool(self._pool),
+            "async_pool": self._describe_pool(self._async_pool),
+            "acquire": self.acquire_metrics.snapshot(),
+            "async_acquire": self.async_acquire_metrics.snapshot()
+        }
     
     def close_pool(self):
         """
@@ -65,16 +432,211 @@ class DatabaseConnection:
             self._pool.close()
             self._pool = None
             logger.info("Connection pool closed")
+    
+    async def close_async_pool(self):
+        """
+        Close the asyncio connection pool.
+        """
+        if self._async_pool:
+            logger.info("Closing Oracle Database asyncio connection pool...")
+            await self._async_pool.close()
+            self._async_pool = None
+            logger.info("Asyncio connection pool closed")
+
+
+class DBExecutor:
+    """
+    Bounded thread pool reserved for blocking database work.
+    
+    Its size defaults to the blocking pool's share of ``ORACLE_POOL_MAX`` so
+    every worker can hold one pooled connection. Work is queued here instead of on FastAPI's default
+    threadpool or the event loop, and the executor tracks how many tasks
+    are waiting and how long they waited before a worker picked them up.
+    """
+    
+    def __init__(self, max_workers: int, sample_size: int = 1000):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits = deque(maxlen=sample_size)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="db-executor"
+                )
+            return self._executor
+    
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the executor and await its result.
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+        
+        def task():
+            wait = time.perf_counter() - submitted_at
+            record_phase(PHASE_ACQUIRE, wait)
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._recent_waits.append(wait)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+        
+        def on_done(future):
+            # Tasks cancelled while still queued never reach task()
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+                    self._cancelled += 1
+        
+        # Run in a copy of the caller's context so request metrics follow the task
+        future = self._get_executor().submit(contextvars.copy_context().run, task)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+    
+    def stats(self) -> dict:
+        """
+        Snapshot of queue depth and queue wait times (milliseconds).
+        """
+        with self._lock:
+            recent = list(self._recent_waits)
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "cancelled": self._cancelled,
+                "wait_ms_avg": round(self._total_wait / started * 1000, 3) if started else 0.0,
+                "wait_ms_max": round(self._max_wait * 1000, 3),
+                "wait_ms_p50": round(_percentile(recent, 50) * 1000, 3) if recent else None,
+                "wait_ms_p95": round(_percentile(recent, 95) * 1000, 3) if recent else None,
+                "wait_ms_p99": round(_percentile(recent, 99) * 1000, 3) if recent else None
+            }
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker threads.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _create_db_connection():
+    """
+    Build the connection manager for the configured ``DB_BACKEND``.
+    """
+    if settings.DB_BACKEND.lower() == "sqlite":
+        from app.database.sqlite_backend import SQLiteDatabaseConnection
+        return SQLiteDatabaseConnection(db_executor, AcquireMetrics(), AcquireMetrics(), current_call_timeout)
+    return DatabaseConnection()
+
+
+# Singleton instances
+db_executor = DBExecutor(max_workers=settings.db_executor_max_workers)
+db_connection = _create_db_connection()
+
+
+class StatementHandle:
+    """
+    The connection a DB executor worker is using, so the event loop can
+    interrupt its statement with ``connection.cancel()``.
+    """
+    
+    __slots__ = ("_lock", "_connection", "cancelled")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection = None
+        self.cancelled = False
+    
+    def attach(self, connection) -> bool:
+        """Register the worker's connection; False if the call was already cancelled."""
+        with self._lock:
+            self._connection = connection
+            return not self.cancelled
+    
+    def detach(self):
+        with self._lock:
+            self._connection = None
+    
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            connection = self._connection
+        if connection is not None:
+            try:
+                connection.cancel()
+                logger.info("Cancelled a running statement (caller went away)")
+            except Exception as e:
+                logger.warning(f"Could not cancel statement: {str(e)}")
+
+
+def _with_pooled_connection(handle: StatementHandle, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Acquire a pooled connection, run ``func(connection, ...)`` and release it.
+    """
+    connection = db_connection.get_connection()
+    try:
+        if not handle.attach(connection):
+            return None  # nobody is waiting for the result any more
+        return func(connection, *args, **kwargs)
+    finally:
+        handle.detach()
+        connection.close()
 
 
-# Singleton instance
-db_connection = DatabaseConnection()
+async def run_with_connection(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking ``func(connection, ...)`` on the DB executor.
+    
+    Acquire, execution and release all happen inside the same worker, so a
+    worker never holds a connection while waiting for another worker (which
+    would deadlock an executor sized to the pool). Use it for any blocking
+    ``HealthDataService`` method or ad-hoc cursor work, e.g.
+    ``await run_with_connection(HealthDataService.get_diagnosticos_stats)``.
+    
+    If the awaiting task is cancelled (client disconnect, abandoned shared
+    execution), the statement running on the worker's connection is
+    cancelled too, so the connection goes back to the pool right away.
+    """
+    handle = StatementHandle()
+    try:
+        return await db_executor.run(_with_pooled_connection, handle, func, *args, **kwargs)
+    except asyncio.CancelledError:
+        handle.cancel()
+        raise
 
 
 def get_db_connection():
     """
     Dependency injection for database connections.
     Yields a connection and ensures it's released back to the pool.
+    
+    Note: FastAPI runs this on its default threadpool. Async handlers should
+    prefer ``run_with_connection`` so blocking work stays on the DB executor.
     """
     connection = None
     try:
@@ -83,3 +645,17 @@ def get_db_connection():
     finally:
         if connection:
             connection.close()
+
+
+async def get_async_db_connection():
+    """
+    Dependency injection for asyncio database connections.
+    Yields an ``oracledb.AsyncConnection`` and releases it back to the pool.
+    """
+    connection = None
+    try:
+        connection = await db_connection.get_async_connection()
+        yield connection
+    finally:
+        if connection:
+            await connection.close()
@@ -0,0 +1,537 @@
+"""
+Embedded SQLite backend.
+
+Implements the same contract as ``DatabaseConnection`` (blocking and asyncio
+``get_connection``/cursor API) on top of an in-memory SQLite database loaded
+from ``salud_mental_featured.csv``. A small dialect shim rewrites the Oracle
+constructs used by ``HealthDataService`` so the service SQL runs unchanged.
+Selected with ``DB_BACKEND=sqlite``; meant for CI, load tests and offline use.
+"""
+import csv
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from typing import NamedTuple, Optional, List, Any
+
+import oracledb
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "SALUD_MENTAL_FEATURED"
+
+# SQLite VM instructions between call_timeout checks
+PROGRESS_HANDLER_STEPS = 10000
+
+_DATE_VALUE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+# ============================================================================
+# DIALECT SHIM
+# ============================================================================
+
+_TO_CHAR_FORMATS = [
+    ("YYYY", "%Y"),
+    ("HH24", "%H"),
+    ("MM", "%m"),
+    ("DD", "%d"),
+    ("MI", "%M"),
+    ("SS", "%S")
+]
+
+_EXTRACT_FORMATS = {"YEAR": "%Y", "MONTH": "%m", "DAY": "%d"}
+
+_OFFSET_FETCH = re.compile(
+    r"OFFSET\s+(\S+)\s+ROWS?\s+FETCH\s+(?:NEXT|FIRST)\s+(\S+)\s+ROWS?\s+ONLY",
+    re.IGNORECASE
+)
+_FETCH_FIRST = re.compile(r"FETCH\s+(?:NEXT|FIRST)\s+(\S+)\s+ROWS?\s+ONLY", re.IGNORECASE)
+_EXTRACT = re.compile(r"EXTRACT\s*\(\s*(YEAR|MONTH|DAY)\s+FROM\s+([^()]+?)\s*\)", re.IGNORECASE)
+_TO_CHAR = re.compile(r"TO_CHAR\s*\(\s*([^,()]+?)\s*,\s*'([^']*)'\s*\)", re.IGNORECASE)
+_ADD_MONTHS = re.compile(r"ADD_MONTHS\s*\(\s*((?:[^,()]|\([^()]*\))+?)\s*,\s*(-?\d+)\s*\)", re.IGNORECASE)
+_SYSDATE = re.compile(r"\bSYSDATE\b", re.IGNORECASE)
+_FROM_DUAL = re.compile(r"\s+FROM\s+DUAL\b", re.IGNORECASE)
+_NVL = re.compile(r"\bNVL\s*\(", re.IGNORECASE)
+_ORA_ROWSCN = re.compile(r"\bORA_ROWSCN\b", re.IGNORECASE)
+_ROWIDTOCHAR = re.compile(r"\bROWIDTOCHAR\s*\(\s*ROWID\s*\)", re.IGNORECASE)
+_CHARTOROWID = re.compile(r"\bCHARTOROWID\s*\(\s*(:\w+)\s*\)", re.IGNORECASE)
+
+
+def _to_strftime(oracle_format: str) -> str:
+    result = oracle_format.upper()
+    for oracle_token, strftime_token in _TO_CHAR_FORMATS:
+        result = result.replace(oracle_token, strftime_token)
+    return result
+
+
+@functools.lru_cache(maxsize=512)
+def translate_sql(statement: str) -> str:
+    """
+    Rewrite the Oracle SQL constructs used by the API into SQLite syntax.
+
+    Covers ``OFFSET .. ROWS FETCH NEXT .. ROWS ONLY``, ``FETCH FIRST``,
+    ``EXTRACT(YEAR|MONTH|DAY FROM ..)``, ``TO_CHAR(date, 'fmt')``,
+    ``ADD_MONTHS``, ``SYSDATE``, ``FROM DUAL``, ``NVL``, ``ORA_ROWSCN``
+    (mapped to ``rowid``, enough for the dataset version probe) and
+    ``ROWIDTOCHAR(ROWID)``/``CHARTOROWID(:bind)`` used by keyset pagination.
+    """
+    sql = _OFFSET_FETCH.sub(r"LIMIT \2 OFFSET \1", statement)
+    sql = _FETCH_FIRST.sub(r"LIMIT \1", sql)
+    sql = _EXTRACT.sub(
+        lambda m: f"CAST(strftime('{_EXTRACT_FORMATS[m.group(1).upper()]}', {m.group(2)}) AS INTEGER)",
+        sql
+    )
+    sql = _TO_CHAR.sub(lambda m: f"strftime('{_to_strftime(m.group(2))}', {m.group(1)})", sql)
+    sql = _SYSDATE.sub("date('now')", sql)
+    sql = _ADD_MONTHS.sub(lambda m: f"date({m.group(1)}, '{int(m.group(2)):+d} months')", sql)
+    sql = _FROM_DUAL.sub("", sql)
+    sql = _NVL.sub("IFNULL(", sql)
+    sql = _ORA_ROWSCN.sub("rowid", sql)
+    sql = _ROWIDTOCHAR.sub("rowid", sql)
+    sql = _CHARTOROWID.sub(r"\1", sql)
+    return sql
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class SQLiteErrorInfo(NamedTuple):
+    """Stand-in for the error object oracledb puts in ``error.args[0]``."""
+    message: str
+    code: int
+    full_code: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+# sqlite3 message fragment -> the Oracle error an equivalent statement raises
+_ORACLE_CODES = (
+    ("no such table", "ORA-00942"),
+    ("no such column", "ORA-00904"),
+    ("no such function", "ORA-00904"),
+    ("ambiguous column", "ORA-00918"),
+    ("syntax error", "ORA-00900"),
+    ("incomplete input", "ORA-00900"),
+    ("unrecognized token", "ORA-01756"),
+    ("binding", "ORA-01008"),
+)
+
+
+def _oracle_error(error: sqlite3.Error, timed_out: bool) -> oracledb.Error:
+    """
+    Translate a sqlite3 error into the oracledb error Oracle would raise, so
+    the API error handlers (``is_call_timeout``, ``is_query_error``) treat
+    both backends alike. Unrecognized errors keep a ``SQLITE`` code.
+    """
+    message = str(error)
+    if isinstance(error, sqlite3.OperationalError) and message == "interrupted":
+        if timed_out:
+            return oracledb.OperationalError(SQLiteErrorInfo("DPY-4024: call timeout exceeded", 4024, "DPY-4024"))
+        return oracledb.OperationalError(
+            SQLiteErrorInfo("ORA-01013: user requested cancel of current operation", 1013, "ORA-01013")
+        )
+    lowered = message.lower()
+    for fragment, full_code in _ORACLE_CODES:
+        if fragment in lowered:
+            return oracledb.DatabaseError(SQLiteErrorInfo(f"{full_code}: {message}", int(full_code[4:]), full_code))
+    return oracledb.DatabaseError(SQLiteErrorInfo(message, 0, "SQLITE"))
+
+
+# ============================================================================
+# CURSOR / CONNECTION WRAPPERS
+# ============================================================================
+
+class _NullBinds(dict):
+    """Bind mapping that answers NULL for any name (used to EXPLAIN statements)."""
+
+    def __missing__(self, key):
+        return None
+
+
+class SQLiteCursor:
+    """
+    oracledb-style cursor over ``sqlite3.Cursor`` (keyword binds, SQL translation).
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, connection: "SQLiteConnection"):
+        self._cursor = cursor
+        self._connection = connection
+        self.arraysize = settings.ORACLE_ARRAYSIZE
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, statement: str, parameters: Any = None, **keyword_parameters):
+        binds = keyword_parameters or parameters or {}
+        with self._connection.call():
+            self._cursor.execute(translate_sql(statement), binds)
+        return self
+
+    def parse(self, statement: str):
+        # SQLite prepares on execute; EXPLAIN validates the translated text
+        with self._connection.call():
+            self._cursor.execute(f"EXPLAIN {translate_sql(statement)}", _NullBinds())
+            self._cursor.fetchall()
+
+    def fetchone(self):
+        with self._connection.call():
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        with self._connection.call():
+            return self._cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self) -> List[tuple]:
+        with self._connection.call():
+            return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """
+    oracledb-style connection over ``sqlite3.Connection``.
+
+    ``call_timeout`` (ms) is emulated with a progress handler: a statement
+    or fetch running past it is interrupted. sqlite3 errors are raised as
+    the matching oracledb errors (DPY-4024 for the timeout, ORA-01013 for
+    ``cancel()``; see ``_oracle_error``).
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._call_timeout = 0
+        self._deadline: Optional[float] = None
+        self.autocommit = True
+
+    @property
+    def call_timeout(self) -> int:
+        return self._call_timeout
+
+    @call_timeout.setter
+    def call_timeout(self, value: int):
+        self._call_timeout = value or 0
+        self._connection.set_progress_handler(self._past_deadline if value else None, PROGRESS_HANDLER_STEPS)
+
+    @contextmanager
+    def call(self):
+        """
+        One execute/fetch round trip: starts the ``call_timeout`` clock and
+        translates sqlite3 errors into oracledb errors.
+        """
+        self._deadline = time.perf_counter() + self._call_timeout / 1000 if self._call_timeout else None
+        try:
+            yield
+        except sqlite3.Error as e:
+            raise _oracle_error(e, bool(self._past_deadline())) from e
+
+    def _past_deadline(self) -> int:
+        return int(self._deadline is not None and time.perf_counter() > self._deadline)
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self._connection.cursor(), self)
+
+    def cancel(self):
+        self._connection.interrupt()
+
+    def close(self):
+        self._connection.close()
+
+
+class AsyncSQLiteCursor:
+    """
+    Awaitable cursor API (as ``oracledb.AsyncCursor``) running on the DB executor.
+    """
+
+    def __init__(self, cursor: SQLiteCursor, executor):
+        self._cursor = cursor
+        self._executor = executor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def arraysize(self) -> int:
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int):
+        self._cursor.arraysize = value
+
+    async def execute(self, statement: str, parameters: Any = None, **keyword_parameters):
+        await self._executor.run(self._cursor.execute, statement, parameters, **keyword_parameters)
+        return self
+
+    async def parse(self, statement: str):
+        await self._executor.run(self._cursor.parse, statement)
+
+    async def fetchone(self):
+        return await self._executor.run(self._cursor.fetchone)
+
+    async def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        return await self._executor.run(self._cursor.fetchmany, size)
+
+    async def fetchall(self) -> List[tuple]:
+        return await self._executor.run(self._cursor.fetchall)
+
+    async def __aiter__(self):
+        while True:
+            rows = await self.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield row
+
+    def close(self):
+        self._cursor.close()
+
+
+class AsyncSQLiteConnection:
+    """
+    Awaitable connection API (as ``oracledb.AsyncConnection``).
+    """
+
+    def __init__(self, connection: SQLiteConnection, executor):
+        self._connection = connection
+        self._executor = executor
+        self.autocommit = True
+
+    @property
+    def call_timeout(self) -> int:
+        return self._connection.call_timeout
+
+    @call_timeout.setter
+    def call_timeout(self, value: int):
+        self._connection.call_timeout = value
+
+    def cursor(self) -> AsyncSQLiteCursor:
+        return AsyncSQLiteCursor(self._connection.cursor(), self._executor)
+
+    def cancel(self):
+        self._connection.cancel()
+
+    async def close(self):
+        self._connection.close()
+
+
+# ============================================================================
+# CSV LOADER
+# ============================================================================
+
+def _convert_date(value: bytes) -> date:
+    return date.fromisoformat(value.decode()[:10])
+
+
+sqlite3.register_converter("DATE", _convert_date)
+
+
+def _infer_column_type(name: str, values: List[str]) -> str:
+    present = [value for value in values if value != ""]
+    if not present:
+        return "TEXT"
+    if name.startswith("FECHA") and all(_DATE_VALUE.match(value) for value in present):
+        return "DATE"
+    try:
+        for value in present:
+            int(value)
+        return "INTEGER"
+    except ValueError:
+        pass
+    try:
+        for value in present:
+            float(value)
+        return "REAL"
+    except ValueError:
+        return "TEXT"
+
+
+def _cast(value: str, column_type: str):
+    if value == "":
+        return None
+    if column_type == "INTEGER":
+        return int(value)
+    if column_type == "REAL":
+        return float(value)
+    return value
+
+
+def load_csv(connection: sqlite3.Connection, csv_path: str) -> int:
+    """
+    Create SALUD_MENTAL_FEATURED from the featured CSV and return its row count.
+    Column names are upper-cased to match the Oracle table.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = [name.strip().upper() for name in next(reader)]
+        rows = list(reader)
+
+    columns = list(zip(*rows)) if rows else [[] for _ in header]
+    types = [_infer_column_type(name, list(values)) for name, values in zip(header, columns)]
+
+    column_ddl = ", ".join(f'"{name}" {column_type}' for name, column_type in zip(header, types))
+    connection.execute(f"CREATE TABLE {TABLE_NAME} ({column_ddl})")
+
+    placeholders = ", ".join("?" for _ in header)
+    connection.executemany(
+        f"INSERT INTO {TABLE_NAME} VALUES ({placeholders})",
+        ([_cast(value, column_type) for value, column_type in zip(row, types)] for row in rows)
+    )
+    connection.commit()
+    return len(rows)
+
+
+# ============================================================================
+# CONNECTION MANAGER
+# ============================================================================
+
+class SQLiteDatabaseConnection:
+    """
+    Drop-in replacement for ``DatabaseConnection`` backed by embedded SQLite.
+
+    The dataset lives in a shared-cache in-memory database kept alive by one
+    holder connection; ``get_connection`` opens a cheap new connection to it.
+    Asyncio connections wrap the same objects and run on the DB executor.
+    ``call_timeout()`` gives the statement timeout of each new connection
+    (``current_call_timeout`` of the Oracle manager).
+    """
+
+    def __init__(self, executor, acquire_metrics, async_acquire_metrics, call_timeout):
+        self._executor = executor
+        self._call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._holder: Optional[sqlite3.Connection] = None
+        self._uri = f"file:salud_mental_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._row_count = 0
+        self._warmup_statements: tuple = ()
+        self.acquire_metrics = acquire_metrics
+        self.async_acquire_metrics = async_acquire_metrics
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            self._uri,
+            uri=True,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+
+    def register_warmup_statements(self, statements):
+        """
+        Register SQL texts validated through the dialect shim during warm-up.
+        """
+        self._warmup_statements = tuple(statements)
+
+    def initialize_pool(self):
+        """
+        Load the featured CSV into the embedded database (once).
+        """
+        with self._lock:
+            if self._holder is not None:
+                return
+            csv_path = settings.sqlite_csv_path_absolute
+            logger.info(f"Loading embedded SQLite backend from {csv_path}...")
+            start = time.perf_counter()
+            holder = self._connect()
+            try:
+                self._row_count = load_csv(holder, csv_path)
+            except Exception as e:
+                holder.close()
+                logger.error(f"Error loading embedded database: {str(e)}")
+                raise
+            self._holder = holder
+            logger.info(
+                f"Embedded SQLite backend ready: {self._row_count} rows "
+                f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+
+    def initialize_async_pool(self):
+        """
+        Asyncio connections share the embedded database; just make sure it is loaded.
+        """
+        self.initialize_pool()
+
+    def get_connection(self) -> SQLiteConnection:
+        """
+        Get a connection to the embedded database.
+        """
+        if self._holder is None:
+            self.initialize_pool()
+        start = time.perf_counter()
+        connection = SQLiteConnection(self._connect())
+        self.acquire_metrics.record(time.perf_counter() - start)
+        connection.call_timeout = self._call_timeout()
+        return connection
+
+    async def get_async_connection(self) -> AsyncSQLiteConnection:
+        """
+        Get an asyncio-style connection to the embedded database.
+        """
+        if self._holder is None:
+            await self._executor.run(self.initialize_pool)
+        start = time.perf_counter()
+        connection = AsyncSQLiteConnection(SQLiteConnection(self._connect()), self._executor)
+        self.async_acquire_metrics.record(time.perf_counter() - start)
+        connection.call_timeout = self._call_timeout()
+        return connection
+
+    async def warm_up(self):
+        """
+        Check that every registered statement survives the dialect shim.
+        """
+        connection = await self.get_async_connection()
+        try:
+            cursor = connection.cursor()
+            for statement in self._warmup_statements:
+                try:
+                    await cursor.parse(statement)
+                except oracledb.Error as e:
+                    logger.warning(f"Warm-up statement not supported by SQLite shim: {str(e)}")
+            cursor.close()
+        finally:
+            await connection.close()
+
+    def stats(self) -> dict:
+        """
+        Snapshot in the same shape as ``DatabaseConnection.stats``.
+        """
+        return {
+            "backend": "sqlite",
+            "config": {"csv_path": settings.sqlite_csv_path_absolute, "rows": self._row_count},
+            "pool": None,
+            "async_pool": None,
+            "acquire": self.acquire_metrics.snapshot(),
+            "async_acquire": self.async_acquire_metrics.snapshot()
+        }
+
+    def close_pool(self):
+        """
+        Drop the embedded database.
+        """
+        with self._lock:
+            if self._holder is not None:
+                self._holder.close()
+                self._holder = None
+                logger.info("Embedded SQLite backend closed")
+
+    async def close_async_pool(self):
+        """
+        Nothing to release: asyncio connections share the embedded database.
+        """
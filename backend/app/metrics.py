@@ -0,0 +1,270 @@
+"""
+In-process request metrics in Prometheus text format.
+
+``MetricsMiddleware`` counts requests and observes their latency per route
+template. Each request also carries a ``RequestTimings`` accumulator in a
+context variable; the database layer adds to it with ``phase_timer`` /
+``record_phase`` so latency is split into:
+
+* ``db_acquire``: waiting for a DB executor worker and a pooled connection
+* ``db_execute``: statement execution and row fetching
+* ``serialization``: rendering the response body
+* ``processing``: the remainder (validation, Python post-processing, cache work)
+
+Collection is a few dict updates per request, so it stays on in production.
+Gauges (pool, caches) are read at scrape time by ``app.api.metrics``.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PHASE_ACQUIRE = "db_acquire"
+PHASE_DB = "db_execute"
+PHASE_SERIALIZATION = "serialization"
+PHASE_PROCESSING = "processing"
+
+# Seconds; covers cache hits (sub-millisecond) to slow ad-hoc queries
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Route path template by endpoint, per application
+_route_templates: Dict[int, Dict[object, str]] = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(labelnames: Iterable[str], labels: Iterable) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_family(name: str, documentation: str, kind: str, labelnames: Tuple[str, ...],
+                  samples: Iterable[Tuple[tuple, float]]) -> List[str]:
+    """
+    Lines of a metric family read at scrape time (gauges, or counters kept elsewhere).
+
+    Samples whose value is None are skipped.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is not None:
+            lines.append(f"{name}{format_labels(labelnames, labels)} {format_value(value)}")
+    return lines
+
+
+def render_request_metrics() -> List[str]:
+    """Lines of the request counters and histograms."""
+    lines: List[str] = []
+    for metric in REQUEST_METRICS:
+        lines.extend(metric.render())
+    return lines
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket ..., count above last bucket, sum]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        bucket_labelnames = self.labelnames + ("le",)
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{format_labels(bucket_labelnames, labels + (format_value(bound),))} {cumulative}"
+                )
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class RequestTimings:
+    """
+    Per-request accumulator of time spent in each phase (seconds).
+
+    Shared by reference with tasks and DB executor threads started while
+    handling the request, hence the lock.
+    """
+
+    __slots__ = ("_phases", "_lock")
+
+    def __init__(self):
+        self._phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float):
+        with self._lock:
+            self._phases[phase] = self._phases.get(phase, 0.0) + seconds
+
+    def breakdown(self, total: float) -> Dict[str, float]:
+        """
+        Measured phases plus ``processing`` as the unaccounted remainder of ``total``.
+        """
+        with self._lock:
+            phases = dict(self._phases)
+        # Concurrent sections (e.g. the dashboard) can add up to more than the wall time
+        phases[PHASE_PROCESSING] = max(0.0, total - sum(phases.values()))
+        return phases
+
+
+_current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled, or None outside a request."""
+    return _current_timings.get()
+
+
+def record_phase(phase: str, seconds: float):
+    """Add ``seconds`` to ``phase`` of the current request, if any."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def phase_timer(phase: str):
+    """Time the enclosed block as ``phase`` of the current request."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def route_template(scope: dict) -> Optional[str]:
+    """
+    Path template (e.g. ``/api/v1/query/execute``) of the route that handled
+    a request, or None when no route matched.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", None)
+    endpoint, app = scope.get("endpoint"), scope.get("app")
+    if endpoint is None or app is None:
+        return None
+    templates = _route_templates.get(id(app))
+    if templates is None:
+        templates = {
+            getattr(r, "endpoint", None): r.path for r in app.router.routes if hasattr(r, "path")
+        }
+        _route_templates[id(app)] = templates
+    return templates.get(endpoint)
+
+
+# Request metrics
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route, method and status code.", ("route", "method", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and method.", ("route", "method")
+)
+http_request_phase_seconds = Histogram(
+    "http_request_phase_seconds",
+    "Time spent per request in each phase (db_acquire, db_execute, processing, serialization).",
+    ("route", "phase")
+)
+
+REQUEST_METRICS = (http_requests_total, http_request_duration_seconds, http_request_phase_seconds)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count, latency and phase breakdown.
+
+    Streaming responses are measured until their last chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timings.reset(token)
+            total = time.perf_counter() - start
+            route = route_template(scope) or UNMATCHED_ROUTE
+            method = scope["method"]
+            http_requests_total.inc((route, method, str(status)))
+            http_request_duration_seconds.observe((route, method), total)
+            for phase, seconds in timings.breakdown(total).items():
+                http_request_phase_seconds.observe((route, phase), seconds)
@@ -13,6 +13,7 @@ from app.models.schemas import (
     TendenciaMensual,
     EstanciaStats,
     ServicioStats,
+    DashboardStats,
     HealthStatus,
     ErrorResponse
 )
@@ -29,6 +30,7 @@ __all__ = [
     'TendenciaMensual',
     'EstanciaStats',
     'ServicioStats',
+    'DashboardStats',
     'HealthStatus',
     'ErrorResponse'
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date, datetime
 
 
@@ -188,6 +188,24 @@ class ServicioStats(BaseModel):
     porcentaje: float = Field(..., description="Porcentaje del total")
 
 
+class DashboardStats(BaseModel):
+    """
+    Todas las distribuciones del dashboard en una sola respuesta.
+    Una sección que falla llega como lista vacía y aparece en ``errores``.
+    """
+    diagnosticos: List[DiagnosticoStats] = Field(default_factory=list, description="Estadísticas por categoría de diagnóstico")
+    edad: List[EdadStats] = Field(default_factory=list, description="Distribución por rango de edad")
+    sexo: List[SexoStats] = Field(default_factory=list, description="Distribución por sexo")
+    circunstancia_contacto: List[DiagnosticoStats] = Field(default_factory=list, description="Distribución por circunstancia de contacto")
+    tendencia_mensual: List[TendenciaMensual] = Field(default_factory=list, description="Tendencia mensual de ingresos")
+    duracion_estancia: List[EstanciaStats] = Field(default_factory=list, description="Distribución por duración de estancia")
+    comunidad_autonoma: List[ComunidadStats] = Field(default_factory=list, description="Estadísticas por comunidad autónoma")
+    servicio: List[ServicioStats] = Field(default_factory=list, description="Estadísticas por servicio (top 20)")
+    errores: Dict[str, str] = Field(default_factory=dict, description="Secciones no disponibles y motivo")
+    parcial: bool = Field(False, description="True si alguna sección no se pudo obtener")
+    tiempo_ms: float = Field(..., description="Tiempo total de la petición en milisegundos")
+
+
 # ============================================================================
 # MODELOS DE SISTEMA
 # ============================================================================
@@ -2,5 +2,40 @@
 Services package initialization.
 """
 from app.services.health_data_service import HealthDataService
+from app.services.stats_engine import StatsEngine
+from app.services.single_flight import SingleFlight, statistics_flight, query_flight
+from app.services.cache import (
+    ResultCache,
+    DatasetVersion,
+    StatisticsCache,
+    dataset_version,
+    statistics_cache,
+    query_cache
+)
+from app.services.refresher import StatisticsRefresher, statistics_refresher
+from app.services.query_log import QueryLog, query_log
+from app.services.workload import WorkloadStats, query_workload
+from app.services.admission import AdmissionController, AdmissionRejected, admission_controller
 
-__all__ = ['HealthDataService']
+__all__ = [
+    'HealthDataService',
+    'StatsEngine',
+    'ResultCache',
+    'DatasetVersion',
+    'StatisticsCache',
+    'dataset_version',
+    'statistics_cache',
+    'query_cache',
+    'SingleFlight',
+    'statistics_flight',
+    'query_flight',
+    'StatisticsRefresher',
+    'statistics_refresher',
+    'QueryLog',
+    'query_log',
+    'WorkloadStats',
+    'query_workload',
+    'AdmissionController',
+    'AdmissionRejected',
+    'admission_controller'
+]
@@ -0,0 +1,190 @@
+"""
+Admission control for database-backed requests.
+
+Every endpoint draws on the same pooled connections, so a burst of heavy
+ad-hoc queries or AI analyses could leave the dashboard waiting for a
+connection until it times out. Requests are admitted per workload class
+instead (statistics, data paging, custom query, AI), each with its own
+concurrency budget and FIFO queue:
+
+* a request runs at once while its class has a free slot;
+* otherwise it waits in the class queue for at most ``max_wait`` seconds;
+* a full queue or an expired wait sheds the request
+  (``AdmissionRejected``, mapped to 503 + Retry-After by the API).
+
+Keeping the ad-hoc budgets below the pool size guarantees that the
+interactive classes always find connections. All state lives on the event
+loop, so no locking is needed.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, Iterable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Workload classes
+STATISTICS = "statistics"
+DATA = "data"
+QUERY = "query"
+AI = "ai"
+
+
+class AdmissionRejected(Exception):
+    """A request was shed: its class queue is full or it waited too long."""
+
+    def __init__(self, workload: str, reason: str, retry_after: int):
+        super().__init__(f"{reason} for {workload} requests")
+        self.workload = workload
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class WorkloadClass:
+    """
+    Concurrency budget and bounded FIFO queue of one workload class.
+    """
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait_seen = 0.0
+        self._total_hold = 0.0
+        self._released = 0
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained (at least 1)."""
+        mean_hold = self._total_hold / self._released if self._released else 1.0
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(mean_hold * backlog / self.concurrency))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        logger.warning(
+            f"[admission] Shedding {self.name} request: {reason} "
+            f"({self._active}/{self.concurrency} running, {len(self._waiters)} queued)"
+        )
+        return AdmissionRejected(self.name, reason, self.retry_after())
+
+    async def acquire(self) -> float:
+        """
+        Take a slot, queueing up to ``max_wait`` seconds.
+
+        Returns:
+            Seconds spent in the queue
+
+        Raises:
+            AdmissionRejected: Queue full or wait expired
+        """
+        if self._active < self.concurrency and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return 0.0
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_full += 1
+            raise self._reject("queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            # release() hands its slot over by resolving the waiter
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected_timeout += 1
+            raise self._reject(f"no slot within {self.max_wait:g}s")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot arrived as the caller went away
+            else:
+                self._discard(waiter)
+            raise
+        wait = time.perf_counter() - start
+        self.admitted += 1
+        self._waited += 1
+        self._total_wait += wait
+        self._max_wait_seen = max(self._max_wait_seen, wait)
+        return wait
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, held: float = 0.0):
+        """Free a slot (``held``: seconds it was held), waking the next waiter."""
+        self._total_hold += held
+        self._released += 1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "max_wait_s": self.max_wait,
+            "running": self._active,
+            "queue_depth": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_ms_avg": round(self._total_wait / self._waited * 1000, 3) if self._waited else 0.0,
+            "wait_ms_max": round(self._max_wait_seen * 1000, 3),
+            "hold_ms_avg": round(self._total_hold / self._released * 1000, 3) if self._released else None
+        }
+
+
+class AdmissionController:
+    """
+    The workload classes, looked up by name.
+    """
+
+    def __init__(self, classes: Iterable[WorkloadClass], enabled: bool = True):
+        self.enabled = enabled
+        self.classes: Dict[str, WorkloadClass] = {c.name: c for c in classes}
+
+    def get(self, workload: str) -> WorkloadClass:
+        return self.classes[workload]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "classes": {name: c.stats() for name, c in self.classes.items()}
+        }
+
+
+# Singleton instance
+admission_controller = AdmissionController(
+    enabled=settings.ADMISSION_CONTROL_ENABLED,
+    classes=[
+        WorkloadClass(STATISTICS, settings.ADMISSION_STATISTICS_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+                      settings.ADMISSION_STATISTICS_MAX_WAIT_SECONDS),
+        WorkloadClass(DATA, settings.ADMISSION_DATA_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+                      settings.ADMISSION_DATA_MAX_WAIT_SECONDS),
+        WorkloadClass(QUERY, settings.ADMISSION_QUERY_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+                      settings.ADMISSION_QUERY_MAX_WAIT_SECONDS),
+        WorkloadClass(AI, settings.ADMISSION_AI_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+                      settings.ADMISSION_AI_MAX_WAIT_SECONDS)
+    ]
+)
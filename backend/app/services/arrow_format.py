@@ -0,0 +1,173 @@
+"""
+Apache Arrow IPC stream and Parquet encoding of query results.
+
+``ArrowBatchWriter`` turns each ``fetchmany`` batch into one Arrow record
+batch and returns the encoded bytes produced so far, so results can be
+streamed without materializing them. Column types come from the oracledb
+cursor description (first-batch values on the SQLite backend). ``pyarrow``
+is optional: without it ``arrow_available()`` is False and the endpoints
+answer 406.
+"""
+import io
+import logging
+from typing import Any, List, Optional
+
+import oracledb
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Binary output formats and their media types
+BINARY_MEDIA_TYPES = {
+    "arrow": ARROW_STREAM_MEDIA_TYPE,
+    "parquet": PARQUET_MEDIA_TYPE
+}
+
+# Accept header values understood for content negotiation
+ACCEPT_FORMATS = {
+    ARROW_STREAM_MEDIA_TYPE: "arrow",
+    "application/vnd.apache.arrow.file": "arrow",
+    PARQUET_MEDIA_TYPE: "parquet",
+    "application/x-parquet": "parquet",
+    "application/parquet": "parquet"
+}
+
+PYARROW_MISSING_DETAIL = "Arrow/Parquet output requires the optional 'pyarrow' package"
+
+
+def arrow_available() -> bool:
+    """True when pyarrow is installed."""
+    return pa is not None
+
+
+def negotiate_binary_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Return "arrow" or "parquet" when the Accept header asks for it, else None.
+    """
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in ACCEPT_FORMATS:
+            return ACCEPT_FORMATS[media_type]
+    return None
+
+
+def _described_type(desc) -> Optional["pa.DataType"]:
+    """Arrow type from an oracledb description entry, None when it must be inferred."""
+    type_code, precision, scale = desc[1], desc[4], desc[5]
+    if type_code is None:
+        return None
+    if type_code == oracledb.DB_TYPE_DATE:
+        return pa.timestamp("s")
+    if type_code == oracledb.DATETIME:
+        return pa.timestamp("us")
+    if type_code == oracledb.NUMBER:
+        # Declared integers (NUMBER(p,0)); expressions such as COUNT(*) have no precision
+        if scale == 0 and precision:
+            return pa.int64()
+        return pa.float64()
+    if type_code == oracledb.STRING:
+        return pa.string()
+    if type_code == oracledb.BINARY:
+        return pa.binary()
+    return pa.string()
+
+
+def _inferred_type(values: List[Any]) -> "pa.DataType":
+    """Arrow type for a column without type metadata, from its first non-NULL value."""
+    sample = next((value for value in values if value is not None), None)
+    if sample is None:
+        return pa.string()
+    return pa.array([sample]).type
+
+
+def build_schema(columns: List[str], description, rows: List[tuple]) -> "pa.Schema":
+    """
+    Arrow schema for a result set.
+
+    Args:
+        columns: Column names
+        description: Cursor description
+        rows: First batch of rows, used only for columns without type metadata
+
+    Returns:
+        pyarrow schema with nullable fields
+    """
+    fields = []
+    for i, (name, desc) in enumerate(zip(columns, description)):
+        arrow_type = _described_type(desc)
+        if arrow_type is None:
+            arrow_type = _inferred_type([row[i] for row in rows])
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class ArrowBatchWriter:
+    """
+    Incremental Arrow IPC stream / Parquet encoder.
+
+    ``write(rows)`` encodes one batch and returns the bytes ready to send;
+    ``close()`` returns the trailing bytes (end-of-stream marker or Parquet
+    footer). One Parquet row group is written per batch.
+    """
+
+    def __init__(self, fmt: str, columns: List[str], description):
+        if pa is None:
+            raise RuntimeError(PYARROW_MISSING_DETAIL)
+        self.fmt = fmt
+        self.columns = columns
+        self.description = description
+        self.schema = None
+        self.rows_written = 0
+        self._sink = io.BytesIO()
+        self._writer = None
+
+    def _open(self, rows: List[tuple]):
+        self.schema = build_schema(self.columns, self.description, rows)
+        if self.fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, self.schema)
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def write(self, rows: List[tuple]) -> bytes:
+        """Encode a batch of fetched rows and return the bytes produced."""
+        if self._writer is None:
+            self._open(rows)
+        if rows:
+            # Transpose once per batch; pyarrow converts each column in C
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*rows), self.schema)
+            ]
+            self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+            self.rows_written += len(rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        """Finish the stream/file and return the remaining bytes."""
+        if self._writer is None:
+            self._open([])
+        self._writer.close()
+        return self._drain()
+
+    def encode_all(self, rows: List[tuple], batch_size: int) -> bytes:
+        """Encode already fetched rows in ``batch_size`` record batches."""
+        chunks = [self.write(rows[start:start + batch_size]) for start in range(0, len(rows), batch_size)]
+        chunks.append(self.close())
+        return b"".join(chunks)
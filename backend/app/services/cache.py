@@ -0,0 +1,370 @@
+"""
+Result caching for dataset-derived responses.
+
+``ResultCache`` is a byte-budgeted LRU whose entries are tagged with the
+dataset version they were computed from. ``DatasetVersion`` probes the table
+cheaply (row count plus ``MAX(ORA_ROWSCN)``) at most every
+``CACHE_VERSION_CHECK_SECONDS`` and tells subscribers when the data changed.
+``StatisticsCache`` wraps ``HealthDataService`` so the statistics routes only
+touch Oracle on a miss; the dashboard breakdowns are filled together from a
+single ``StatsEngine`` scan. ``query_cache`` holds ``/query/execute`` results.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional
+
+from app.config import settings
+from app.database.connection import db_connection
+from app.metrics import PHASE_DB, phase_timer
+from app.services.health_data_service import HealthDataService
+from app.services.single_flight import statistics_flight
+from app.services.sql_validator import COMMENT, SPACE, tokenize
+from app.services.stats_engine import StatsEngine
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+DATASET_VERSION_SQL = "SELECT COUNT(*), MAX(ORA_ROWSCN) FROM SALUD_MENTAL_FEATURED"
+
+# HealthDataService methods answered by the single-scan dashboard engine
+ENGINE_METHODS = frozenset(StatsEngine.METHODS.values())
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Canonical text of a statement for cache keys.
+
+    Keywords and unquoted identifiers are upper-cased; string literals,
+    quoted identifiers and bind names are kept exactly as written (they are
+    case-sensitive); comments, layout and a trailing ``;`` are dropped.
+    """
+    parts = [token.upper for token in tokenize(query) if token.kind not in (COMMENT, SPACE)]
+    while parts and parts[-1] == ";":
+        parts.pop()
+    return " ".join(parts)
+
+
+def query_cache_key(query: str, params: Optional[dict], limit: Optional[int]) -> tuple:
+    """
+    Cache key for a custom query: normalized text, sorted binds and row limit.
+    """
+    binds = json.dumps(sorted((params or {}).items()), default=str)
+    return (normalize_sql(query), binds, limit)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate memory cost of a cached value by its JSON size in bytes.
+    """
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache bounded by an approximate byte budget.
+
+    Entries remember the dataset version and creation time; a lookup with a
+    different version, or after ``max_age`` seconds, is a miss. With
+    ``keep_stale`` such entries stay available to ``peek`` until replaced or
+    evicted, so callers can serve them while a fresh value is computed.
+    """
+
+    def __init__(self, name: str, max_bytes: int, max_age: Optional[float] = None, keep_stale: bool = False):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep_stale = keep_stale
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Any) -> Any:
+        """
+        Return the cached value for ``key`` at ``version`` or ``MISSING``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, value, size, created = entry
+                expired = self.max_age is not None and time.monotonic() - created > self.max_age
+                if entry_version == version and not expired:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if not self.keep_stale:
+                    self._remove(key)
+            self.misses += 1
+            return MISSING
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        Return the value stored for ``key`` whatever its version or age, or ``MISSING``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else MISSING
+
+    def put(self, key: Hashable, version: Any, value: Any, size: Optional[int] = None):
+        """
+        Store a value, evicting least recently used entries beyond the budget.
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions
+            }
+
+
+class DatasetVersion:
+    """
+    Cheap, rate-limited probe of the SALUD_MENTAL_FEATURED dataset version.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._version: Any = None
+        self._checked_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._subscribers: List[Callable[[Any, Any], None]] = []
+
+    @property
+    def value(self) -> Any:
+        """Last probed version (None before the first probe)."""
+        return self._version
+
+    def subscribe(self, callback: Callable[[Any, Any], None]):
+        """
+        Register ``callback(old_version, new_version)`` for dataset changes.
+        """
+        self._subscribers.append(callback)
+
+    async def _probe(self) -> Any:
+        connection = await db_connection.get_async_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                with phase_timer(PHASE_DB):
+                    await cursor.execute(DATASET_VERSION_SQL)
+                    row = await cursor.fetchone()
+            finally:
+                cursor.close()
+        finally:
+            await connection.close()
+        return tuple(row) if row else None
+
+    async def current(self, force: bool = False) -> Any:
+        """
+        Return the dataset version, probing the database if the last check is stale.
+        """
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._version
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another coroutine may have probed while we waited for the lock
+            if not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._version
+            try:
+                version = await self._probe()
+            except Exception as e:
+                logger.warning(f"Dataset version probe failed, keeping previous version: {str(e)}")
+                self._checked_at = time.monotonic()
+                return self._version
+            old_version, self._version = self._version, version
+            self._checked_at = time.monotonic()
+            if old_version is not None and old_version != version:
+                logger.info(f"Dataset version changed: {old_version} -> {version}")
+                for callback in self._subscribers:
+                    callback(old_version, version)
+            return version
+
+
+class StatisticsCache:
+    """
+    Versioned cache in front of the asyncio ``HealthDataService`` methods.
+
+    ``await statistics_cache.get("get_diagnosticos_stats")`` returns the cached
+    result for the current dataset version, or acquires a connection, calls
+    ``HealthDataService.get_diagnosticos_stats_async`` and caches the result.
+    Methods in ``ENGINE_METHODS`` are instead computed all at once by
+    ``StatsEngine`` and every breakdown is cached from that single scan.
+    Concurrent misses for the same result share one in-flight load.
+    With ``stale_while_revalidate`` a miss that still has an older value
+    returns it immediately and refreshes it in the background.
+    Cached values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, cache: ResultCache, version: DatasetVersion, enabled: bool = True,
+                 stale_while_revalidate: bool = False):
+        self.cache = cache
+        self.version = version
+        self.enabled = enabled
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_served = 0
+        self._revalidations: set = set()
+        if stale_while_revalidate:
+            # Old entries are the stale values served while refreshing
+            cache.keep_stale = True
+        else:
+            version.subscribe(lambda old, new: cache.clear())
+
+    @staticmethod
+    async def load(method_name: str, *args) -> Any:
+        """
+        Run a ``HealthDataService`` asyncio method on a pooled connection.
+        """
+        method = getattr(HealthDataService, f"{method_name}_async")
+        connection = await db_connection.get_async_connection()
+        try:
+            return await method(connection, *args)
+        finally:
+            await connection.close()
+
+    @staticmethod
+    async def load_dashboard() -> dict:
+        """
+        Run the single-scan ``StatsEngine`` on a pooled connection.
+        """
+        connection = await db_connection.get_async_connection()
+        try:
+            return await StatsEngine.compute_async(connection)
+        finally:
+            await connection.close()
+
+    async def _fill_dashboard(self, version: Any) -> dict:
+        results = await self.load_dashboard()
+        for name, result in results.items():
+            self.cache.put((name,), version, result)
+        return results
+
+    async def _fill(self, key: tuple, version: Any, method_name: str, *args) -> Any:
+        value = await self.load(method_name, *args)
+        self.cache.put(key, version, value)
+        return value
+
+    async def refresh(self, method_name: str, *args):
+        """
+        Recompute a result for the current dataset version and cache it.
+
+        Joins an in-flight load of the same result instead of starting another;
+        refreshing any ``ENGINE_METHODS`` entry refreshes all of them.
+        """
+        version = await self.version.current()
+        if method_name in ENGINE_METHODS and not args:
+            await statistics_flight.do(("dashboard", version), self._fill_dashboard, version)
+        else:
+            key = (method_name,) + args
+            await statistics_flight.do((version,) + key, self._fill, key, version, method_name, *args)
+
+    def _serve_stale(self, method_name: str, *args) -> Any:
+        """
+        Return an outdated value for the result, scheduling its refresh, or ``MISSING``.
+        """
+        if not self.stale_while_revalidate:
+            return MISSING
+        value = self.cache.peek((method_name,) + args)
+        if value is MISSING:
+            return MISSING
+        self.stale_served += 1
+        task = asyncio.ensure_future(self.refresh(method_name, *args))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidated)
+        return value
+
+    def _revalidated(self, task: asyncio.Task):
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background statistics refresh failed: {str(task.exception())}")
+
+    async def _get_dashboard(self, method_name: str) -> Any:
+        if not self.enabled:
+            results = await statistics_flight.do(("dashboard",), self.load_dashboard)
+            return results[method_name]
+        version = await self.version.current()
+        key = (method_name,)
+        value = self.cache.get(key, version)
+        if value is MISSING:
+            value = self._serve_stale(method_name)
+        if value is MISSING:
+            # Every breakdown shares one in-flight scan, which fills all of them
+            results = await statistics_flight.do(("dashboard", version), self._fill_dashboard, version)
+            value = results[method_name]
+        return value
+
+    async def get(self, method_name: str, *args) -> Any:
+        if method_name in ENGINE_METHODS and not args:
+            return await self._get_dashboard(method_name)
+        key = (method_name,) + args
+        if not self.enabled:
+            return await statistics_flight.do(key, self.load, method_name, *args)
+        version = await self.version.current()
+        value = self.cache.get(key, version)
+        if value is MISSING:
+            value = self._serve_stale(method_name, *args)
+        if value is MISSING:
+            # Concurrent misses for the same key await a single load
+            value = await statistics_flight.do((version,) + key, self._fill, key, version, method_name, *args)
+        return value
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        stats["enabled"] = self.enabled
+        stats["stale_while_revalidate"] = self.stale_while_revalidate
+        stats["stale_served"] = self.stale_served
+        stats["single_flight"] = statistics_flight.stats()
+        stats["dataset_version"] = list(self.version.value) if self.version.value else None
+        return stats
+
+
+# Singleton instances
+dataset_version = DatasetVersion(check_interval=settings.CACHE_VERSION_CHECK_SECONDS)
+statistics_cache = StatisticsCache(
+    ResultCache("statistics", settings.CACHE_STATISTICS_MAX_BYTES, settings.CACHE_MAX_AGE_SECONDS),
+    dataset_version,
+    enabled=settings.CACHE_ENABLED,
+    stale_while_revalidate=settings.STATISTICS_STALE_WHILE_REVALIDATE
+)
+query_cache = ResultCache("query", settings.CACHE_QUERY_MAX_BYTES, settings.CACHE_MAX_AGE_SECONDS)
+dataset_version.subscribe(lambda old, new: query_cache.clear())
@@ -1,548 +1,1049 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from datetime import date, datetime
 import oracledb
+import base64
+import functools
+import hashlib
+import json
 import logging
+import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.config import settings
+from app.metrics import PHASE_DB, phase_timer
+from app.services.query_log import estimate_round_trips, query_log
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# SQL STATEMENTS
+# ============================================================================
+
+DIAGNOSTICOS_STATS_SQL = """
+    SELECT
+        CATEGORIA,
+        COUNT(*) as total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
+    FROM SALUD_MENTAL_FEATURED
+    WHERE CATEGORIA IS NOT NULL
+    GROUP BY CATEGORIA
+    ORDER BY total DESC
+"""
+
+EDAD_DISTRIBUTION_SQL = """
+    SELECT
+        CASE
+            WHEN EDAD BETWEEN 0 AND 17 THEN '0-17'
+            WHEN EDAD BETWEEN 18 AND 25 THEN '18-25'
+            WHEN EDAD BETWEEN 26 AND 35 THEN '26-35'
+            WHEN EDAD BETWEEN 36 AND 45 THEN '36-45'
+            WHEN EDAD BETWEEN 46 AND 55 THEN '46-55'
+            WHEN EDAD BETWEEN 56 AND 65 THEN '56-65'
+            WHEN EDAD > 65 THEN '65+'
+            ELSE 'Unknown'
+        END as rango_edad,
+        COUNT(*) as total
+    FROM SALUD_MENTAL_FEATURED
+    WHERE EDAD IS NOT NULL
+    GROUP BY
+        CASE
+            WHEN EDAD BETWEEN 0 AND 17 THEN '0-17'
+            WHEN EDAD BETWEEN 18 AND 25 THEN '18-25'
+            WHEN EDAD BETWEEN 26 AND 35 THEN '26-35'
+            WHEN EDAD BETWEEN 36 AND 45 THEN '36-45'
+            WHEN EDAD BETWEEN 46 AND 55 THEN '46-55'
+            WHEN EDAD BETWEEN 56 AND 65 THEN '56-65'
+            WHEN EDAD > 65 THEN '65+'
+            ELSE 'Unknown'
+        END
+    ORDER BY
+        CASE rango_edad
+            WHEN '0-17' THEN 1
+            WHEN '18-25' THEN 2
+            WHEN '26-35' THEN 3
+            WHEN '36-45' THEN 4
+            WHEN '46-55' THEN 5
+            WHEN '56-65' THEN 6
+            WHEN '65+' THEN 7
+            ELSE 8
+        END
+"""
+
+GENERO_DISTRIBUTION_SQL = """
+    SELECT
+        CASE
+            WHEN SEXO = 1 THEN 'Hombre'
+            WHEN SEXO = 2 THEN 'Mujer'
+            ELSE 'Otro'
+        END as sexo,
+        COUNT(*) as total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
+    FROM SALUD_MENTAL_FEATURED
+    WHERE SEXO IS NOT NULL
+    GROUP BY SEXO
+    ORDER BY total DESC
+"""
+
+TIPO_INGRESO_STATS_SQL = """
+    SELECT
+        CIRCUNSTANCIA_DE_CONTACTO,
+        COUNT(*) as total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
+    FROM SALUD_MENTAL_FEATURED
+    WHERE CIRCUNSTANCIA_DE_CONTACTO IS NOT NULL
+    GROUP BY CIRCUNSTANCIA_DE_CONTACTO
+    ORDER BY total DESC
+"""
+
+TENDENCIA_MENSUAL_YEAR_SQL = """
+    SELECT
+        TO_CHAR(FECHA_INGRESO, 'MM') as mes,
+        TO_CHAR(FECHA_INGRESO, 'YYYY') as anio,
+        COUNT(*) as total
+    FROM SALUD_MENTAL_FEATURED
+    WHERE EXTRACT(YEAR FROM FECHA_INGRESO) = :year
+    GROUP BY TO_CHAR(FECHA_INGRESO, 'MM'), TO_CHAR(FECHA_INGRESO, 'YYYY')
+    ORDER BY mes
+"""
+
+TENDENCIA_MENSUAL_LAST_YEAR_SQL = """
+    SELECT
+        TO_CHAR(FECHA_INGRESO, 'MM') as mes,
+        TO_CHAR(FECHA_INGRESO, 'YYYY') as anio,
+        COUNT(*) as total
+    FROM SALUD_MENTAL_FEATURED
+    WHERE FECHA_INGRESO >= ADD_MONTHS(SYSDATE, -12)
+    GROUP BY TO_CHAR(FECHA_INGRESO, 'MM'), TO_CHAR(FECHA_INGRESO, 'YYYY')
+    ORDER BY anio, mes
+"""
+
+DURACION_ESTANCIA_SQL = """
+    SELECT
+        CASE
+            WHEN ESTANCIA_DIAS BETWEEN 1 AND 3 THEN '1-3 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 4 AND 7 THEN '4-7 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 8 AND 14 THEN '8-14 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 15 AND 30 THEN '15-30 dias'
+            WHEN ESTANCIA_DIAS > 30 THEN '30+ dias'
+            ELSE 'Unknown'
+        END as rango_dias,
+        COUNT(*) as total
+    FROM SALUD_MENTAL_FEATURED
+    WHERE ESTANCIA_DIAS IS NOT NULL
+    GROUP BY
+        CASE
+            WHEN ESTANCIA_DIAS BETWEEN 1 AND 3 THEN '1-3 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 4 AND 7 THEN '4-7 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 8 AND 14 THEN '8-14 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 15 AND 30 THEN '15-30 dias'
+            WHEN ESTANCIA_DIAS > 30 THEN '30+ dias'
+            ELSE 'Unknown'
+        END
+    ORDER BY
+        CASE rango_dias
+            WHEN '1-3 dias' THEN 1
+            WHEN '4-7 dias' THEN 2
+            WHEN '8-14 dias' THEN 3
+            WHEN '15-30 dias' THEN 4
+            WHEN '30+ dias' THEN 5
+            ELSE 6
+        END
+"""
+
+# Patient and admission lists are ordered by (key, ROWID) so every row has a
+# unique position; the trailing ROWID column feeds the continuation cursor.
+PACIENTES_LIST_SQL = """
+    SELECT NOMBRE_COMPLETO, EDAD, SEXO, COMUNIDAD_AUTONOMA, FECHA_NACIMIENTO,
+           ROWIDTOCHAR(ROWID)
+    FROM SALUD_MENTAL_FEATURED
+    ORDER BY NOMBRE_COMPLETO NULLS FIRST, ROWID
+    OFFSET :skip ROWS
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+# Keyset page after a non-NULL name: a range scan from the last position
+PACIENTES_SEEK_SQL = """
+    SELECT NOMBRE_COMPLETO, EDAD, SEXO, COMUNIDAD_AUTONOMA, FECHA_NACIMIENTO,
+           ROWIDTOCHAR(ROWID)
+    FROM SALUD_MENTAL_FEATURED
+    WHERE NOMBRE_COMPLETO >= :last_key
+      AND (NOMBRE_COMPLETO > :last_key OR ROWID > CHARTOROWID(:last_rowid))
+    ORDER BY NOMBRE_COMPLETO, ROWID
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+# Keyset page while still inside the leading block of NULL names
+PACIENTES_SEEK_NULL_SQL = """
+    SELECT NOMBRE_COMPLETO, EDAD, SEXO, COMUNIDAD_AUTONOMA, FECHA_NACIMIENTO,
+           ROWIDTOCHAR(ROWID)
+    FROM SALUD_MENTAL_FEATURED
+    WHERE (NOMBRE_COMPLETO IS NULL AND ROWID > CHARTOROWID(:last_rowid))
+       OR NOMBRE_COMPLETO IS NOT NULL
+    ORDER BY NOMBRE_COMPLETO NULLS FIRST, ROWID
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+DIAGNOSTICOS_LIST_SQL = """
+    SELECT DIAGNOSTICO_PRINCIPAL, CATEGORIA, COUNT(*) as casos
+    FROM SALUD_MENTAL_FEATURED
+    WHERE DIAGNOSTICO_PRINCIPAL IS NOT NULL
+    GROUP BY DIAGNOSTICO_PRINCIPAL, CATEGORIA
+    ORDER BY casos DESC
+    OFFSET :skip ROWS
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+INGRESOS_LIST_SQL = """
+    SELECT NOMBRE_COMPLETO, FECHA_INGRESO, FECHA_FIN_CONTACTO,
+           ESTANCIA_DIAS, DIAGNOSTICO_PRINCIPAL, CATEGORIA,
+           TIPO_ALTA, SERVICIO, ROWIDTOCHAR(ROWID)
+    FROM SALUD_MENTAL_FEATURED
+    WHERE FECHA_INGRESO IS NOT NULL
+    ORDER BY FECHA_INGRESO DESC, ROWID DESC
+    OFFSET :skip ROWS
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+INGRESOS_SEEK_SQL = """
+    SELECT NOMBRE_COMPLETO, FECHA_INGRESO, FECHA_FIN_CONTACTO,
+           ESTANCIA_DIAS, DIAGNOSTICO_PRINCIPAL, CATEGORIA,
+           TIPO_ALTA, SERVICIO, ROWIDTOCHAR(ROWID)
+    FROM SALUD_MENTAL_FEATURED
+    WHERE FECHA_INGRESO <= :last_key
+      AND (FECHA_INGRESO < :last_key OR ROWID < CHARTOROWID(:last_rowid))
+    ORDER BY FECHA_INGRESO DESC, ROWID DESC
+    FETCH NEXT :limit ROWS ONLY
+"""
+
+COMUNIDAD_STATS_SQL = """
+    SELECT
+        COMUNIDAD_AUTONOMA,
+        COUNT(*) as total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
+    FROM SALUD_MENTAL_FEATURED
+    WHERE COMUNIDAD_AUTONOMA IS NOT NULL
+    GROUP BY COMUNIDAD_AUTONOMA
+    ORDER BY total DESC
+"""
+
+SERVICIO_STATS_SQL = """
+    SELECT
+        SERVICIO,
+        COUNT(*) as total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
+    FROM SALUD_MENTAL_FEATURED
+    WHERE SERVICIO IS NOT NULL
+    GROUP BY SERVICIO
+    ORDER BY total DESC
+    FETCH FIRST 20 ROWS ONLY
+"""
+
+TEMPORAL_TRENDS_SQL = """
+    SELECT
+      EXTRACT(YEAR FROM FECHA_INGRESO) as ano,
+      MES_INGRESO as mes,
+      COUNT(*) as total_ingresos,
+      ROUND(AVG(ESTANCIA_DIAS), 2) as estancia_promedio,
+      ROUND(AVG(COSTE_APR), 2) as coste_promedio,
+      ROUND(AVG(EDAD), 1) as edad_promedio,
+      COUNT(CASE WHEN NIVEL_SEVERIDAD_APR IN (3, 4) THEN 1 END) as casos_severos,
+      COUNT(CASE WHEN CIRCUNSTANCIA_CONTACTO = 1 THEN 1 END) as ingresos_urgentes,
+      ROUND(COUNT(CASE WHEN CIRCUNSTANCIA_CONTACTO = 1 THEN 1 END) * 100.0 / COUNT(*), 1) as porcentaje_urgentes,
+      COUNT(DISTINCT CATEGORIA) as categorias_distintas
+    FROM SALUD_MENTAL_FEATURED
+    WHERE MES_INGRESO IS NOT NULL
+      AND FECHA_INGRESO IS NOT NULL
+    GROUP BY EXTRACT(YEAR FROM FECHA_INGRESO), MES_INGRESO
+    ORDER BY
+      EXTRACT(YEAR FROM FECHA_INGRESO),
+      MES_INGRESO
+"""
+
+COUNT_TOTAL_SQL = "SELECT COUNT(*) FROM SALUD_MENTAL_FEATURED"
+
+# Fixed statements pre-parsed into every pooled connection's statement cache
+WARMUP_STATEMENTS = (
+    DIAGNOSTICOS_STATS_SQL,
+    EDAD_DISTRIBUTION_SQL,
+    GENERO_DISTRIBUTION_SQL,
+    TIPO_INGRESO_STATS_SQL,
+    TENDENCIA_MENSUAL_YEAR_SQL,
+    TENDENCIA_MENSUAL_LAST_YEAR_SQL,
+    DURACION_ESTANCIA_SQL,
+    PACIENTES_LIST_SQL,
+    PACIENTES_SEEK_SQL,
+    PACIENTES_SEEK_NULL_SQL,
+    DIAGNOSTICOS_LIST_SQL,
+    INGRESOS_LIST_SQL,
+    INGRESOS_SEEK_SQL,
+    COMUNIDAD_STATS_SQL,
+    SERVICIO_STATS_SQL,
+    TEMPORAL_TRENDS_SQL,
+    COUNT_TOTAL_SQL
+)
+
+# Names shown for these statements in the query log (/pool/queries)
+STATEMENT_NAMES = {
+    DIAGNOSTICOS_STATS_SQL: "diagnosticos_stats",
+    EDAD_DISTRIBUTION_SQL: "edad_distribution",
+    GENERO_DISTRIBUTION_SQL: "genero_distribution",
+    TIPO_INGRESO_STATS_SQL: "tipo_ingreso_stats",
+    TENDENCIA_MENSUAL_YEAR_SQL: "tendencia_mensual_year",
+    TENDENCIA_MENSUAL_LAST_YEAR_SQL: "tendencia_mensual_last_year",
+    DURACION_ESTANCIA_SQL: "duracion_estancia",
+    PACIENTES_LIST_SQL: "pacientes_list",
+    PACIENTES_SEEK_SQL: "pacientes_seek",
+    PACIENTES_SEEK_NULL_SQL: "pacientes_seek_null",
+    DIAGNOSTICOS_LIST_SQL: "diagnosticos_list",
+    INGRESOS_LIST_SQL: "ingresos_list",
+    INGRESOS_SEEK_SQL: "ingresos_seek",
+    COMUNIDAD_STATS_SQL: "comunidad_stats",
+    SERVICIO_STATS_SQL: "servicio_stats",
+    TEMPORAL_TRENDS_SQL: "temporal_trends",
+    COUNT_TOTAL_SQL: "count_total"
+}
+query_log.name_statements(STATEMENT_NAMES)
+
+
+@functools.lru_cache(maxsize=1)
+def _page_cursor_cipher() -> Fernet:
+    """
+    Fernet (AES + HMAC) keyed from SECRET_KEY: continuation tokens carry the
+    last row's sort key (a patient name on /data/pacientes), so they are
+    encrypted and authenticated rather than merely encoded.
+    """
+    digest = hashlib.sha256(b"page-cursor:" + settings.SECRET_KEY.encode("utf-8")).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+def encode_page_cursor(last_key: Any, last_rowid: Any) -> str:
+    """
+    Build the opaque continuation token for the row ``(last_key, last_rowid)``.
+
+    Dates keep their type and full time of day, so the seek binds a typed
+    DATE instead of comparing the column to a string.
+    """
+    key_type = None
+    if isinstance(last_key, datetime):
+        key_type, last_key = "datetime", last_key.isoformat()
+    elif isinstance(last_key, date):
+        key_type, last_key = "date", last_key.isoformat()
+    payload = json.dumps({"k": last_key, "t": key_type, "r": last_rowid}, separators=(",", ":"))
+    return _page_cursor_cipher().encrypt(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_page_cursor(token: str) -> Tuple[Any, Any]:
+    """
+    Decode a continuation token into ``(last_key, last_rowid)``.
+
+    Raises:
+        ValueError: If the token is malformed, tampered with or was issued
+            under another SECRET_KEY
+    """
+    try:
+        payload = json.loads(_page_cursor_cipher().decrypt(token.encode("ascii")))
+        last_key, key_type, last_rowid = payload["k"], payload.get("t"), payload["r"]
+        if key_type == "datetime":
+            last_key = datetime.fromisoformat(last_key)
+        elif key_type == "date":
+            last_key = date.fromisoformat(last_key)
+    except (InvalidToken, ValueError, KeyError, TypeError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+    if last_rowid is None:
+        raise ValueError("Invalid pagination cursor")
+    return last_key, last_rowid
+
+
+def _as_date(value: Any) -> Optional[date]:
+    """Calendar date of a DATE column value (Oracle DATE is fetched as datetime)."""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+MONTH_NAMES = {
+    '01': 'Enero', '02': 'Febrero', '03': 'Marzo', '04': 'Abril',
+    '05': 'Mayo', '06': 'Junio', '07': 'Julio', '08': 'Agosto',
+    '09': 'Septiembre', '10': 'Octubre', '11': 'Noviembre', '12': 'Diciembre'
+}
+
+
 class HealthDataService:
     """
     Service layer for health mental data operations.
     Handles all database queries and business logic.
+
+    Every query method has two variants sharing the same SQL and row mapping:
+    the blocking one (``get_x(connection)``) for ``oracledb.Connection`` and
+    a coroutine (``get_x_async(connection)``) for ``oracledb.AsyncConnection``.
     """
-    
+
+    # ------------------------------------------------------------------
+    # Statement execution helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _record(cursor, query: str, binds: dict, rows: Optional[list], execute_s: float, fetch_s: float,
+                error: Optional[Exception] = None):
+        """Report one execution to the query log."""
+        count = len(rows) if rows is not None else 0
+        round_trips = estimate_round_trips(
+            count,
+            getattr(cursor, "prefetchrows", settings.ORACLE_PREFETCHROWS),
+            cursor.arraysize
+        )
+        query_log.record(query, binds, count, round_trips, execute_s, fetch_s, error)
+
+    @staticmethod
+    def execute_statement(connection, query: str, binds: Optional[dict] = None) -> Tuple[List[tuple], list]:
+        """
+        Execute a statement on a blocking connection and fetch all rows.
+
+        Every service query goes through here (or the asyncio variant), which
+        times execute and fetch separately and reports them to ``query_log``.
+
+        Returns:
+            Tuple of (rows, cursor description)
+        """
+        binds = binds or {}
+        cursor = connection.cursor()
+        rows, error, executed_at = None, None, None
+        start = time.perf_counter()
+        try:
+            with phase_timer(PHASE_DB):
+                cursor.execute(query, **binds)
+                executed_at = time.perf_counter()
+                rows = cursor.fetchall()
+            return rows, cursor.description
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            end = time.perf_counter()
+            execute_s = (executed_at or end) - start
+            HealthDataService._record(cursor, query, binds, rows, execute_s, end - start - execute_s, error)
+            cursor.close()
+
+    @staticmethod
+    async def execute_statement_async(connection, query: str, binds: Optional[dict] = None) -> Tuple[List[tuple], list]:
+        """Asyncio variant of :meth:`execute_statement`."""
+        binds = binds or {}
+        cursor = connection.cursor()
+        rows, error, executed_at = None, None, None
+        start = time.perf_counter()
+        try:
+            with phase_timer(PHASE_DB):
+                await cursor.execute(query, **binds)
+                executed_at = time.perf_counter()
+                rows = await cursor.fetchall()
+            return rows, cursor.description
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            end = time.perf_counter()
+            execute_s = (executed_at or end) - start
+            HealthDataService._record(cursor, query, binds, rows, execute_s, end - start - execute_s, error)
+            cursor.close()
+
+    @staticmethod
+    def _fetch_rows(connection, query: str, **binds) -> List[tuple]:
+        """Execute a statement on a blocking connection and fetch all rows."""
+        return HealthDataService.execute_statement(connection, query, binds)[0]
+
+    @staticmethod
+    async def _fetch_rows_async(connection, query: str, **binds) -> List[tuple]:
+        """Execute a statement on an asyncio connection and fetch all rows."""
+        return (await HealthDataService.execute_statement_async(connection, query, binds))[0]
+
+    @staticmethod
+    def _fetch_dicts(connection, query: str, **binds) -> List[dict]:
+        """Execute a statement and return rows as dicts keyed by lowercase column name."""
+        rows, description = HealthDataService.execute_statement(connection, query, binds)
+        columns = [desc[0].lower() for desc in description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    async def _fetch_dicts_async(connection, query: str, **binds) -> List[dict]:
+        """Asyncio variant of :meth:`_fetch_dicts`."""
+        rows, description = await HealthDataService.execute_statement_async(connection, query, binds)
+        columns = [desc[0].lower() for desc in description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Row mappers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _map_diagnosticos_stats(rows: List[tuple]) -> List[dict]:
+        return [
+            {"categoria": row[0], "total": row[1], "porcentaje": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_edad_distribution(rows: List[tuple]) -> List[dict]:
+        return [{"rango_edad": row[0], "total": row[1]} for row in rows]
+
+    @staticmethod
+    def _map_genero_distribution(rows: List[tuple]) -> List[dict]:
+        return [
+            {"sexo": row[0], "total": row[1], "porcentaje": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_tipo_ingreso_stats(rows: List[tuple]) -> List[dict]:
+        return [
+            {"tipo_ingreso": str(row[0]), "total": row[1], "porcentaje": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_tendencia_mensual(rows: List[tuple]) -> List[dict]:
+        return [
+            {"mes": MONTH_NAMES.get(row[0], row[0]), "anio": row[1], "total": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_duracion_estancia(rows: List[tuple]) -> List[dict]:
+        return [{"rango_dias": row[0], "total": row[1]} for row in rows]
+
+    @staticmethod
+    def _map_pacientes_list(rows: List[tuple]) -> List[dict]:
+        return [
+            {
+                "nombre": row[0],
+                "edad": row[1],
+                "sexo": row[2],
+                "comunidad_autonoma": row[3],
+                "fecha_de_nacimiento": _as_date(row[4])
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_diagnosticos_list(rows: List[tuple]) -> List[dict]:
+        return [
+            {"diagnostico_principal": row[0], "categoria": row[1], "casos": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_ingresos_list(rows: List[tuple]) -> List[dict]:
+        return [
+            {
+                "nombre": row[0],
+                "fecha_de_ingreso": _as_date(row[1]),
+                "fecha_de_fin_contacto": _as_date(row[2]),
+                "estancia_dias": row[3],
+                "diagnostico_principal": row[4],
+                "categoria": row[5],
+                "tipo_alta": row[6],
+                "servicio": row[7]
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_comunidad_stats(rows: List[tuple]) -> List[dict]:
+        return [
+            {"comunidad_autonoma": row[0], "total": row[1], "porcentaje": row[2]}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _map_servicio_stats(rows: List[tuple]) -> List[dict]:
+        return [
+            {"servicio": row[0], "total": row[1], "porcentaje": row[2]}
+            for row in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
     @staticmethod
     def get_diagnosticos_stats(connection) -> List[dict]:
         """
         Get diagnosis statistics grouped by category.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with diagnosis statistics
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    CATEGORIA,
-                    COUNT(*) as total,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
-                FROM SALUD_MENTAL_FEATURED
-                WHERE CATEGORIA IS NOT NULL
-                GROUP BY CATEGORIA
-                ORDER BY total DESC
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "categoria": row[0],
-                    "total": row[1],
-                    "porcentaje": float(row[2])
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, DIAGNOSTICOS_STATS_SQL)
+            return HealthDataService._map_diagnosticos_stats(rows)
+        except Exception as e:
+            logger.error(f"Error getting diagnosis stats: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_diagnosticos_stats_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_diagnosticos_stats`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, DIAGNOSTICOS_STATS_SQL)
+            return HealthDataService._map_diagnosticos_stats(rows)
         except Exception as e:
             logger.error(f"Error getting diagnosis stats: {str(e)}")
             raise
-    
+
     @staticmethod
     def get_edad_distribution(connection) -> List[dict]:
         """
         Get age distribution statistics.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with age distribution
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    CASE 
-                        WHEN EDAD BETWEEN 0 AND 17 THEN '0-17'
-                        WHEN EDAD BETWEEN 18 AND 25 THEN '18-25'
-                        WHEN EDAD BETWEEN 26 AND 35 THEN '26-35'
-                        WHEN EDAD BETWEEN 36 AND 45 THEN '36-45'
-                        WHEN EDAD BETWEEN 46 AND 55 THEN '46-55'
-                        WHEN EDAD BETWEEN 56 AND 65 THEN '56-65'
-                        WHEN EDAD > 65 THEN '65+'
-                        ELSE 'Unknown'
-                    END as rango_edad,
-                    COUNT(*) as total
-                FROM SALUD_MENTAL_FEATURED
-                WHERE EDAD IS NOT NULL
-                GROUP BY 
-                    CASE 
-                        WHEN EDAD BETWEEN 0 AND 17 THEN '0-17'
-                        WHEN EDAD BETWEEN 18 AND 25 THEN '18-25'
-                        WHEN EDAD BETWEEN 26 AND 35 THEN '26-35'
-                        WHEN EDAD BETWEEN 36 AND 45 THEN '36-45'
-                        WHEN EDAD BETWEEN 46 AND 55 THEN '46-55'
-                        WHEN EDAD BETWEEN 56 AND 65 THEN '56-65'
-                        WHEN EDAD > 65 THEN '65+'
-                        ELSE 'Unknown'
-                    END
-                ORDER BY 
-                    CASE rango_edad
-                        WHEN '0-17' THEN 1
-                        WHEN '18-25' THEN 2
-                        WHEN '26-35' THEN 3
-                        WHEN '36-45' THEN 4
-                        WHEN '46-55' THEN 5
-                        WHEN '56-65' THEN 6
-                        WHEN '65+' THEN 7
-                        ELSE 8
-                    END
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "rango_edad": row[0],
-                    "total": row[1]
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, EDAD_DISTRIBUTION_SQL)
+            return HealthDataService._map_edad_distribution(rows)
+        except Exception as e:
+            logger.error(f"Error getting age distribution: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_edad_distribution_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_edad_distribution`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, EDAD_DISTRIBUTION_SQL)
+            return HealthDataService._map_edad_distribution(rows)
         except Exception as e:
             logger.error(f"Error getting age distribution: {str(e)}")
             raise
-    
+
     @staticmethod
     def get_genero_distribution(connection) -> List[dict]:
         """
         Get gender distribution statistics.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with gender distribution
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    CASE 
-                        WHEN SEXO = 1 THEN 'Hombre'
-                        WHEN SEXO = 2 THEN 'Mujer'
-                        ELSE 'Otro'
-                    END as sexo,
-                    COUNT(*) as total,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
-                FROM SALUD_MENTAL_FEATURED
-                WHERE SEXO IS NOT NULL
-                GROUP BY SEXO
-                ORDER BY total DESC
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "sexo": row[0],
-                    "total": row[1],
-                    "porcentaje": float(row[2])
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, GENERO_DISTRIBUTION_SQL)
+            return HealthDataService._map_genero_distribution(rows)
         except Exception as e:
             logger.error(f"Error getting gender distribution: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_genero_distribution_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_genero_distribution`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, GENERO_DISTRIBUTION_SQL)
+            return HealthDataService._map_genero_distribution(rows)
+        except Exception as e:
+            logger.error(f"Error getting gender distribution: {str(e)}")
+            raise
+
     @staticmethod
     def get_tipo_ingreso_stats(connection) -> List[dict]:
         """
         Get admission type statistics (circunstancia de contacto).
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with admission type statistics
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    CIRCUNSTANCIA_DE_CONTACTO,
-                    COUNT(*) as total,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
-                FROM SALUD_MENTAL_FEATURED
-                WHERE CIRCUNSTANCIA_DE_CONTACTO IS NOT NULL
-                GROUP BY CIRCUNSTANCIA_DE_CONTACTO
-                ORDER BY total DESC
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "tipo_ingreso": str(row[0]),
-                    "total": row[1],
-                    "porcentaje": float(row[2])
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, TIPO_INGRESO_STATS_SQL)
+            return HealthDataService._map_tipo_ingreso_stats(rows)
         except Exception as e:
             logger.error(f"Error getting admission type stats: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_tipo_ingreso_stats_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_tipo_ingreso_stats`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, TIPO_INGRESO_STATS_SQL)
+            return HealthDataService._map_tipo_ingreso_stats(rows)
+        except Exception as e:
+            logger.error(f"Error getting admission type stats: {str(e)}")
+            raise
+
     @staticmethod
     def get_tendencia_mensual(connection, year: Optional[int] = None) -> List[dict]:
         """
         Get monthly admission trends.
-        
+
         Args:
             connection: Database connection
             year: Optional year filter
-            
+
         Returns:
             List of dictionaries with monthly trends
         """
         try:
-            cursor = connection.cursor()
-            
             if year:
-                query = """
-                    SELECT 
-                        TO_CHAR(FECHA_INGRESO, 'MM') as mes,
-                        TO_CHAR(FECHA_INGRESO, 'YYYY') as anio,
-                        COUNT(*) as total
-                    FROM SALUD_MENTAL_FEATURED
-                    WHERE EXTRACT(YEAR FROM FECHA_INGRESO) = :year
-                    GROUP BY TO_CHAR(FECHA_INGRESO, 'MM'), TO_CHAR(FECHA_INGRESO, 'YYYY')
-                    ORDER BY mes
-                """
-                cursor.execute(query, year=year)
+                rows = HealthDataService._fetch_rows(connection, TENDENCIA_MENSUAL_YEAR_SQL, year=year)
             else:
-                query = """
-                    SELECT 
-                        TO_CHAR(FECHA_INGRESO, 'MM') as mes,
-                        TO_CHAR(FECHA_INGRESO, 'YYYY') as anio,
-                        COUNT(*) as total
-                    FROM SALUD_MENTAL_FEATURED
-                    WHERE FECHA_INGRESO >= ADD_MONTHS(SYSDATE, -12)
-                    GROUP BY TO_CHAR(FECHA_INGRESO, 'MM'), TO_CHAR(FECHA_INGRESO, 'YYYY')
-                    ORDER BY anio, mes
-                """
-                cursor.execute(query)
-            
-            results = []
-            month_names = {
-                '01': 'Enero', '02': 'Febrero', '03': 'Marzo', '04': 'Abril',
-                '05': 'Mayo', '06': 'Junio', '07': 'Julio', '08': 'Agosto',
-                '09': 'Septiembre', '10': 'Octubre', '11': 'Noviembre', '12': 'Diciembre'
-            }
-            
-            for row in cursor:
-                results.append({
-                    "mes": month_names.get(row[0], row[0]),
-                    "anio": row[1],
-                    "total": row[2]
-                })
-            
-            cursor.close()
-            return results
+                rows = HealthDataService._fetch_rows(connection, TENDENCIA_MENSUAL_LAST_YEAR_SQL)
+            return HealthDataService._map_tendencia_mensual(rows)
+        except Exception as e:
+            logger.error(f"Error getting monthly trends: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_tendencia_mensual_async(connection, year: Optional[int] = None) -> List[dict]:
+        """Asyncio variant of :meth:`get_tendencia_mensual`."""
+        try:
+            if year:
+                rows = await HealthDataService._fetch_rows_async(connection, TENDENCIA_MENSUAL_YEAR_SQL, year=year)
+            else:
+                rows = await HealthDataService._fetch_rows_async(connection, TENDENCIA_MENSUAL_LAST_YEAR_SQL)
+            return HealthDataService._map_tendencia_mensual(rows)
         except Exception as e:
             logger.error(f"Error getting monthly trends: {str(e)}")
             raise
-    
+
     @staticmethod
     def get_duracion_estancia(connection) -> List[dict]:
         """
         Get hospital stay duration statistics.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with stay duration statistics
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    CASE 
-                        WHEN ESTANCIA_DIAS BETWEEN 1 AND 3 THEN '1-3 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 4 AND 7 THEN '4-7 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 8 AND 14 THEN '8-14 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 15 AND 30 THEN '15-30 dias'
-                        WHEN ESTANCIA_DIAS > 30 THEN '30+ dias'
-                        ELSE 'Unknown'
-                    END as rango_dias,
-                    COUNT(*) as total
-                FROM SALUD_MENTAL_FEATURED
-                WHERE ESTANCIA_DIAS IS NOT NULL
-                GROUP BY 
-                    CASE 
-                        WHEN ESTANCIA_DIAS BETWEEN 1 AND 3 THEN '1-3 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 4 AND 7 THEN '4-7 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 8 AND 14 THEN '8-14 dias'
-                        WHEN ESTANCIA_DIAS BETWEEN 15 AND 30 THEN '15-30 dias'
-                        WHEN ESTANCIA_DIAS > 30 THEN '30+ dias'
-                        ELSE 'Unknown'
-                    END
-                ORDER BY 
-                    CASE rango_dias
-                        WHEN '1-3 dias' THEN 1
-                        WHEN '4-7 dias' THEN 2
-                        WHEN '8-14 dias' THEN 3
-                        WHEN '15-30 dias' THEN 4
-                        WHEN '30+ dias' THEN 5
-                        ELSE 6
-                    END
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "rango_dias": row[0],
-                    "total": row[1]
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, DURACION_ESTANCIA_SQL)
+            return HealthDataService._map_duracion_estancia(rows)
         except Exception as e:
             logger.error(f"Error getting stay duration stats: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_duracion_estancia_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_duracion_estancia`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, DURACION_ESTANCIA_SQL)
+            return HealthDataService._map_duracion_estancia(rows)
+        except Exception as e:
+            logger.error(f"Error getting stay duration stats: {str(e)}")
+            raise
+
+    @staticmethod
+    def get_temporal_trends(connection) -> List[dict]:
+        """
+        Get yearly/monthly admission metrics used by the temporal trends view.
+
+        Args:
+            connection: Database connection
+
+        Returns:
+            List of dictionaries keyed by lowercase column name
+        """
+        try:
+            return HealthDataService._fetch_dicts(connection, TEMPORAL_TRENDS_SQL)
+        except Exception as e:
+            logger.error(f"Error getting temporal trends: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_temporal_trends_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_temporal_trends`."""
+        try:
+            return await HealthDataService._fetch_dicts_async(connection, TEMPORAL_TRENDS_SQL)
+        except Exception as e:
+            logger.error(f"Error getting temporal trends: {str(e)}")
+            raise
+
+    # ------------------------------------------------------------------
+    # Paginated data
+    # ------------------------------------------------------------------
+
     @staticmethod
     def get_pacientes_list(connection, skip: int = 0, limit: int = 100) -> List[dict]:
         """
         Get paginated list of patients/registros.
-        
+
         Args:
             connection: Database connection
             skip: Number of records to skip
             limit: Maximum number of records to return
-            
+
         Returns:
             List of patient dictionaries
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT NOMBRE_COMPLETO, EDAD, SEXO, COMUNIDAD_AUTONOMA, FECHA_NACIMIENTO
-                FROM SALUD_MENTAL_FEATURED
-                ORDER BY NOMBRE_COMPLETO
-                OFFSET :skip ROWS
-                FETCH NEXT :limit ROWS ONLY
-            """
-            cursor.execute(query, skip=skip, limit=limit)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "nombre": row[0],
-                    "edad": row[1],
-                    "sexo": row[2],
-                    "comunidad_autonoma": row[3],
-                    "fecha_de_nacimiento": row[4].isoformat() if row[4] else None
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, PACIENTES_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_pacientes_list(rows)
+        except Exception as e:
+            logger.error(f"Error getting patients list: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_pacientes_list_async(connection, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Asyncio variant of :meth:`get_pacientes_list`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, PACIENTES_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_pacientes_list(rows)
         except Exception as e:
             logger.error(f"Error getting patients list: {str(e)}")
             raise
-    
+
+    @staticmethod
+    def _pacientes_page_statement(skip: int, limit: int, cursor: Optional[str]) -> Tuple[str, dict]:
+        if cursor is None:
+            return PACIENTES_LIST_SQL, {"skip": skip, "limit": limit}
+        last_key, last_rowid = decode_page_cursor(cursor)
+        if last_key is None:
+            return PACIENTES_SEEK_NULL_SQL, {"last_rowid": last_rowid, "limit": limit}
+        return PACIENTES_SEEK_SQL, {"last_key": last_key, "last_rowid": last_rowid, "limit": limit}
+
+    @staticmethod
+    def _page_result(rows: List[tuple], limit: int, key_index: int, mapper) -> Tuple[List[dict], Optional[str]]:
+        """Map a page and build the cursor of its last row (None on the last page)."""
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_page_cursor(last[key_index], last[-1])
+        return mapper(rows), next_cursor
+
+    @staticmethod
+    def get_pacientes_page(connection, limit: int = 100, cursor: Optional[str] = None,
+                           skip: int = 0) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get a page of patients using keyset pagination.
+
+        Args:
+            connection: Database connection
+            limit: Maximum number of records to return
+            cursor: Continuation token from the previous page; seeks past its last row
+            skip: Offset used only when no cursor is given
+
+        Returns:
+            Tuple of (patient dictionaries, continuation token or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        statement, binds = HealthDataService._pacientes_page_statement(skip, limit, cursor)
+        try:
+            rows = HealthDataService._fetch_rows(connection, statement, **binds)
+            return HealthDataService._page_result(rows, limit, 0, HealthDataService._map_pacientes_list)
+        except Exception as e:
+            logger.error(f"Error getting patients page: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_pacientes_page_async(connection, limit: int = 100, cursor: Optional[str] = None,
+                                       skip: int = 0) -> Tuple[List[dict], Optional[str]]:
+        """Asyncio variant of :meth:`get_pacientes_page`."""
+        statement, binds = HealthDataService._pacientes_page_statement(skip, limit, cursor)
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, statement, **binds)
+            return HealthDataService._page_result(rows, limit, 0, HealthDataService._map_pacientes_list)
+        except Exception as e:
+            logger.error(f"Error getting patients page: {str(e)}")
+            raise
+
     @staticmethod
     def get_diagnosticos_list(connection, skip: int = 0, limit: int = 100) -> List[dict]:
         """
         Get paginated list of diagnoses.
-        
+
         Args:
             connection: Database connection
             skip: Number of records to skip
             limit: Maximum number of records to return
-            
+
         Returns:
             List of diagnosis dictionaries
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT DIAGNOSTICO_PRINCIPAL, CATEGORIA, COUNT(*) as casos
-                FROM SALUD_MENTAL_FEATURED
-                WHERE DIAGNOSTICO_PRINCIPAL IS NOT NULL
-                GROUP BY DIAGNOSTICO_PRINCIPAL, CATEGORIA
-                ORDER BY casos DESC
-                OFFSET :skip ROWS
-                FETCH NEXT :limit ROWS ONLY
-            """
-            cursor.execute(query, skip=skip, limit=limit)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "diagnostico_principal": row[0],
-                    "categoria": row[1],
-                    "casos": row[2]
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, DIAGNOSTICOS_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_diagnosticos_list(rows)
+        except Exception as e:
+            logger.error(f"Error getting diagnoses list: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_diagnosticos_list_async(connection, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Asyncio variant of :meth:`get_diagnosticos_list`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, DIAGNOSTICOS_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_diagnosticos_list(rows)
         except Exception as e:
             logger.error(f"Error getting diagnoses list: {str(e)}")
             raise
-    
+
     @staticmethod
     def get_ingresos_list(connection, skip: int = 0, limit: int = 100) -> List[dict]:
         """
         Get paginated list of hospital admissions.
-        
+
         Args:
             connection: Database connection
             skip: Number of records to skip
             limit: Maximum number of records to return
-            
+
         Returns:
             List of admission dictionaries
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT NOMBRE_COMPLETO, FECHA_INGRESO, FECHA_FIN_CONTACTO, 
-                       ESTANCIA_DIAS, DIAGNOSTICO_PRINCIPAL, CATEGORIA, 
-                       TIPO_ALTA, SERVICIO
-                FROM SALUD_MENTAL_FEATURED
-                WHERE FECHA_INGRESO IS NOT NULL
-                ORDER BY FECHA_INGRESO DESC
-                OFFSET :skip ROWS
-                FETCH NEXT :limit ROWS ONLY
-            """
-            cursor.execute(query, skip=skip, limit=limit)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "nombre": row[0],
-                    "fecha_de_ingreso": row[1].isoformat() if row[1] else None,
-                    "fecha_de_fin_contacto": row[2].isoformat() if row[2] else None,
-                    "estancia_dias": row[3],
-                    "diagnostico_principal": row[4],
-                    "categoria": row[5],
-                    "tipo_alta": row[6],
-                    "servicio": row[7]
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, INGRESOS_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_ingresos_list(rows)
         except Exception as e:
             logger.error(f"Error getting admissions list: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_ingresos_list_async(connection, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Asyncio variant of :meth:`get_ingresos_list`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, INGRESOS_LIST_SQL, skip=skip, limit=limit)
+            return HealthDataService._map_ingresos_list(rows)
+        except Exception as e:
+            logger.error(f"Error getting admissions list: {str(e)}")
+            raise
+
+    @staticmethod
+    def _ingresos_page_statement(skip: int, limit: int, cursor: Optional[str]) -> Tuple[str, dict]:
+        if cursor is None:
+            return INGRESOS_LIST_SQL, {"skip": skip, "limit": limit}
+        last_key, last_rowid = decode_page_cursor(cursor)
+        if last_key is None:
+            raise ValueError("Invalid pagination cursor")
+        return INGRESOS_SEEK_SQL, {"last_key": last_key, "last_rowid": last_rowid, "limit": limit}
+
+    @staticmethod
+    def get_ingresos_page(connection, limit: int = 100, cursor: Optional[str] = None,
+                          skip: int = 0) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get a page of hospital admissions (newest first) using keyset pagination.
+
+        Args:
+            connection: Database connection
+            limit: Maximum number of records to return
+            cursor: Continuation token from the previous page; seeks past its last row
+            skip: Offset used only when no cursor is given
+
+        Returns:
+            Tuple of (admission dictionaries, continuation token or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        statement, binds = HealthDataService._ingresos_page_statement(skip, limit, cursor)
+        try:
+            rows = HealthDataService._fetch_rows(connection, statement, **binds)
+            return HealthDataService._page_result(rows, limit, 1, HealthDataService._map_ingresos_list)
+        except Exception as e:
+            logger.error(f"Error getting admissions page: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_ingresos_page_async(connection, limit: int = 100, cursor: Optional[str] = None,
+                                      skip: int = 0) -> Tuple[List[dict], Optional[str]]:
+        """Asyncio variant of :meth:`get_ingresos_page`."""
+        statement, binds = HealthDataService._ingresos_page_statement(skip, limit, cursor)
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, statement, **binds)
+            return HealthDataService._page_result(rows, limit, 1, HealthDataService._map_ingresos_list)
+        except Exception as e:
+            logger.error(f"Error getting admissions page: {str(e)}")
+            raise
+
     @staticmethod
     def get_comunidad_stats(connection) -> List[dict]:
         """
         Get statistics by Comunidad Autónoma.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with community statistics
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    COMUNIDAD_AUTONOMA,
-                    COUNT(*) as total,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
-                FROM SALUD_MENTAL_FEATURED
-                WHERE COMUNIDAD_AUTONOMA IS NOT NULL
-                GROUP BY COMUNIDAD_AUTONOMA
-                ORDER BY total DESC
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "comunidad_autonoma": row[0],
-                    "total": row[1],
-                    "porcentaje": float(row[2])
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, COMUNIDAD_STATS_SQL)
+            return HealthDataService._map_comunidad_stats(rows)
         except Exception as e:
             logger.error(f"Error getting community stats: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_comunidad_stats_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_comunidad_stats`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, COMUNIDAD_STATS_SQL)
+            return HealthDataService._map_comunidad_stats(rows)
+        except Exception as e:
+            logger.error(f"Error getting community stats: {str(e)}")
+            raise
+
     @staticmethod
     def get_servicio_stats(connection) -> List[dict]:
         """
         Get statistics by service.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             List of dictionaries with service statistics
         """
         try:
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    SERVICIO,
-                    COUNT(*) as total,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as porcentaje
-                FROM SALUD_MENTAL_FEATURED
-                WHERE SERVICIO IS NOT NULL
-                GROUP BY SERVICIO
-                ORDER BY total DESC
-                FETCH FIRST 20 ROWS ONLY
-            """
-            cursor.execute(query)
-            
-            results = []
-            for row in cursor:
-                results.append({
-                    "servicio": row[0],
-                    "total": row[1],
-                    "porcentaje": float(row[2])
-                })
-            
-            cursor.close()
-            return results
+            rows = HealthDataService._fetch_rows(connection, SERVICIO_STATS_SQL)
+            return HealthDataService._map_servicio_stats(rows)
         except Exception as e:
             logger.error(f"Error getting service stats: {str(e)}")
             raise
-    
+
+    @staticmethod
+    async def get_servicio_stats_async(connection) -> List[dict]:
+        """Asyncio variant of :meth:`get_servicio_stats`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, SERVICIO_STATS_SQL)
+            return HealthDataService._map_servicio_stats(rows)
+        except Exception as e:
+            logger.error(f"Error getting service stats: {str(e)}")
+            raise
+
     @staticmethod
     def count_total_registros(connection) -> int:
         """
         Get total count of records.
-        
+
         Args:
             connection: Database connection
-            
+
         Returns:
             Total count of records
         """
         try:
-            cursor = connection.cursor()
-            query = "SELECT COUNT(*) FROM SALUD_MENTAL_FEATURED"
-            cursor.execute(query)
-            result = cursor.fetchone()
-            cursor.close()
-            return result[0] if result else 0
+            rows = HealthDataService._fetch_rows(connection, COUNT_TOTAL_SQL)
+            return rows[0][0] if rows else 0
         except Exception as e:
             logger.error(f"Error counting records: {str(e)}")
             raise
 
+    @staticmethod
+    async def count_total_registros_async(connection) -> int:
+        """Asyncio variant of :meth:`count_total_registros`."""
+        try:
+            rows = await HealthDataService._fetch_rows_async(connection, COUNT_TOTAL_SQL)
+            return rows[0][0] if rows else 0
+        except Exception as e:
+            logger.error(f"Error counting records: {str(e)}")
+            raise
@@ -0,0 +1,185 @@
+"""
+Per-statement execution log for the service-layer queries.
+
+``HealthDataService`` and ``StatsEngine`` report every statement they run
+to ``query_log``: SQL id, bind shape (names and types, never values), rows
+fetched, round trips, execute time and fetch time. The log keeps running
+totals for the ``QUERY_LOG_MAX_STATEMENTS`` most recently run statements
+and the slowest ``QUERY_LOG_SLOWEST_SIZE`` executions,
+served by ``GET /pool/queries``; executions slower than ``SLOW_QUERY_LOG_MS``
+are also written to the ``app.slow_query`` logger when
+``SLOW_QUERY_LOG_ENABLED`` is set.
+"""
+import hashlib
+import heapq
+import itertools
+import logging
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_query")
+
+
+@lru_cache(maxsize=1024)
+def sql_id(statement: str) -> str:
+    """
+    Stable 13-character id of a statement, insensitive to whitespace layout.
+    """
+    normalized = " ".join(statement.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:13]
+
+
+def bind_shape(binds: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Bind names and value types; values are not kept (they may identify patients)."""
+    if not binds:
+        return {}
+    return {name: type(value).__name__ for name, value in binds.items()}
+
+
+def estimate_round_trips(rows: int, prefetchrows: int, arraysize: int) -> int:
+    """
+    Round trips of an execute + fetchall: the execute returns the first
+    ``prefetchrows`` rows, each further fetch brings ``arraysize`` rows.
+    """
+    remaining = max(0, rows - prefetchrows)
+    return 1 + math.ceil(remaining / max(1, arraysize))
+
+
+class QueryLog:
+    """
+    Thread-safe per-statement totals plus the slowest executions seen.
+
+    Totals are bounded to ``max_statements`` (least recently run are dropped
+    first), since ad-hoc exports report arbitrary SQL texts.
+    """
+
+    def __init__(self, slowest_size: int, slow_ms: Optional[float] = None, max_statements: int = 500):
+        self.slowest_size = slowest_size
+        self.slow_ms = slow_ms
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._names: Dict[str, str] = {}
+        self._totals: "OrderedDict[str, dict]" = OrderedDict()
+        self.evicted = 0
+        # Min-heap of (elapsed_ms, seq, entry): the root is the fastest kept entry
+        self._slowest: List[tuple] = []
+        self._seq = itertools.count()
+
+    def name_statements(self, names: Dict[str, str]):
+        """Register readable names (e.g. ``diagnosticos_stats``) for statement texts."""
+        with self._lock:
+            self._names.update({sql_id(statement): name for statement, name in names.items()})
+
+    def record(self, statement: str, binds: Optional[Dict[str, Any]], rows: int, round_trips: int,
+               execute_s: float, fetch_s: float, error: Optional[Exception] = None):
+        """
+        Record one execution.
+
+        Args:
+            statement: SQL text as executed
+            binds: Bind variables (only names and types are kept)
+            rows: Rows fetched
+            round_trips: Estimated network round trips
+            execute_s: Time spent in ``execute`` (seconds)
+            fetch_s: Time spent fetching rows (seconds)
+            error: Exception raised by the statement, if any
+        """
+        statement_id = sql_id(statement)
+        execute_ms = execute_s * 1000
+        fetch_ms = fetch_s * 1000
+        elapsed_ms = execute_ms + fetch_ms
+        with self._lock:
+            name = self._names.get(statement_id)
+            totals = self._totals.get(statement_id)
+            if totals is None:
+                totals = self._totals[statement_id] = {
+                    "sql_id": statement_id,
+                    "name": name,
+                    "statement": " ".join(statement.split()),
+                    "calls": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "round_trips": 0,
+                    "execute_ms": 0.0,
+                    "fetch_ms": 0.0,
+                    "max_ms": 0.0
+                }
+                while len(self._totals) > self.max_statements:
+                    self._totals.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._totals.move_to_end(statement_id)
+            totals["calls"] += 1
+            totals["errors"] += 1 if error is not None else 0
+            totals["rows"] += rows
+            totals["round_trips"] += round_trips
+            totals["execute_ms"] += execute_ms
+            totals["fetch_ms"] += fetch_ms
+            totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+
+            kept = len(self._slowest) >= self.slowest_size
+            if self.slowest_size and (not kept or elapsed_ms > self._slowest[0][0]):
+                entry = {
+                    "sql_id": statement_id,
+                    "name": name,
+                    "binds": bind_shape(binds),
+                    "rows": rows,
+                    "round_trips": round_trips,
+                    "execute_ms": round(execute_ms, 3),
+                    "fetch_ms": round(fetch_ms, 3),
+                    "elapsed_ms": round(elapsed_ms, 3),
+                    "error": str(error) if error is not None else None,
+                    "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+                }
+                item = (elapsed_ms, next(self._seq), entry)
+                if kept:
+                    heapq.heapreplace(self._slowest, item)
+                else:
+                    heapq.heappush(self._slowest, item)
+
+        if self.slow_ms is not None and elapsed_ms >= self.slow_ms:
+            slow_query_logger.warning(
+                "Slow query %s (%s): %.1f ms (execute %.1f ms, fetch %.1f ms), %d rows, %d round trips, binds=%s",
+                statement_id, name or "-", elapsed_ms, execute_ms, fetch_ms, rows, round_trips, bind_shape(binds)
+            )
+
+    def stats(self, limit: Optional[int] = None) -> dict:
+        """
+        Per-statement totals (by total time, descending) and the slowest executions.
+        """
+        with self._lock:
+            totals = [dict(t) for t in self._totals.values()]
+            slowest = [entry for _, _, entry in sorted(self._slowest, reverse=True)]
+        for t in totals:
+            t["total_ms"] = round(t["execute_ms"] + t["fetch_ms"], 3)
+            t["mean_ms"] = round(t["total_ms"] / t["calls"], 3)
+            t["execute_ms"] = round(t["execute_ms"], 3)
+            t["fetch_ms"] = round(t["fetch_ms"], 3)
+            t["max_ms"] = round(t["max_ms"], 3)
+        totals.sort(key=lambda t: t["total_ms"], reverse=True)
+        return {
+            "slow_query_log_ms": self.slow_ms,
+            "evicted_statements": self.evicted,
+            "statements": totals,
+            "slowest": slowest[:limit] if limit else slowest
+        }
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+            self._slowest.clear()
+
+
+# Singleton instance
+query_log = QueryLog(
+    slowest_size=settings.QUERY_LOG_SLOWEST_SIZE,
+    max_statements=settings.QUERY_LOG_MAX_STATEMENTS,
+    slow_ms=settings.SLOW_QUERY_LOG_MS if settings.SLOW_QUERY_LOG_ENABLED else None
+)
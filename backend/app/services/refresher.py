@@ -0,0 +1,160 @@
+"""
+Background refresh of the dashboard statistics.
+
+``StatisticsRefresher`` pre-warms the registered ``HealthDataService``
+aggregates when the application starts and then keeps them fresh from an
+asyncio task: every ``STATISTICS_REFRESH_INTERVAL_SECONDS``, or as soon as the
+dataset version probe reports a change. Together with the stale-while-
+revalidate mode of ``StatisticsCache`` requests never wait for these queries
+once the first refresh has completed.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from app.config import settings
+from app.services.cache import ENGINE_METHODS, DatasetVersion, StatisticsCache, dataset_version, statistics_cache
+
+logger = logging.getLogger(__name__)
+
+# Aggregates behind the dashboard and temporal trends views, with the
+# arguments the statistics routes call them with
+DEFAULT_TARGETS = (
+    ("get_diagnosticos_stats",),
+    ("get_edad_distribution",),
+    ("get_genero_distribution",),
+    ("get_tipo_ingreso_stats",),
+    ("get_duracion_estancia",),
+    ("get_comunidad_stats",),
+    ("get_servicio_stats",),
+    ("get_tendencia_mensual", None),
+    ("get_temporal_trends",),
+)
+
+
+class StatisticsRefresher:
+    """
+    In-process scheduler that refreshes registered statistics results.
+    """
+
+    def __init__(self, cache: StatisticsCache, version: DatasetVersion, interval: float):
+        self.cache = cache
+        self.version = version
+        self.interval = interval
+        self._targets: List[Tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        self._changed: Optional[asyncio.Event] = None
+        self.last_refresh: Optional[float] = None
+        self.last_duration_ms: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        version.subscribe(self._on_version_change)
+
+    def register(self, method_name: str, *args):
+        """
+        Keep ``statistics_cache.get(method_name, *args)`` warm.
+        """
+        target = (method_name,) + args
+        if target not in self._targets:
+            self._targets.append(target)
+
+    def _on_version_change(self, old_version, new_version):
+        if self._changed is not None:
+            self._changed.set()
+
+    def _batches(self) -> List[Tuple]:
+        """
+        Registered targets with the single-scan breakdowns collapsed into one refresh.
+        """
+        batches, engine_done = [], False
+        for target in self._targets:
+            if target[0] in ENGINE_METHODS and len(target) == 1:
+                if engine_done:
+                    continue
+                engine_done = True
+            batches.append(target)
+        return batches
+
+    async def refresh_all(self):
+        """
+        Refresh every registered result concurrently; failures keep the previous value.
+        """
+        start_time = time.perf_counter()
+        batches = self._batches()
+        results = await asyncio.gather(
+            *(self.cache.refresh(*target) for target in batches),
+            return_exceptions=True
+        )
+        for target, result in zip(batches, results):
+            if isinstance(result, Exception):
+                self.failures += 1
+                logger.warning(f"Statistics refresh failed for {target[0]}: {str(result)}")
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+        self.last_duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        logger.info(f"Statistics refreshed: {len(batches)} queries in {self.last_duration_ms}ms")
+
+    async def _run(self):
+        await self.refresh_all()
+        while True:
+            # Wake up to probe the dataset version; the probe sets _changed on a change
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.version.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.version.current()
+                due = time.monotonic() - self.last_refresh >= self.interval
+                if self._changed.is_set() or due:
+                    self._changed.clear()
+                    await self.refresh_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Statistics refresher iteration failed: {str(e)}")
+
+    def start(self):
+        """
+        Start the background task; the first refresh pre-warms every target.
+
+        Requests arriving during the pre-warm join its in-flight queries.
+        """
+        if self._task is not None:
+            return
+        self._changed = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+        logger.info(f"Statistics refresher started: {len(self._targets)} targets, every {self.interval:g}s")
+
+    async def stop(self):
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Statistics refresher stopped")
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "targets": [list(target) for target in self._targets],
+            "interval_seconds": self.interval,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_refresh_age_seconds": round(time.monotonic() - self.last_refresh, 1) if self.last_refresh else None,
+            "last_duration_ms": self.last_duration_ms
+        }
+
+
+# Singleton instance
+statistics_refresher = StatisticsRefresher(
+    statistics_cache,
+    dataset_version,
+    interval=settings.STATISTICS_REFRESH_INTERVAL_SECONDS
+)
+for _target in DEFAULT_TARGETS:
+    statistics_refresher.register(*_target)
@@ -0,0 +1,81 @@
+"""
+Request coalescing for identical in-flight work.
+
+``SingleFlight.do(key, func, *args)`` runs ``await func(*args)`` once per key
+at a time: callers arriving while an execution for the same key is pending
+await that execution and receive its result (or exception) instead of
+starting their own. Used in front of the statistics loads and
+``/query/execute`` so a burst of identical cold requests costs one query.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent coroutine calls that share a key.
+
+    The shared execution runs as its own task, so a caller that is cancelled
+    (client disconnect, timeout) does not cancel it for the other waiters.
+    With ``cancel_abandoned`` the execution is cancelled once every waiter
+    has been cancelled; otherwise it runs to completion (e.g. to fill a cache).
+    """
+
+    def __init__(self, name: str, cancel_abandoned: bool = False):
+        self.name = name
+        self.cancel_abandoned = cancel_abandoned
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the outcome as retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        """
+        Await ``func(*args)``, sharing the execution with concurrent callers of ``key``.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"[{self.name}] Joining in-flight execution for {key!r}")
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if self.cancel_abandoned and not task.done():
+                    logger.debug(f"[{self.name}] Every caller left; cancelling execution for {key!r}")
+                    self.abandoned += 1
+                    task.cancel()
+
+    def stats(self) -> dict:
+        calls = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else None
+        }
+
+
+# Singleton instances
+statistics_flight = SingleFlight("statistics")
+query_flight = SingleFlight("query", cancel_abandoned=True)
@@ -0,0 +1,417 @@
+"""
+Lexer-based analysis of the custom SQL accepted by ``/query`` and ``/ai``.
+
+``parse_query(sql)`` tokenizes the text once (string literals, quoted
+identifiers, comments and bind variables are single tokens, so keywords
+inside them are never matched) and reports the statement type, the tables
+referenced, any top-level row-limiting clause and forbidden keywords. Results are memoized
+by query text. ``validate_select_query`` enforces the read-only,
+single-statement rule on top of it and ``apply_row_limit`` appends
+``FETCH FIRST n ROWS ONLY`` when the statement has no limit of its own (or
+lowers a larger literal one). ``parameterize_literals`` rewrites string and numeric literals
+into bind variables so queries that differ only in their constants share
+one SQL text (one parsed cursor in Oracle, one cache/workload fingerprint).
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# One pass over the text; alternatives are tried in order
+SQL_TOKEN_RE = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*.*?(?:\*/|$))
+  | (?P<qstring>[nN]?[qQ]'(?:\[.*?\]|\{.*?\}|\(.*?\)|<.*?>|(?P<qdelim>\S).*?(?P=qdelim))')
+  | (?P<string>[nN]?'(?:[^']|'')*'?)
+  | (?P<qident>"(?:[^"]|"")*"?)
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<bind>:\w+)
+  | (?P<word>[^\W\d]\w*(?:[$\#]\w*)*)
+  | (?P<space>\s+)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Token kinds
+COMMENT = "comment"
+STRING = "string"
+QIDENT = "qident"
+NUMBER = "number"
+BIND = "bind"
+WORD = "word"
+SPACE = "space"
+OTHER = "other"
+
+LITERALS = (STRING, NUMBER)
+
+# Statements other than queries, and privileged operations, rejected anywhere in the text
+FORBIDDEN_KEYWORDS = frozenset((
+    'DROP', 'DELETE', 'TRUNCATE', 'INSERT', 'UPDATE',
+    'CREATE', 'ALTER', 'GRANT', 'REVOKE', 'EXECUTE',
+    'EXEC', 'CALL', 'MERGE', 'RENAME'
+))
+
+# Words that end a FROM list or cannot be a table alias
+_CLAUSE_KEYWORDS = frozenset((
+    'WHERE', 'GROUP', 'HAVING', 'ORDER', 'CONNECT', 'START', 'UNION', 'INTERSECT', 'MINUS', 'EXCEPT',
+    'FETCH', 'OFFSET', 'LIMIT', 'FOR', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'OUTER', 'CROSS',
+    'NATURAL', 'ON', 'USING', 'PIVOT', 'UNPIVOT', 'MODEL', 'WINDOW', 'SAMPLE', 'PARTITION', 'AS'
+))
+
+# Words that end a FROM clause
+_FROM_CLAUSE_END = frozenset((
+    'WHERE', 'GROUP', 'HAVING', 'ORDER', 'CONNECT', 'START', 'UNION', 'INTERSECT', 'MINUS', 'EXCEPT',
+    'FETCH', 'OFFSET', 'LIMIT', 'FOR', 'WINDOW', 'MODEL'
+))
+
+# Literal parameterization: literals kept as written
+# - after these keywords (DATE '2024-01-01', INTERVAL '7' DAY, ESCAPE '!')
+_TYPED_LITERAL_KEYWORDS = frozenset(('DATE', 'TIMESTAMP', 'INTERVAL', 'ESCAPE'))
+# - as arguments after the first of these functions (format masks, units, precision)
+_FORMAT_FUNCTIONS = frozenset((
+    'TO_CHAR', 'TO_DATE', 'TO_TIMESTAMP', 'TO_NUMBER', 'TRUNC', 'ROUND', 'ADD_MONTHS',
+    'NUMTODSINTERVAL', 'NUMTOYMINTERVAL'
+))
+# - inside the parentheses of these (type sizes, interval precision)
+_PRECISION_WORDS = frozenset((
+    'VARCHAR2', 'NVARCHAR2', 'CHAR', 'NCHAR', 'NUMBER', 'RAW', 'FLOAT', 'TIMESTAMP',
+    'YEAR', 'MONTH', 'DAY', 'HOUR', 'MINUTE', 'SECOND'
+))
+# Words that end a GROUP BY / ORDER BY list
+_BY_CLAUSE_END = frozenset((
+    'SELECT', 'FROM', 'WHERE', 'HAVING', 'FETCH', 'OFFSET', 'LIMIT', 'UNION', 'INTERSECT', 'MINUS',
+    'EXCEPT', 'FOR', 'WINDOW'
+))
+
+AUTO_BIND_PREFIX = "lit"
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+
+    @property
+    def upper(self) -> str:
+        return self.text.upper() if self.kind == WORD else self.text
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+class ParsedQuery(NamedTuple):
+    """Result of :func:`parse_query` (immutable, shared through the memo)."""
+    text: str
+    tokens: Tuple[Token, ...]
+    statement_type: Optional[str]  # SELECT (also WITH ... SELECT), INSERT, ... or None if empty
+    tables: Tuple[str, ...]  # upper-cased, schema-qualified as written; CTE names excluded
+    limit_clause: Optional[str]  # FETCH FIRST, ROWNUM or LIMIT
+    limit_count: Optional[Token]  # the row count of FETCH FIRST n ROWS / LIMIT n when it is a plain integer
+    statements: int  # statements separated by ';' (a trailing ';' does not count)
+    forbidden_keywords: Tuple[str, ...]
+
+    @property
+    def has_limit(self) -> bool:
+        return self.limit_clause is not None
+
+    @property
+    def limit_value(self) -> Optional[int]:
+        return _as_int(self.limit_count)
+
+
+def tokenize(sql: str) -> Tuple[Token, ...]:
+    """All tokens of ``sql``, including whitespace and comments, in order."""
+    tokens = []
+    for match in SQL_TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        if kind == "qstring":  # Oracle q'[...]' literal
+            kind = STRING
+        tokens.append(Token(kind, match.group(), match.start()))
+    return tuple(tokens)
+
+
+def _significant(tokens: Tuple[Token, ...]) -> list:
+    return [t for t in tokens if t.kind not in (SPACE, COMMENT)]
+
+
+def _as_int(token: Optional[Token]) -> Optional[int]:
+    if token is not None and token.kind == NUMBER and token.text.isdigit():
+        return int(token.text)
+    return None
+
+
+def _read_name(sig: list, i: int) -> Tuple[Optional[str], int]:
+    """Read ``name`` or ``schema.name`` at ``sig[i]``; return it and the next index."""
+    parts = []
+    while i < len(sig) and sig[i].kind in (WORD, QIDENT):
+        parts.append(sig[i].upper)
+        if i + 1 < len(sig) and sig[i + 1].text == ".":
+            i += 2
+            continue
+        i += 1
+        break
+    return (".".join(parts) if parts else None), i
+
+
+def _referenced_tables(sig: list) -> Tuple[str, ...]:
+    """
+    Tables in the FROM clause of each query block: after FROM, JOIN and the
+    commas of a FROM list (also after a join condition), but not after FROM
+    inside EXTRACT(...) / TRIM(...). CTE names are excluded.
+    """
+    tables = []
+    cte_names = {
+        sig[i].upper for i in range(len(sig) - 2)
+        if sig[i].kind in (WORD, QIDENT) and sig[i + 1].upper == "AS" and sig[i + 2].text == "("
+    }
+    # One frame per parenthesis level: [holds a query block, inside its FROM clause]
+    frames = [[False, False]]
+    i = 0
+    while i < len(sig):
+        token = sig[i]
+        frame = frames[-1]
+        if token.text == "(":
+            frames.append([False, False])
+        elif token.text == ")":
+            if len(frames) > 1:
+                frames.pop()
+        elif token.upper == "SELECT":
+            frame[:] = [True, False]
+        elif token.upper in _FROM_CLAUSE_END:
+            frame[1] = False
+        elif (token.upper in ("FROM", "JOIN") and frame[0]) or (token.text == "," and frame[1]):
+            frame[1] = True
+            i += 1
+            if i < len(sig) and sig[i].text == "(":
+                continue  # subquery or table function: handled by the main loop
+            name, i = _read_name(sig, i)
+            if name is None:
+                continue
+            if name not in cte_names and name not in tables:
+                tables.append(name)
+            # Optional alias
+            if i < len(sig) and sig[i].upper == "AS":
+                i += 1
+            if i < len(sig) and sig[i].kind in (WORD, QIDENT) and sig[i].upper not in _CLAUSE_KEYWORDS:
+                i += 1
+            continue
+        i += 1
+    return tuple(tables)
+
+
+def _count_token(sig: list, i: int, not_followed_by: str) -> Optional[Token]:
+    """``sig[i]`` if it is a plain integer row count (not ``n PERCENT`` / ``LIMIT offset, n``)."""
+    token = sig[i] if i < len(sig) else None
+    if _as_int(token) is None:
+        return None
+    if i + 1 < len(sig) and sig[i + 1].upper == not_followed_by:
+        return None
+    return token
+
+
+def _row_limit(sig: list) -> Tuple[Optional[str], Optional[Token]]:
+    """Top-level FETCH FIRST/NEXT or LIMIT, or ROWNUM anywhere, and its literal row count."""
+    depth = 0
+    for i, token in enumerate(sig):
+        if token.text == "(":
+            depth += 1
+        elif token.text == ")":
+            depth -= 1
+        elif token.upper == "ROWNUM":
+            return "ROWNUM", None
+        elif depth == 0 and token.upper == "FETCH" and i + 1 < len(sig) and sig[i + 1].upper in ("FIRST", "NEXT"):
+            return "FETCH FIRST", _count_token(sig, i + 2, "PERCENT")
+        elif depth == 0 and token.upper == "LIMIT" and i + 1 < len(sig) and sig[i + 1].kind in (NUMBER, BIND):
+            return "LIMIT", _count_token(sig, i + 1, ",")
+    return None, None
+
+
+@lru_cache(maxsize=1024)
+def parse_query(sql: str) -> ParsedQuery:
+    """
+    Tokenize and analyze a statement (memoized by text).
+    """
+    tokens = tokenize(sql)
+    sig = _significant(tokens)
+
+    statement_type = None
+    first = next((t for t in sig if t.text != "("), None)
+    if first is not None:
+        statement_type = first.upper
+        if statement_type == "WITH":
+            statement_type = "SELECT"
+
+    # Separators followed by another statement (trailing ';' tolerated)
+    end = len(sig)
+    while end and sig[end - 1].text == ";":
+        end -= 1
+    statements = 1 + sum(1 for t in sig[:end] if t.text == ";")
+
+    forbidden = tuple(dict.fromkeys(t.upper for t in sig if t.kind == WORD and t.upper in FORBIDDEN_KEYWORDS))
+    limit_clause, limit_count = _row_limit(sig)
+
+    return ParsedQuery(
+        text=sql,
+        tokens=tokens,
+        statement_type=statement_type,
+        tables=_referenced_tables(sig),
+        limit_clause=limit_clause,
+        limit_count=limit_count,
+        statements=statements,
+        forbidden_keywords=forbidden
+    )
+
+
+def validate_select_query(sql: str) -> ParsedQuery:
+    """
+    Check that ``sql`` is a single read-only query.
+
+    Raises:
+        ValueError: Not a SELECT, forbidden keyword, or several statements
+    """
+    parsed = parse_query(sql.strip())
+    if parsed.statement_type != "SELECT":
+        raise ValueError("Only SELECT queries are allowed")
+    if parsed.forbidden_keywords:
+        raise ValueError(f"Keyword '{parsed.forbidden_keywords[0]}' is not allowed in queries")
+    if parsed.statements > 1:
+        raise ValueError("Multiple statements are not allowed")
+    return parsed
+
+
+def strip_terminator(sql: str) -> str:
+    """Drop trailing ``;`` separators (Oracle rejects them with ORA-00933)."""
+    sig = _significant(parse_query(sql).tokens)
+    end = len(sql)
+    while sig and sig[-1].text == ";":
+        end = sig.pop().start
+    return sql[:end].rstrip() if end < len(sql) else sql
+
+
+def apply_row_limit(sql: str, limit: Optional[int]) -> str:
+    """
+    Drop a trailing ``;`` and cap the query at ``limit`` rows (None: no cap).
+
+    Queries without a row limit get ``FETCH FIRST limit ROWS ONLY``; a literal
+    ``FETCH FIRST n`` / ``LIMIT n`` above ``limit`` is lowered to it. ROWNUM
+    filters and bound row counts are left as written.
+    """
+    sql = strip_terminator(sql)
+    if not limit:
+        return sql
+    parsed = parse_query(sql)
+    if parsed.has_limit:
+        count = parsed.limit_count
+        if parsed.limit_value is not None and parsed.limit_value > limit:
+            return f"{sql[:count.start]}{limit}{sql[count.end:]}"
+        return sql
+    last = next((t for t in reversed(parsed.tokens) if t.kind != SPACE), None)
+    # A trailing line comment would swallow the clause
+    separator = "\n" if last is not None and last.text.startswith("--") else " "
+    return f"{sql.rstrip()}{separator}FETCH FIRST {limit} ROWS ONLY"
+
+
+def _literal_value(text: str) -> Any:
+    """Python value of a string or numeric literal token."""
+    if text[0] in "nN" and len(text) > 1 and text[1] in "qQ'":
+        text = text[1:]
+    if text[0] in "qQ":
+        return text[3:-2]
+    if text[0] == "'":
+        return text[1:-1].replace("''", "'")
+    return int(text) if text.isdigit() else float(text)
+
+
+def _bindable_literals(sig: list) -> list:
+    """
+    Literal tokens that can be replaced by a bind without changing the
+    statement's meaning or validity.
+
+    Kept as written: typed literals (``DATE '...'``), format masks and units
+    (``TO_CHAR(d, 'YYYY')``, ``ADD_MONTHS(d, -3)``), type precisions and
+    everything in GROUP BY / ORDER BY lists. A literal that appears in a
+    GROUP BY / ORDER BY list is kept everywhere else too, so grouped
+    expressions repeated in the select list still match (ORA-00979).
+    """
+    # One frame per parenthesis level: [function name, argument index, inside GROUP/ORDER BY]
+    frames = [[None, 0, False]]
+    candidates = []
+    kept = set()
+    for i, token in enumerate(sig):
+        frame = frames[-1]
+        if token.text == "(":
+            prev = sig[i - 1] if i else None
+            frames.append([prev.upper if prev is not None and prev.kind == WORD else None, 0, frame[2]])
+        elif token.text == ")":
+            if len(frames) > 1:
+                frames.pop()
+        elif token.text == ",":
+            frame[1] += 1
+        elif token.kind == WORD:
+            if token.upper in ("GROUP", "ORDER") and i + 1 < len(sig) and sig[i + 1].upper == "BY":
+                frame[2] = True
+            elif token.upper in _BY_CLAUSE_END:
+                frame[2] = False
+        elif token.kind in LITERALS:
+            prev = sig[i - 1].upper if i else None
+            nxt = sig[i + 1] if i + 1 < len(sig) else None
+            function, argument, in_by = frame
+            if in_by:
+                kept.add(token.text)
+            elif not (
+                prev in _TYPED_LITERAL_KEYWORDS
+                or (function in _FORMAT_FUNCTIONS and argument > 0)
+                or function in _PRECISION_WORDS
+                # Unterminated string, or a suffixed number such as 1.5f
+                or (token.kind == STRING and (len(token.text) < 2 or not token.text.endswith("'")))
+                or (nxt is not None and nxt.start == token.end and nxt.kind == WORD)
+            ):
+                candidates.append(token)
+    return [t for t in candidates if t.text not in kept]
+
+
+@lru_cache(maxsize=1024)
+def _parameterized(sql: str) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+    tokens = parse_query(sql).tokens
+    literals = _bindable_literals(_significant(tokens))
+    if not literals:
+        return sql, ()
+    taken = {t.text[1:].lower() for t in tokens if t.kind == BIND}
+    names: Dict[str, str] = {}
+    binds = []
+    counter = 0
+    for token in literals:
+        if token.text in names:
+            continue
+        counter += 1
+        while f"{AUTO_BIND_PREFIX}{counter}" in taken:
+            counter += 1
+        names[token.text] = f"{AUTO_BIND_PREFIX}{counter}"
+        binds.append((names[token.text], _literal_value(token.text)))
+    parts = []
+    position = 0
+    for token in literals:
+        parts.append(sql[position:token.start])
+        parts.append(":" + names[token.text])
+        position = token.end
+    parts.append(sql[position:])
+    return "".join(parts), tuple(binds)
+
+
+def parameterize_literals(sql: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Replace string and numeric literals with bind variables.
+
+    ``WHERE EDAD > 50 AND SEXO = 'M'`` becomes ``WHERE EDAD > :lit1 AND
+    SEXO = :lit2`` with ``{"lit1": 50, "lit2": "M"}`` merged into
+    ``params``; identical literals share one bind. Literals whose value is
+    part of the statement's structure (see ``_bindable_literals``) are kept.
+
+    Returns:
+        The rewritten text and the bind variables to execute it with
+        (``sql`` and ``params`` unchanged when there is nothing to bind)
+    """
+    text, binds = _parameterized(sql)
+    if not binds:
+        return sql, params
+    merged = dict(params or {})
+    merged.update(binds)
+    return text, merged
@@ -0,0 +1,258 @@
+"""
+Single-scan engine for the dashboard aggregates.
+
+The seven categorical breakdowns shown on the dashboard (categoria, edad band,
+sexo, circunstancia de contacto, estancia band, comunidad autónoma and
+servicio) are computed with one ``GROUP BY GROUPING SETS`` statement, so a
+cold dashboard reads SALUD_MENTAL_FEATURED once instead of seven times. The
+result is split back into the shapes returned by the matching
+``HealthDataService`` methods and keyed by their names.
+"""
+import logging
+from typing import Dict, List
+
+from app.config import settings
+from app.services.health_data_service import HealthDataService
+from app.services.query_log import query_log
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# SQL STATEMENTS
+# ============================================================================
+
+EDAD_BANDS = ('0-17', '18-25', '26-35', '36-45', '46-55', '56-65', '65+', 'Unknown')
+ESTANCIA_BANDS = ('1-3 dias', '4-7 dias', '8-14 dias', '15-30 dias', '30+ dias', 'Unknown')
+
+# Band expressions are NULL when the source column is NULL so the same rows
+# are excluded as in the per-dimension queries (WHERE col IS NOT NULL).
+DASHBOARD_BASE_SQL = """
+    SELECT
+        CATEGORIA,
+        CASE
+            WHEN EDAD IS NULL THEN NULL
+            WHEN EDAD BETWEEN 0 AND 17 THEN '0-17'
+            WHEN EDAD BETWEEN 18 AND 25 THEN '18-25'
+            WHEN EDAD BETWEEN 26 AND 35 THEN '26-35'
+            WHEN EDAD BETWEEN 36 AND 45 THEN '36-45'
+            WHEN EDAD BETWEEN 46 AND 55 THEN '46-55'
+            WHEN EDAD BETWEEN 56 AND 65 THEN '56-65'
+            WHEN EDAD > 65 THEN '65+'
+            ELSE 'Unknown'
+        END as RANGO_EDAD,
+        SEXO,
+        CIRCUNSTANCIA_DE_CONTACTO,
+        CASE
+            WHEN ESTANCIA_DIAS IS NULL THEN NULL
+            WHEN ESTANCIA_DIAS BETWEEN 1 AND 3 THEN '1-3 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 4 AND 7 THEN '4-7 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 8 AND 14 THEN '8-14 dias'
+            WHEN ESTANCIA_DIAS BETWEEN 15 AND 30 THEN '15-30 dias'
+            WHEN ESTANCIA_DIAS > 30 THEN '30+ dias'
+            ELSE 'Unknown'
+        END as RANGO_DIAS,
+        COMUNIDAD_AUTONOMA,
+        SERVICIO
+    FROM SALUD_MENTAL_FEATURED
+"""
+
+# (dimension name, grouping column) in result column order
+DIMENSIONS = (
+    ('categoria', 'CATEGORIA'),
+    ('edad', 'RANGO_EDAD'),
+    ('sexo', 'SEXO'),
+    ('circunstancia', 'CIRCUNSTANCIA_DE_CONTACTO'),
+    ('estancia', 'RANGO_DIAS'),
+    ('comunidad', 'COMUNIDAD_AUTONOMA'),
+    ('servicio', 'SERVICIO'),
+)
+
+DASHBOARD_STATS_SQL = """
+    SELECT
+        CASE
+{discriminator}
+        END as dimension,
+        {columns},
+        COUNT(*) as total
+    FROM ({base})
+    GROUP BY GROUPING SETS ({sets})
+""".format(
+    discriminator="\n".join(
+        f"            WHEN GROUPING({column}) = 0 THEN '{name}'" for name, column in DIMENSIONS
+    ),
+    columns=", ".join(column for _, column in DIMENSIONS),
+    base=DASHBOARD_BASE_SQL,
+    sets=", ".join(f"({column})" for _, column in DIMENSIONS)
+)
+
+# SQLite has no GROUPING SETS: same result shape as UNION ALL of one GROUP BY
+# per dimension over the shared base rows.
+DASHBOARD_STATS_SQLITE_SQL = "WITH base AS ({base})\n{branches}".format(
+    base=DASHBOARD_BASE_SQL,
+    branches="\n    UNION ALL\n".join(
+        "    SELECT '{name}' as dimension, {columns}, COUNT(*) as total "
+        "FROM base GROUP BY {column}".format(
+            name=name,
+            column=column,
+            columns=", ".join(
+                other if other == column else f"NULL as {other}" for _, other in DIMENSIONS
+            )
+        )
+        for name, column in DIMENSIONS
+    )
+)
+
+# Position of each dimension's key in a result row (after the discriminator)
+DIMENSION_INDEX = {name: index for index, (name, _) in enumerate(DIMENSIONS, start=1)}
+
+SERVICIO_TOP_N = 20
+
+SEXO_LABELS = {1: 'Hombre', 2: 'Mujer'}
+
+
+# Query log name of the dashboard statement (both backends)
+query_log.name_statements({DASHBOARD_STATS_SQL: "dashboard_stats", DASHBOARD_STATS_SQLITE_SQL: "dashboard_stats"})
+
+
+def dashboard_stats_sql() -> str:
+    """Statement for the configured backend."""
+    if settings.DB_BACKEND.lower() == "sqlite":
+        return DASHBOARD_STATS_SQLITE_SQL
+    return DASHBOARD_STATS_SQL
+
+
+class StatsEngine:
+    """
+    Computes every dashboard breakdown from one grouped scan.
+
+    ``compute(connection)`` / ``compute_async(connection)`` return a dict keyed
+    by ``HealthDataService`` method name (``get_diagnosticos_stats``,
+    ``get_edad_distribution``, ...) whose values are the lists the statistics
+    routes return.
+    """
+
+    # HealthDataService method served by each dimension
+    METHODS = {
+        'categoria': 'get_diagnosticos_stats',
+        'edad': 'get_edad_distribution',
+        'sexo': 'get_genero_distribution',
+        'circunstancia': 'get_tipo_ingreso_stats',
+        'estancia': 'get_duracion_estancia',
+        'comunidad': 'get_comunidad_stats',
+        'servicio': 'get_servicio_stats',
+    }
+
+    @staticmethod
+    def _percent(total: int, grand_total: int) -> float:
+        return round(total * 100.0 / grand_total, 2) if grand_total else 0.0
+
+    @staticmethod
+    def _split(rows: List[tuple]) -> Dict[str, List[tuple]]:
+        """
+        Group result rows by dimension as (key, total), dropping NULL keys.
+        """
+        groups: Dict[str, List[tuple]] = {name: [] for name, _ in DIMENSIONS}
+        for row in rows:
+            name = row[0]
+            if name not in DIMENSION_INDEX:
+                continue
+            key = row[DIMENSION_INDEX[name]]
+            if key is None:
+                continue
+            groups[name].append((key, row[-1]))
+        return groups
+
+    @staticmethod
+    def _ranked(groups: List[tuple], limit: int = None) -> List[tuple]:
+        """
+        (key, total, porcentaje) rows ordered by total, like the per-dimension
+        ``ORDER BY total DESC [FETCH FIRST n ROWS ONLY]`` queries; the
+        percentage is over every group, as the window ``SUM(COUNT(*)) OVER ()``.
+        """
+        grand_total = sum(total for _, total in groups)
+        ranked = sorted(groups, key=lambda group: group[1], reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(key, total, StatsEngine._percent(total, grand_total)) for key, total in ranked]
+
+    @staticmethod
+    def _banded(groups: List[tuple], bands: tuple) -> List[tuple]:
+        """(band, total) rows in band order."""
+        order = {band: index for index, band in enumerate(bands)}
+        return sorted(groups, key=lambda group: order.get(group[0], len(bands)))
+
+    @staticmethod
+    def _sexo_label(code) -> str:
+        """``CASE WHEN SEXO = 1 THEN 'Hombre' WHEN SEXO = 2 THEN 'Mujer' ELSE 'Otro' END``."""
+        try:
+            return SEXO_LABELS.get(int(code), 'Otro')
+        except (TypeError, ValueError):
+            return 'Otro'
+
+    @staticmethod
+    def _shape(rows: List[tuple]) -> Dict[str, List[dict]]:
+        """
+        Split the grouped result back into the per-endpoint response shapes.
+
+        Each dimension is turned into the rows its per-dimension statement
+        returns and passed through the same ``HealthDataService`` row mapper,
+        so both paths produce identical lists.
+        """
+        groups = StatsEngine._split(rows)
+
+        # GENERO_DISTRIBUTION_SQL groups by the raw SEXO code and labels each group
+        sexo = [
+            (StatsEngine._sexo_label(key), total, pct)
+            for key, total, pct in StatsEngine._ranked(groups['sexo'])
+        ]
+
+        return {
+            'get_diagnosticos_stats': HealthDataService._map_diagnosticos_stats(
+                StatsEngine._ranked(groups['categoria'])
+            ),
+            'get_edad_distribution': HealthDataService._map_edad_distribution(
+                StatsEngine._banded(groups['edad'], EDAD_BANDS)
+            ),
+            'get_genero_distribution': HealthDataService._map_genero_distribution(sexo),
+            'get_tipo_ingreso_stats': HealthDataService._map_tipo_ingreso_stats(
+                StatsEngine._ranked(groups['circunstancia'])
+            ),
+            'get_duracion_estancia': HealthDataService._map_duracion_estancia(
+                StatsEngine._banded(groups['estancia'], ESTANCIA_BANDS)
+            ),
+            'get_comunidad_stats': HealthDataService._map_comunidad_stats(
+                StatsEngine._ranked(groups['comunidad'])
+            ),
+            'get_servicio_stats': HealthDataService._map_servicio_stats(
+                StatsEngine._ranked(groups['servicio'], limit=SERVICIO_TOP_N)
+            ),
+        }
+
+    @staticmethod
+    def compute(connection) -> Dict[str, List[dict]]:
+        """
+        Compute all dashboard breakdowns with a single statement.
+
+        Args:
+            connection: Database connection
+
+        Returns:
+            Dictionary of result lists keyed by HealthDataService method name
+        """
+        try:
+            rows, _ = HealthDataService.execute_statement(connection, dashboard_stats_sql())
+            return StatsEngine._shape(rows)
+        except Exception as e:
+            logger.error(f"Error computing dashboard stats: {str(e)}")
+            raise
+
+    @staticmethod
+    async def compute_async(connection) -> Dict[str, List[dict]]:
+        """Asyncio variant of :meth:`compute`."""
+        try:
+            rows, _ = await HealthDataService.execute_statement_async(connection, dashboard_stats_sql())
+            return StatsEngine._shape(rows)
+        except Exception as e:
+            logger.error(f"Error computing dashboard stats: {str(e)}")
+            raise
@@ -0,0 +1,179 @@
+"""
+Workload fingerprinting for ad-hoc SQL.
+
+``/query/execute``, ``/query/export`` and ``/ai/analyze`` run
+analyst-written SQL. Each
+execution that reaches the database is reduced to a fingerprint
+(literals and bind names replaced by ``?``, comments dropped, keywords and
+identifiers upper-cased, whitespace normalized, IN lists collapsed) and
+aggregated in memory: calls, errors, latency (total, mean, p95) and rows.
+``GET /query/workload`` reports the top fingerprints, which shows what is
+worth precomputing or indexing.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Optional
+
+from app.config import settings
+from app.services.sql_validator import BIND, COMMENT, NUMBER, SPACE, STRING, tokenize
+
+# No space before these tokens / after these tokens
+_NO_SPACE_BEFORE = frozenset((",", ")", "."))
+_NO_SPACE_AFTER = frozenset(("(", "."))
+
+_IN_LIST_RE = re.compile(r"\?(?:, \?)+")
+
+# Sort keys accepted by ``WorkloadStats.top``
+SORT_KEYS = ("total_ms", "calls", "mean_ms", "p95_ms", "rows", "error_rate")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """
+    Normalized shape of a statement: ``select * from t where a = 5 and b in ('x','y')``
+    becomes ``SELECT * FROM T WHERE A = ? AND B IN (?, ...)``.
+    """
+    parts = []
+    for token in tokenize(query):
+        if token.kind in (COMMENT, SPACE):
+            continue
+        text = "?" if token.kind in (STRING, NUMBER, BIND) else token.upper
+        if parts and text not in _NO_SPACE_BEFORE and parts[-1] not in _NO_SPACE_AFTER:
+            parts.append(" ")
+        parts.append(text)
+    # A trailing semicolon does not change the statement
+    while parts and parts[-1] in (";", " "):
+        parts.pop()
+    return _IN_LIST_RE.sub("?, ...", "".join(parts))
+
+
+class _Execution:
+    """Context manager timing one execution; set ``rows`` before leaving."""
+
+    __slots__ = ("_stats", "_source", "_query", "_start", "rows")
+
+    def __init__(self, stats: "WorkloadStats", source: str, query: str):
+        self._stats = stats
+        self._source = source
+        self._query = query
+        self.rows = 0
+
+    def __enter__(self) -> "_Execution":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stats.record(
+            self._source, self._query, time.perf_counter() - self._start, self.rows, failed=exc_type is not None
+        )
+        return False
+
+
+class WorkloadStats:
+    """
+    Thread-safe per-fingerprint aggregates, bounded to ``max_fingerprints``
+    (least recently seen are dropped first).
+    """
+
+    def __init__(self, max_fingerprints: int, latency_sample_size: int = 256):
+        self.max_fingerprints = max_fingerprints
+        self.latency_sample_size = latency_sample_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.evicted = 0
+
+    def track(self, source: str, query: str) -> _Execution:
+        """
+        Time an execution: ``with query_workload.track("query", sql) as run: ...; run.rows = n``.
+        Exceptions raised inside the block count as errors.
+        """
+        return _Execution(self, source, query)
+
+    def record(self, source: str, query: str, elapsed: float, rows: int, failed: bool = False):
+        """
+        Add one execution of ``query`` (seconds, rows fetched) to its fingerprint.
+        """
+        key = fingerprint(query)
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "sources": set(),
+                    "latencies": deque(maxlen=self.latency_sample_size),
+                    "last_seen": 0.0
+                }
+                while len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._entries.move_to_end(key)
+            entry["calls"] += 1
+            entry["errors"] += 1 if failed else 0
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += rows
+            entry["sources"].add(source)
+            entry["latencies"].append(elapsed_ms)
+            entry["last_seen"] = time.time()
+
+    @staticmethod
+    def _summary(key: str, entry: dict) -> dict:
+        latencies = sorted(entry["latencies"])
+        calls = entry["calls"]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        return {
+            "fingerprint": key,
+            "sources": sorted(entry["sources"]),
+            "calls": calls,
+            "errors": entry["errors"],
+            "error_rate": round(entry["errors"] / calls, 4),
+            "total_ms": round(entry["total_ms"], 3),
+            "mean_ms": round(entry["total_ms"] / calls, 3),
+            "p95_ms": round(p95, 3) if p95 is not None else None,
+            "max_ms": round(entry["max_ms"], 3),
+            "rows": entry["rows"],
+            "mean_rows": round(entry["rows"] / calls, 1),
+            "last_seen": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(entry["last_seen"]))
+        }
+
+    def top(self, limit: int = 20, sort: str = "total_ms", source: Optional[str] = None) -> dict:
+        """
+        Fingerprints ordered by ``sort`` (descending), optionally for one source.
+        """
+        with self._lock:
+            snapshot = [
+                (key, dict(entry, sources=set(entry["sources"]), latencies=list(entry["latencies"])))
+                for key, entry in self._entries.items()
+                if source is None or source in entry["sources"]
+            ]
+        summaries = [self._summary(key, entry) for key, entry in snapshot]
+        summaries.sort(key=lambda s: s[sort] or 0, reverse=True)
+        total_ms = sum(s["total_ms"] for s in summaries)
+        for s in summaries:
+            s["share_of_time"] = round(s["total_ms"] / total_ms, 4) if total_ms else None
+        return {
+            "fingerprints": len(summaries),
+            "evicted": self.evicted,
+            "calls": sum(s["calls"] for s in summaries),
+            "total_ms": round(total_ms, 3),
+            "sort": sort,
+            "top": summaries[:limit]
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.evicted = 0
+
+
+# Singleton instance
+query_workload = WorkloadStats(max_fingerprints=settings.WORKLOAD_MAX_FINGERPRINTS)
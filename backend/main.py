@@ -1,18 +1,19 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
-import time
 
 from app.config import settings
-from app.database.connection import db_connection
-from app.api import health, statistics, data, query, ai_analysis
+from app.api.access_log import AccessLogMiddleware, setup_logging
+from app.metrics import MetricsMiddleware
+from app.database.connection import db_connection, db_executor
+from app.services.health_data_service import WARMUP_STATEMENTS
+from app.services.stats_engine import dashboard_stats_sql
+from app.services.refresher import statistics_refresher
+from app.api import health, statistics, data, query, ai_analysis, pool, metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO if settings.DEBUG else logging.WARNING,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (queue-backed: formatting and I/O run off the event loop)
+setup_logging(logging.INFO if settings.DEBUG else logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
@@ -24,18 +25,29 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
     try:
+        db_connection.register_warmup_statements(WARMUP_STATEMENTS + (dashboard_stats_sql(),))
         db_connection.initialize_pool()
-        logger.info("Database connection pool initialized")
+        db_connection.initialize_async_pool()
+        logger.info("Database connection pools initialized")
+        if settings.ORACLE_POOL_WARMUP:
+            await db_connection.warm_up()
     except Exception as e:
         logger.error(f"Failed to initialize database pool: {str(e)}")
         raise
     
+    # Pre-warm and keep refreshing the dashboard statistics in the background
+    if settings.STATISTICS_REFRESH_ENABLED and settings.CACHE_ENABLED:
+        statistics_refresher.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    await statistics_refresher.stop()
     db_connection.close_pool()
-    logger.info("Database connection pool closed")
+    await db_connection.close_async_pool()
+    db_executor.shutdown()
+    logger.info("Database connection pools closed")
 
 
 # Create FastAPI application
@@ -91,34 +103,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
-# Add logging middleware to track all requests
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests with detailed information."""
-    start_time = time.time()
-    
-    # Log request details
-    logger.info("=" * 80)
-    logger.info(f"🌐 [HTTP REQUEST] {request.method} {request.url.path}")
-    logger.info(f"📍 Full URL: {request.url}")
-    logger.info(f"🔤 Query params: {dict(request.query_params)}")
-    logger.info(f"🌍 Client: {request.client.host if request.client else 'Unknown'}")
-    
-    # Note: No leemos el body aquí porque consumiría el stream
-    # El logging del body se hace en cada endpoint individual
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log response
-    process_time = (time.time() - start_time) * 1000
-    logger.info(f"✅ Status: {response.status_code} | Time: {process_time:.2f}ms")
-    logger.info("=" * 80)
-    
-    return response
+# Structured access log (outside CORS, so it also times CORS handling)
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        slow_ms=settings.ACCESS_LOG_SLOW_MS
+    )
+
+# Request metrics; wraps the access log so its records include the phase breakdown
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 
 # Include routers
@@ -126,7 +125,10 @@ app.include_router(health.router, prefix=settings.API_V1_PREFIX)
 app.include_router(statistics.router, prefix=settings.API_V1_PREFIX)
 app.include_router(data.router, prefix=settings.API_V1_PREFIX)
 app.include_router(query.router, prefix=settings.API_V1_PREFIX)
+app.include_router(pool.router, prefix=settings.API_V1_PREFIX)
 app.include_router(ai_analysis.router, prefix=f"{settings.API_V1_PREFIX}/ai", tags=["AI Analysis"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/", tags=["Root"])
@@ -149,5 +151,6 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        access_log=False  # replaced by AccessLogMiddleware
     )
@@ -0,0 +1,103 @@
+"""
+Shared test setup.
+
+The suite runs on the embedded SQLite backend (``DB_BACKEND=sqlite``) over a
+small generated copy of SALUD_MENTAL_FEATURED, so it needs neither an Oracle
+instance nor the EDA dataset. The environment is set here, before any test
+module imports ``app.config``.
+"""
+import csv
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+DATASET_ROWS = 600
+
+CSV_COLUMNS = (
+    "comunidad_autonoma", "nombre_completo", "fecha_nacimiento", "sexo", "edad",
+    "fecha_ingreso", "fecha_fin_contacto", "circunstancia_contacto", "circunstancia_de_contacto",
+    "estancia_dias", "categoria", "diagnostico_principal", "tipo_alta", "servicio",
+    "mes_ingreso", "coste_apr", "nivel_severidad_apr"
+)
+
+
+def _maybe(rng: random.Random, value, null_rate: float = 0.05):
+    return "" if rng.random() < null_rate else value
+
+
+def write_dataset(path: str, rows: int = DATASET_ROWS, seed: int = 7):
+    """
+    Deterministic sample with the columns the services query, including NULLs,
+    repeated sort keys and sexo codes other than 1/2.
+    """
+    rng = random.Random(seed)
+    comunidades = ["andalucia", "madrid", "cataluna", "galicia", "aragon"]
+    servicios = [f"SRV{i:02d}" for i in range(25)]
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_COLUMNS)
+        for i in range(rows):
+            ingreso = date(2016, 1, 1) + timedelta(days=rng.randrange(3000))
+            estancia = rng.randrange(1, 60)
+            circunstancia = rng.choice(["1", "2", "3"])
+            writer.writerow([
+                _maybe(rng, rng.choice(comunidades)),
+                _maybe(rng, f"N{rng.randrange(rows // 3):05d}"),
+                (date(1940, 1, 1) + timedelta(days=rng.randrange(25000))).isoformat(),
+                _maybe(rng, rng.choice(["1", "2", "2", "1", "9", "0"])),
+                _maybe(rng, str(rng.randrange(0, 95))),
+                _maybe(rng, ingreso.isoformat(), 0.02),
+                (ingreso + timedelta(days=estancia)).isoformat(),
+                circunstancia,
+                _maybe(rng, circunstancia),
+                _maybe(rng, str(estancia)),
+                _maybe(rng, rng.choice("ABCDE")),
+                rng.choice(["F20", "F32", "F10", "F41"]),
+                rng.choice(["1", "2"]),
+                _maybe(rng, rng.choice(servicios)),
+                str(ingreso.month),
+                f"{rng.uniform(500, 20000):.2f}",
+                str(rng.randrange(1, 5))
+            ])
+
+
+_DATA_DIR = tempfile.mkdtemp(prefix="salud_mental_tests_")
+CSV_PATH = os.path.join(_DATA_DIR, "salud_mental_featured.csv")
+write_dataset(CSV_PATH)
+
+os.environ.update(
+    DB_BACKEND="sqlite",
+    SQLITE_CSV_PATH=CSV_PATH,
+    SECRET_KEY="test-secret-key",
+    DEBUG="false",
+    GEMINI_API_KEY="",
+    STATISTICS_REFRESH_ENABLED="false",
+    ORACLE_POOL_WARMUP="false"
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient over the full app (lifespan included)."""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def connection():
+    """A blocking connection to the embedded database."""
+    from app.database.connection import db_connection
+
+    db_connection.initialize_pool()
+    conn = db_connection.get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from app.api.access_log import ACCESS_LOGGER_NAME, AccessLogFormatter, AccessLogMiddleware
+
+
+def _app(status, delay=0.0):
+    async def app(scope, receive, send):
+        await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"abc", "more_body": True})
+        await send({"type": "http.response.body", "body": b"de"})
+    return app
+
+
+def _call(middleware):
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/x", "query_string": b"a=1", "client": ("10.0.0.1", 1)}
+
+    async def send(message):
+        pass
+
+    asyncio.run(middleware(scope, None, send))
+
+
+@pytest.mark.parametrize("status, delay, logged, level", [
+    (200, 0.0, False, None),
+    (503, 0.0, True, logging.WARNING),
+    (200, 0.02, True, logging.WARNING),
+])
+def test_unsampled_requests_are_logged_only_when_slow_or_failed(caplog, status, delay, logged, level):
+    caplog.set_level(logging.INFO, logger=ACCESS_LOGGER_NAME)
+
+    _call(AccessLogMiddleware(_app(status, delay), sample_rate=0.0, slow_ms=10))
+
+    records = [r for r in caplog.records if r.name == ACCESS_LOGGER_NAME]
+    assert bool(records) is logged
+    if logged:
+        [record] = records
+        assert record.levelno == level
+        assert record.access["status"] == status
+        assert record.access["bytes"] == 5
+        assert record.access["query"] == "a=1"
+
+
+def test_sampled_request_renders_as_one_json_line(caplog):
+    caplog.set_level(logging.INFO, logger=ACCESS_LOGGER_NAME)
+
+    _call(AccessLogMiddleware(_app(200), sample_rate=1.0))
+
+    [record] = [r for r in caplog.records if r.name == ACCESS_LOGGER_NAME]
+    line = AccessLogFormatter().format(record)
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert (entry["level"], entry["method"], entry["path"], entry["client"]) == ("INFO", "GET", "/api/v1/x", "10.0.0.1")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.api.admission import admitted
+from app.services.admission import AI, AdmissionRejected, WorkloadClass, admission_controller
+
+
+def test_slots_are_handed_over_in_fifo_order():
+    async def scenario():
+        workload = WorkloadClass("test", concurrency=1, max_queue=5, max_wait=1.0)
+        order = []
+
+        async def request(name):
+            await workload.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            workload.release(0.01)
+
+        await asyncio.gather(*(request(name) for name in "abc"))
+        return workload, order
+
+    workload, order = asyncio.run(scenario())
+
+    assert order == ["a", "b", "c"]
+    assert workload.stats()["running"] == 0
+    assert workload.stats()["queued"] == 2
+
+
+def test_full_queue_and_expired_wait_are_shed():
+    async def scenario():
+        workload = WorkloadClass("test", concurrency=1, max_queue=1, max_wait=0.05)
+        await workload.acquire()
+        waiting = asyncio.ensure_future(workload.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="queue is full"):
+            await workload.acquire()
+        with pytest.raises(AdmissionRejected, match="no slot within"):
+            await waiting
+        return workload
+
+    workload = asyncio.run(scenario())
+
+    assert workload.rejected_full == 1
+    assert workload.rejected_timeout == 1
+    assert workload.stats()["queue_depth"] == 0
+
+
+def test_ai_slot_is_released_before_the_llm_call(client, monkeypatch):
+    from app.api import ai_analysis
+
+    running = []
+
+    async def analyze_data(query, data, user_question):
+        running.append(admission_controller.get(AI).stats()["running"])
+        return {"statistics": {}, "ai_insight": "", "data_sample": data[:1]}
+
+    monkeypatch.setattr(ai_analysis.ai_service, "analyze_data", analyze_data)
+    response = client.post("/api/v1/ai/analyze", json={"query": "SELECT EDAD FROM SALUD_MENTAL_FEATURED", "limit": 5})
+
+    assert response.status_code == 200
+    assert running == [0]
+
+
+def test_admitted_maps_rejection_to_503(monkeypatch):
+    from fastapi import HTTPException
+
+    async def scenario():
+        workload = admission_controller.get(AI)
+        monkeypatch.setattr(workload, "max_queue", 0)
+        monkeypatch.setattr(workload, "_active", workload.concurrency)
+        with pytest.raises(HTTPException) as info:
+            async with admitted(AI):
+                pass
+        return info.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
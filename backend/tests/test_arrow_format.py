@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from app.services.arrow_format import negotiate_binary_format
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+QUERY = "SELECT EDAD, SEXO, FECHA_INGRESO FROM SALUD_MENTAL_FEATURED WHERE EDAD IS NOT NULL ORDER BY ROWID"
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, None),
+    ("application/json", None),
+    ("application/json, application/vnd.apache.arrow.stream;q=0.9", "arrow"),
+    ("application/x-parquet", "parquet"),
+])
+def test_negotiate_binary_format(accept, expected):
+    assert negotiate_binary_format(accept) == expected
+
+
+def test_execute_as_arrow_stream_matches_json(client):
+    rows = client.post("/api/v1/query/execute", json={"query": QUERY, "limit": 50}).json()["data"]
+    response = client.post("/api/v1/query/execute", json={"query": QUERY, "limit": 50},
+                           headers={"Accept": "application/vnd.apache.arrow.stream"})
+
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["EDAD", "SEXO", "FECHA_INGRESO"]
+    assert table.column("EDAD").to_pylist() == [row["EDAD"] for row in rows]
+
+
+def test_export_as_parquet_has_one_row_group_per_batch(client):
+    response = client.post("/api/v1/query/export", json={"query": QUERY, "format": "parquet", "batch_size": 100})
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_rows > 100
+    assert parquet.metadata.num_row_groups == -(-parquet.metadata.num_rows // 100)
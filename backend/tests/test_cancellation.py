@@ -0,0 +1,66 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.disconnect import CLIENT_CLOSED_REQUEST, run_until_disconnect
+from app.database.connection import current_call_timeout, db_connection, run_with_connection, statement_timeout
+
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000000) "
+    "SELECT COUNT(*) FROM c"
+)
+
+
+def _run_slow_query(connection):
+    return connection.cursor().execute(SLOW_QUERY).fetchone()
+
+
+class GoneRequest:
+    """Request whose client disconnects ``after`` seconds in."""
+
+    def __init__(self, after: float):
+        self.deadline = time.monotonic() + after
+        self.url = SimpleNamespace(path="/api/v1/query/execute")
+
+    async def is_disconnected(self):
+        return time.monotonic() >= self.deadline
+
+
+def test_disconnect_cancels_the_running_statement(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "CLIENT_DISCONNECT_POLL_SECONDS", 0.02)
+    db_connection.initialize_pool()
+
+    async def scenario():
+        start = time.perf_counter()
+        with pytest.raises(HTTPException) as info:
+            await run_until_disconnect(GoneRequest(0.1), run_with_connection(_run_slow_query))
+        elapsed = time.perf_counter() - start
+        # The connection went back to the pool and is usable again
+        after = await run_with_connection(lambda c: c.cursor().execute("SELECT 1").fetchone())
+        return info.value, elapsed, after
+
+    error, elapsed, after = asyncio.run(scenario())
+
+    assert error.status_code == CLIENT_CLOSED_REQUEST
+    assert elapsed < 5
+    assert tuple(after) == (1,)
+
+
+def test_finished_work_is_returned_before_any_disconnect():
+    async def work():
+        return 42
+
+    assert asyncio.run(run_until_disconnect(GoneRequest(60), work())) == 42
+
+
+def test_statement_timeout_dependency_sets_the_context_call_timeout():
+    async def scenario():
+        await statement_timeout(1234)()
+        return current_call_timeout()
+
+    assert asyncio.run(scenario()) == 1234
@@ -0,0 +1,17 @@
+QUERY = "SELECT NOMBRE_COMPLETO, EDAD, FECHA_INGRESO, COSTE_APR FROM SALUD_MENTAL_FEATURED ORDER BY ROWID"
+
+
+def test_columnar_matches_row_objects(client):
+    rows = client.post("/api/v1/query/execute", json={"query": QUERY, "limit": 25}).json()
+    columnar = client.post("/api/v1/query/execute", json={"query": QUERY, "limit": 25, "format": "columnar"}).json()
+
+    assert columnar["columns"] == rows["columns"]
+    assert len(columnar["types"]) == len(columnar["columns"])
+    assert [dict(zip(columnar["columns"], row)) for row in columnar["rows"]] == rows["data"]
+    assert columnar["rows_returned"] == 25
+
+
+def test_unknown_format_is_rejected(client):
+    response = client.post("/api/v1/query/execute", json={"query": QUERY, "format": "xml"})
+
+    assert response.status_code == 422
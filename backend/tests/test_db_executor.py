@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from app.database.connection import DBExecutor
+
+
+def test_blocking_work_is_bounded_and_keeps_the_loop_free():
+    executor = DBExecutor(max_workers=2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def blocking():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return threading.current_thread().name
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        names = await asyncio.gather(*(executor.run(blocking) for _ in range(4)))
+        ticking.cancel()
+        return names, ticks
+
+    try:
+        names, ticks = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert max(peak) == 2
+    assert all(name.startswith("db-executor") for name in names)
+    assert ticks > 5
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["queue_depth"], stats["running"]) == (4, 4, 0, 0)
+    assert stats["wait_ms_max"] > 0
+
+
+def test_queued_work_cancelled_before_it_starts_is_counted():
+    executor = DBExecutor(max_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(time.sleep, 0))
+        await asyncio.sleep(0.02)
+        second.cancel()
+        await asyncio.sleep(0.02)
+        release.set()
+        await first
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()["cancelled"] == 1
+    assert executor.stats()["queue_depth"] == 0
@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.services.health_data_service import decode_page_cursor, encode_page_cursor
+
+
+@pytest.mark.parametrize("last_key", ["N00012", datetime(2019, 3, 4, 17, 30, 5), date(2019, 3, 4), None, 42])
+def test_cursor_round_trip_keeps_key_type(last_key):
+    token = encode_page_cursor(last_key, "AAAR3sAAEAAAACXAAA")
+
+    assert decode_page_cursor(token) == (last_key, "AAAR3sAAEAAAACXAAA")
+    assert "N00012" not in token
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", encode_page_cursor("N1", 1)[:-4] + "AAAA"])
+def test_tampered_cursor_is_rejected(token):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_page_cursor(token)
+
+
+def _walk(client, path, limit):
+    rows, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        rows += response.json()
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows, pages
+
+
+@pytest.mark.parametrize("path", ["/api/v1/data/pacientes", "/api/v1/data/ingresos"])
+def test_cursor_pages_match_offset_pages(client, path):
+    by_cursor, pages = _walk(client, path, 45)
+    by_offset = []
+    for skip in range(0, len(by_cursor) + 45, 45):
+        by_offset += client.get(path, params={"limit": 45, "skip": skip}).json()
+
+    assert pages > 2
+    assert by_cursor == by_offset
+
+
+def test_bad_cursor_is_a_400(client):
+    response = client.get("/api/v1/data/pacientes", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
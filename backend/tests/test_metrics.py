@@ -0,0 +1,51 @@
+import re
+
+from app.metrics import PHASE_PROCESSING, Counter, Histogram, RequestTimings
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("h", "doc", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+
+    lines = histogram.render()
+
+    assert 'h_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'h_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'h_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'h_count{route="/x"} 4' in lines
+    assert 'h_sum{route="/x"} 4.05' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("c", "doc", ("path",))
+    counter.inc(('a"b\\',), 2)
+
+    assert counter.render()[-1] == 'c{path="a\\"b\\\\"} 2'
+
+
+def test_processing_is_the_unaccounted_remainder():
+    timings = RequestTimings()
+    timings.add("db_execute", 0.3)
+    timings.add("db_execute", 0.2)
+
+    assert timings.breakdown(0.8) == {"db_execute": 0.5, PHASE_PROCESSING: 0.8 - 0.5}
+    assert timings.breakdown(0.1)[PHASE_PROCESSING] == 0.0
+
+
+def _sample(text, pattern):
+    match = re.search(pattern + r" (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_endpoint_counts_requests_per_route_template(client):
+    route = r'route="/api/v1/data/pacientes",method="GET",status="200"'
+    before = _sample(client.get("/metrics").text, r"http_requests_total\{" + route + r"\}")
+
+    client.get("/api/v1/data/pacientes", params={"limit": 5})
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain")
+    assert _sample(response.text, r"http_requests_total\{" + route + r"\}") == before + 1
+    assert 'http_request_phase_seconds_count{route="/api/v1/data/pacientes",phase="db_execute"}' in response.text
+    assert "db_pool_max_sessions" in response.text
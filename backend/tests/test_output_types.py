@@ -0,0 +1,51 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import oracledb
+import pytest
+
+from app.api.query import _column_types, _convert_rows
+from app.database.connection import output_type_handler
+
+
+class RecordingCursor:
+    """Stands in for an oracledb cursor: records the variable type requested."""
+    arraysize = 100
+
+    def var(self, type_, arraysize):
+        return type_
+
+
+@pytest.mark.parametrize("type_code, precision, scale, expected", [
+    (oracledb.DB_TYPE_NUMBER, 10, 0, int),
+    (oracledb.DB_TYPE_NUMBER, 10, 2, float),
+    (oracledb.DB_TYPE_NUMBER, 0, -127, None),
+    (oracledb.DB_TYPE_CLOB, 0, 0, oracledb.DB_TYPE_LONG),
+    (oracledb.DB_TYPE_DATE, 0, 0, None),
+    (oracledb.DB_TYPE_VARCHAR, 0, 0, None),
+])
+def test_output_type_handler(type_code, precision, scale, expected):
+    metadata = SimpleNamespace(type_code=type_code, precision=precision, scale=scale)
+
+    assert output_type_handler(RecordingCursor(), metadata) == expected
+
+
+def test_column_types_from_oracle_description():
+    description = [("A", oracledb.DB_TYPE_NUMBER), ("B", oracledb.DB_TYPE_DATE), ("C", oracledb.DB_TYPE_VARCHAR),
+                   ("D", oracledb.DB_TYPE_NCLOB), ("E", oracledb.DB_TYPE_RAW)]
+
+    assert _column_types(description, []) == ["number", "datetime", "string", "string", "binary"]
+
+
+def test_column_types_from_sqlite_values():
+    description = [(name, None) for name in "ABCDE"]
+    rows = [(None, None, "x", b"y", None), (1.5, datetime(2020, 1, 1), "z", b"w", None)]
+
+    assert _column_types(description, rows) == ["number", "datetime", "string", "binary", "unknown"]
+
+
+def test_only_columns_needing_conversion_are_touched():
+    rows = [(1, b"abc"), (2, None)]
+
+    assert _convert_rows(["number", "string"], rows) is rows
+    assert _convert_rows(["number", "binary"], rows) == [[1, "abc"], [2, None]]
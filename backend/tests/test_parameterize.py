@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.sql_validator import parameterize_literals
+
+
+def test_literals_become_shared_binds():
+    sql, params = parameterize_literals("SELECT * FROM T WHERE EDAD > 50 AND SEXO = 'M' AND EDAD2 > 50")
+
+    assert sql == "SELECT * FROM T WHERE EDAD > :lit1 AND SEXO = :lit2 AND EDAD2 > :lit1"
+    assert params == {"lit1": 50, "lit2": "M"}
+
+
+def test_existing_binds_are_kept_and_names_do_not_clash():
+    sql, params = parameterize_literals("SELECT * FROM T WHERE A = :lit1 AND B = 'x'", {"lit1": 3})
+
+    assert sql == "SELECT * FROM T WHERE A = :lit1 AND B = :lit2"
+    assert params == {"lit1": 3, "lit2": "x"}
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT TO_CHAR(FECHA_INGRESO, 'YYYY-MM') FROM T",
+    "SELECT * FROM T WHERE F > DATE '2020-01-01'",
+    "SELECT EDAD + 1, COUNT(*) FROM T GROUP BY EDAD + 1",
+    "SELECT * FROM T ORDER BY 1",
+    "SELECT * FROM T WHERE F >= ADD_MONTHS(SYSDATE, -12)",
+])
+def test_structural_literals_are_kept(sql):
+    assert parameterize_literals(sql) == (sql, None)
+
+
+def test_parameterized_query_returns_the_same_rows(client):
+    query = "SELECT EDAD, SEXO FROM SALUD_MENTAL_FEATURED WHERE EDAD > 60 AND COMUNIDAD_AUTONOMA = 'madrid' ORDER BY 1, 2"
+
+    plain = client.post("/api/v1/query/execute", json={"query": query, "parameterize": False}).json()
+    bound = client.post("/api/v1/query/execute", json={"query": query, "parameterize": True}).json()
+
+    assert plain["data"] == bound["data"]
+    assert plain["rows_returned"] > 0
+    assert ":lit1" in bound["query_executed"]
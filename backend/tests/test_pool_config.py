@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.config import Settings, settings
+from app.database.connection import DatabaseConnection, db_connection
+from app.services.health_data_service import HealthDataService
+
+
+@pytest.mark.parametrize("pool_max, async_max, expected", [
+    (10, 4, (4, 6)),
+    (4, 4, (3, 1)),
+    (2, 1, (1, 1)),
+])
+def test_pool_max_is_split_between_the_pools(pool_max, async_max, expected):
+    config = Settings(ORACLE_POOL_MAX=pool_max, ORACLE_ASYNC_POOL_MAX=async_max)
+
+    assert (config.oracle_async_pool_max, config.oracle_blocking_pool_max) == expected
+    assert config.db_executor_max_workers == config.oracle_blocking_pool_max
+
+
+def test_pool_min_never_exceeds_the_pool_share(monkeypatch):
+    monkeypatch.setattr(settings, "ORACLE_POOL_MIN", 3)
+    # Wallet paths are only resolvable with the Oracle settings filled in
+    monkeypatch.setattr(Settings, "oracle_config_dir_absolute", "/wallet")
+    monkeypatch.setattr(Settings, "oracle_wallet_location_absolute", "/wallet")
+
+    assert (DatabaseConnection._pool_params(2)["min"], DatabaseConnection._pool_params(2)["max"]) == (2, 2)
+    assert DatabaseConnection._pool_params(6)["min"] == 3
+
+
+@pytest.mark.parametrize("method, args", [
+    ("get_diagnosticos_stats", ()),
+    ("get_tendencia_mensual", (2019,)),
+    ("get_pacientes_list", (0, 20)),
+])
+def test_async_service_matches_blocking_service(connection, method, args):
+    async def fetch():
+        async_connection = await db_connection.get_async_connection()
+        try:
+            return await getattr(HealthDataService, f"{method}_async")(async_connection, *args)
+        finally:
+            await async_connection.close()
+
+    assert asyncio.run(fetch()) == getattr(HealthDataService, method)(connection, *args)
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import oracledb
+
+from app.database.connection import AcquireMetrics
+
+
+def _error(full_code):
+    return oracledb.DatabaseError(SimpleNamespace(full_code=full_code, message=full_code, code=0))
+
+
+def test_acquire_outcomes_and_wait_percentiles():
+    metrics = AcquireMetrics(sample_size=100)
+    for wait_ms in range(1, 101):
+        metrics.record(wait_ms / 1000)
+    metrics.record(5.0, _error("DPY-4005"))
+    metrics.record(0.1, _error("ORA-12541"))
+
+    snapshot = metrics.snapshot()
+
+    assert (snapshot["acquired"], snapshot["timeouts"], snapshot["errors"]) == (100, 1, 1)
+    assert (snapshot["wait_ms_p50"], snapshot["wait_ms_p95"], snapshot["wait_ms_max"]) == (50.0, 95.0, 100.0)
+
+
+def test_empty_sample_has_no_percentiles():
+    assert AcquireMetrics().snapshot()["wait_ms_p99"] is None
+
+
+def test_pool_stats_endpoint(client):
+    client.get("/api/v1/data/pacientes", params={"limit": 1})
+
+    stats = client.get("/api/v1/pool/stats").json()
+
+    assert stats["backend"] == "sqlite"
+    assert stats["async_acquire"]["acquired"] + stats["acquire"]["acquired"] > 0
+    assert {"max_workers", "queue_depth", "wait_ms_p95"} <= set(stats["executor"])
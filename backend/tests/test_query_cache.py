@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.cache import normalize_sql, query_cache_key
+
+
+def test_normalization_ignores_layout_case_and_comments():
+    assert normalize_sql("select  *\n from t -- it's\n where a = 'Madrid';") == "SELECT * FROM T WHERE A = 'Madrid'"
+    assert query_cache_key("select 1 from dual", {"b": 2, "a": 1}, 10) == \
+        query_cache_key("SELECT 1\nFROM DUAL", {"a": 1, "b": 2}, 10)
+    assert query_cache_key("SELECT 1 FROM DUAL", None, 10) != query_cache_key("SELECT 1 FROM DUAL", None, 20)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("SELECT 'a' FROM DUAL", "SELECT 'A' FROM DUAL"),
+    ('SELECT "categoria" FROM T', 'SELECT "CATEGORIA" FROM T'),
+    ("SELECT 'x  y' FROM T -- it's", "SELECT 'X Y' FROM T -- it's"),
+    ("SELECT * FROM T WHERE A = :edad", "SELECT * FROM T WHERE A = :EDAD"),
+])
+def test_case_sensitive_text_keeps_keys_apart(a, b):
+    assert query_cache_key(a, None, 10) != query_cache_key(b, None, 10)
+
+
+def test_repeated_query_is_served_from_cache(client):
+    query = "SELECT SEXO, COUNT(*) AS TOTAL FROM SALUD_MENTAL_FEATURED WHERE EDAD > :edad GROUP BY SEXO ORDER BY 1"
+    first = client.post("/api/v1/query/execute", json={"query": query, "params": {"edad": 33}})
+    hits = client.get("/api/v1/query/cache").json()["hits"]
+
+    second = client.post("/api/v1/query/execute", json={"query": query.lower(),
+                                                        "params": {"edad": 33}})
+    bypass = client.post("/api/v1/query/execute", json={"query": query, "params": {"edad": 33}, "use_cache": False})
+
+    assert first.json()["data"] == second.json()["data"] == bypass.json()["data"]
+    assert client.get("/api/v1/query/cache").json()["hits"] == hits + 1
@@ -0,0 +1,94 @@
+from app.services.query_log import query_log
+from app.services.workload import query_workload
+
+EXPORT_QUERY = "SELECT EDAD, SEXO FROM SALUD_MENTAL_FEATURED WHERE EDAD > 90;"
+
+
+def test_export_strips_terminator_and_streams_all_rows(client, connection):
+    expected = connection.cursor().execute("SELECT COUNT(*) FROM SALUD_MENTAL_FEATURED WHERE EDAD > 90").fetchone()[0]
+
+    response = client.post("/api/v1/query/export", json={"query": EXPORT_QUERY, "format": "csv", "batch_size": 7})
+
+    assert response.status_code == 200
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "EDAD,SEXO"
+    assert len(lines) - 1 == expected
+
+
+def test_export_is_tracked_in_workload_and_query_log(client):
+    before = {s["sql_id"]: s["calls"] for s in query_log.stats()["statements"]}
+
+    response = client.post("/api/v1/query/export", json={"query": EXPORT_QUERY, "format": "ndjson"})
+    assert response.status_code == 200
+
+    fingerprints = query_workload.top(source="export")["top"]
+    assert any("SALUD_MENTAL_FEATURED" in f["fingerprint"] for f in fingerprints)
+    statements = {s["sql_id"]: s for s in query_log.stats()["statements"]}
+    grown = [s for sql_id, s in statements.items() if s["calls"] > before.get(sql_id, 0)]
+    assert [s["rows"] > 0 and s["round_trips"] >= 2 for s in grown] == [True]
+
+
+def test_failed_export_is_recorded_as_error(client):
+    response = client.post("/api/v1/query/export", json={"query": "SELECT NOPE FROM SALUD_MENTAL_FEATURED"})
+
+    assert response.status_code == 400
+    fingerprints = query_workload.top(source="export")["top"]
+    assert any("NOPE" in f["fingerprint"] and f["errors"] == 1 for f in fingerprints)
+
+
+def test_connection_is_released_when_the_body_never_starts(client, monkeypatch):
+    import asyncio
+    import json
+
+    import main
+    from app.database.sqlite_backend import AsyncSQLiteConnection
+
+    closed = []
+    original_close = AsyncSQLiteConnection.close
+
+    async def close(self):
+        closed.append(self)
+        await original_close(self)
+
+    monkeypatch.setattr(AsyncSQLiteConnection, "close", close)
+    body = json.dumps({"query": "SELECT EDAD FROM SALUD_MENTAL_FEATURED WHERE EDAD < 3"}).encode()
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "POST", "scheme": "http", "path": "/api/v1/query/export",
+        "raw_path": b"/api/v1/query/export", "root_path": "", "query_string": b"", "server": ("test", 80),
+        "client": ("test", 1), "headers": [(b"content-type", b"application/json")]
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("connection reset")
+
+    async def scenario():
+        try:
+            await main.app(scope, receive, send)
+        except OSError:
+            pass
+
+    before = _export_errors()
+    asyncio.run(scenario())
+
+    assert len(closed) == 1
+    assert _export_errors() == before + 1
+
+
+def _export_errors():
+    return sum(f["errors"] for f in query_workload.top(source="export")["top"] if "EDAD < ?" in f["fingerprint"])
+
+
+def test_distinct_exports_do_not_grow_the_query_log_past_its_cap(client, monkeypatch):
+    monkeypatch.setattr(query_log, "max_statements", 3)
+
+    for edad in range(5):
+        client.post("/api/v1/query/export", json={"query": f"SELECT EDAD FROM SALUD_MENTAL_FEATURED WHERE EDAD = {edad}"})
+
+    assert len(query_log.stats()["statements"]) <= 3
@@ -0,0 +1,36 @@
+from app.services.health_data_service import STATEMENT_NAMES, WARMUP_STATEMENTS, HealthDataService
+from app.services.query_log import QueryLog, query_log, sql_id
+
+
+def test_every_service_statement_has_a_name():
+    assert set(WARMUP_STATEMENTS) <= set(STATEMENT_NAMES)
+    assert len(set(STATEMENT_NAMES.values())) == len(STATEMENT_NAMES)
+
+
+def test_service_queries_are_logged_by_name(connection):
+    HealthDataService.get_edad_distribution(connection)
+
+    names = {s["name"] for s in query_log.stats()["statements"]}
+    assert "edad_distribution" in names
+
+
+def test_totals_ignore_whitespace_and_count_errors():
+    log = QueryLog(slowest_size=2, slow_ms=None)
+    log.record("SELECT 1\n  FROM DUAL", {"id": 1}, 1, 2, 0.001, 0.002)
+    log.record("SELECT 1 FROM DUAL", None, 0, 1, 0.001, 0.0, RuntimeError("x"))
+
+    stats = log.stats()
+    [totals] = stats["statements"]
+    assert totals["sql_id"] == sql_id("SELECT 1 FROM DUAL")
+    assert (totals["calls"], totals["errors"], totals["rows"], totals["round_trips"]) == (2, 1, 1, 3)
+    assert len(stats["slowest"]) == 2
+
+
+def test_least_recently_run_statements_are_evicted():
+    log = QueryLog(slowest_size=0, max_statements=2)
+    for table in ("A", "B", "A", "C"):
+        log.record(f"SELECT * FROM {table}", None, 1, 1, 0.001, 0.0)
+
+    stats = log.stats()
+    assert {s["statement"] for s in stats["statements"]} == {"SELECT * FROM A", "SELECT * FROM C"}
+    assert stats["evicted_statements"] == 1
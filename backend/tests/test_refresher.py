@@ -0,0 +1,67 @@
+import asyncio
+
+from app.services.cache import DatasetVersion, ResultCache, StatisticsCache
+from app.services.refresher import DEFAULT_TARGETS, StatisticsRefresher
+
+
+class FakeVersion(DatasetVersion):
+    def __init__(self):
+        super().__init__(check_interval=0.0)
+        self.next = 1
+
+    async def _probe(self):
+        return self.next
+
+
+class SlowCache(StatisticsCache):
+    loads = []
+
+    @staticmethod
+    async def load(method_name, *args):
+        await asyncio.sleep(0.02)
+        SlowCache.loads.append(method_name)
+        if method_name == "get_temporal_trends":
+            raise RuntimeError("boom")
+        return len(SlowCache.loads)
+
+    @staticmethod
+    async def load_dashboard():
+        SlowCache.loads.append("dashboard")
+        return {}
+
+
+def test_stale_value_is_served_while_revalidating():
+    SlowCache.loads = []
+
+    async def scenario():
+        version = FakeVersion()
+        cache = SlowCache(ResultCache("test", max_bytes=10000), version, stale_while_revalidate=True)
+        first = await cache.get("get_tendencia_mensual", None)
+        version.next = 2
+        stale = await cache.get("get_tendencia_mensual", None)
+        await asyncio.sleep(0.05)
+        fresh = await cache.get("get_tendencia_mensual", None)
+        return cache, (first, stale, fresh)
+
+    cache, values = asyncio.run(scenario())
+
+    assert values == (1, 1, 2)
+    assert cache.stale_served == 1
+
+
+def test_refresh_all_scans_once_for_the_breakdowns_and_counts_failures():
+    SlowCache.loads = []
+
+    async def scenario():
+        version = FakeVersion()
+        cache = SlowCache(ResultCache("test", max_bytes=10000), version, stale_while_revalidate=True)
+        refresher = StatisticsRefresher(cache, version, interval=60)
+        for target in DEFAULT_TARGETS:
+            refresher.register(*target)
+        await refresher.refresh_all()
+        return refresher
+
+    refresher = asyncio.run(scenario())
+
+    assert sorted(SlowCache.loads) == ["dashboard", "get_temporal_trends", "get_tendencia_mensual"]
+    assert (refresher.refreshes, refresher.failures) == (1, 1)
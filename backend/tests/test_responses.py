@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.api import responses
+from app.api.responses import FastJSONResponse
+from app.models.schemas import IngresoResumen, PacienteResumen
+
+CONTENT = {
+    "fecha": date(2020, 5, 1),
+    "momento": datetime(2020, 5, 1, 8, 30),
+    "coste": Decimal("12.50"),
+    "nombre": "Señora Núñez",
+    "lista": [1, None, 2.5],
+}
+EXPECTED = {
+    "fecha": "2020-05-01",
+    "momento": "2020-05-01T08:30:00",
+    "coste": 12.5,
+    "nombre": "Señora Núñez",
+    "lista": [1, None, 2.5],
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_both_encoders_render_the_same_document(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+
+    assert json.loads(FastJSONResponse(CONTENT).body) == EXPECTED
+
+
+@pytest.mark.parametrize("path, model", [
+    ("/api/v1/data/pacientes", PacienteResumen),
+    ("/api/v1/data/ingresos", IngresoResumen),
+])
+def test_unvalidated_rows_still_match_the_response_model(client, path, model):
+    rows = client.get(path, params={"limit": 50}).json()
+
+    assert rows
+    for row in rows:
+        assert model.model_validate(row).model_dump(mode="json", by_alias=True) == row
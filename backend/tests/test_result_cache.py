@@ -0,0 +1,106 @@
+import asyncio
+
+from app.services.cache import MISSING, DatasetVersion, ResultCache, StatisticsCache
+
+
+def test_entries_are_tagged_with_the_dataset_version():
+    cache = ResultCache("test", max_bytes=1000)
+    cache.put(("a",), 1, [1, 2])
+
+    assert cache.get(("a",), 1) == [1, 2]
+    assert cache.get(("a",), 2) is MISSING
+    assert cache.get(("a",), 1) is MISSING
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_by_byte_budget():
+    cache = ResultCache("test", max_bytes=10)
+    cache.put("a", 1, "x", size=4)
+    cache.put("b", 1, "y", size=4)
+    cache.get("a", 1)
+    cache.put("c", 1, "z", size=4)
+    cache.put("huge", 1, "w", size=11)
+
+    assert cache.get("b", 1) is MISSING
+    assert cache.get("a", 1) == "x" and cache.get("c", 1) == "z"
+    assert cache.get("huge", 1) is MISSING
+    assert cache.stats()["evictions"] == 1
+
+
+def test_keep_stale_entries_stay_available_to_peek():
+    cache = ResultCache("test", max_bytes=100, keep_stale=True)
+    cache.put("a", 1, "old")
+
+    assert cache.get("a", 2) is MISSING
+    assert cache.peek("a") == "old"
+
+
+class FakeVersion(DatasetVersion):
+    """DatasetVersion whose probe returns ``self.next`` instead of querying."""
+
+    def __init__(self, check_interval=0.0):
+        super().__init__(check_interval)
+        self.next = (100, 1)
+        self.probes = 0
+
+    async def _probe(self):
+        self.probes += 1
+        return self.next
+
+
+def test_version_probe_is_rate_limited_and_notifies_changes():
+    changes = []
+
+    async def scenario():
+        version = FakeVersion(check_interval=60)
+        version.subscribe(lambda old, new: changes.append((old, new)))
+        await version.current()
+        await version.current()
+        version.next = (101, 2)
+        unchanged = await version.current()
+        changed = await version.current(force=True)
+        return version, unchanged, changed
+
+    version, unchanged, changed = asyncio.run(scenario())
+
+    assert version.probes == 2
+    assert (unchanged, changed) == ((100, 1), (101, 2))
+    assert changes == [((100, 1), (101, 2))]
+
+
+class CountingCache(StatisticsCache):
+    loads = 0
+
+    @staticmethod
+    async def load(method_name, *args):
+        CountingCache.loads += 1
+        return [method_name, CountingCache.loads]
+
+
+def test_statistics_cache_reloads_after_a_dataset_change():
+    CountingCache.loads = 0
+
+    async def scenario():
+        version = FakeVersion()
+        cache = CountingCache(ResultCache("test", max_bytes=10000), version)
+        first = await cache.get("get_tendencia_mensual", 2019)
+        again = await cache.get("get_tendencia_mensual", 2019)
+        version.next = (101, 2)
+        changed = await cache.get("get_tendencia_mensual", 2019)
+        return first, again, changed
+
+    first, again, changed = asyncio.run(scenario())
+
+    assert first == again == ["get_tendencia_mensual", 1]
+    assert changed == ["get_tendencia_mensual", 2]
+
+
+def test_statistics_endpoint_is_served_from_cache(client):
+    from app.services.cache import statistics_cache
+
+    client.get("/api/v1/statistics/comunidad-autonoma")
+    hits = statistics_cache.cache.stats()["hits"]
+    response = client.get("/api/v1/statistics/comunidad-autonoma")
+
+    assert response.status_code == 200
+    assert statistics_cache.cache.stats()["hits"] == hits + 1
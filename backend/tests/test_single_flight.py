@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def scenario():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(*(flight.do("k", load, 21) for _ in range(5)), flight.do("other", load, 1))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+
+    assert results == [42] * 5 + [2]
+    assert calls == [21, 1]
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    attempts = []
+
+    async def fail():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await flight.do("k", fail)
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert len(attempts) == 2
+
+
+@pytest.mark.parametrize("cancel_abandoned, finished", [(True, False), (False, True)])
+def test_abandoned_execution(cancel_abandoned, finished):
+    done = []
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        done.append(True)
+
+    async def scenario():
+        flight = SingleFlight("test", cancel_abandoned=cancel_abandoned)
+        caller = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        return flight
+
+    flight = asyncio.run(scenario())
+
+    assert bool(done) is finished
+    assert flight.stats()["abandoned"] == (0 if finished else 1)
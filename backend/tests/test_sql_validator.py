@@ -0,0 +1,76 @@
+import pytest
+
+from app.services.sql_validator import apply_row_limit, parse_query, strip_terminator, validate_select_query
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM SALUD_MENTAL_FEATURED",
+    "  select 1 from dual;",
+    "WITH t AS (SELECT EDAD FROM SALUD_MENTAL_FEATURED) SELECT * FROM t",
+    "(SELECT 1 FROM DUAL) UNION (SELECT 2 FROM DUAL)",
+    "SELECT 'DROP TABLE X; DELETE' FROM DUAL",
+    'SELECT "UPDATE" FROM DUAL',
+    "SELECT 1 FROM DUAL -- ; DROP TABLE X",
+    "SELECT q'[it's; DELETE]' FROM DUAL",
+])
+def test_accepts_single_select(sql):
+    assert validate_select_query(sql).statement_type == "SELECT"
+
+
+@pytest.mark.parametrize("sql, message", [
+    ("DELETE FROM SALUD_MENTAL_FEATURED", "Only SELECT"),
+    ("", "Only SELECT"),
+    ("SELECT 1 FROM DUAL; SELECT 2 FROM DUAL", "Multiple statements"),
+    ("SELECT * FROM T FOR UPDATE", "'UPDATE'"),
+    ("WITH d AS (DELETE FROM T) SELECT 1 FROM DUAL", "'DELETE'"),
+    ("SELECT 1 FROM DUAL /* c */ ; DROP TABLE T", "'DROP'"),
+])
+def test_rejects(sql, message):
+    with pytest.raises(ValueError, match=message):
+        validate_select_query(sql)
+
+
+def test_limit_detection_ignores_subqueries_and_literals():
+    assert not parse_query("SELECT * FROM (SELECT * FROM T FETCH FIRST 5 ROWS ONLY)").has_limit
+    assert not parse_query("SELECT 'FETCH FIRST 5 ROWS ONLY' FROM T").has_limit
+    assert parse_query("SELECT * FROM T WHERE ROWNUM <= 5").limit_clause == "ROWNUM"
+    assert parse_query("SELECT * FROM T FETCH NEXT 7 ROWS ONLY").limit_value == 7
+    assert parse_query("SELECT * FROM T FETCH FIRST :n ROWS ONLY").limit_value is None
+    assert parse_query("SELECT * FROM T FETCH FIRST 5 PERCENT ROWS ONLY").limit_value is None
+
+
+@pytest.mark.parametrize("sql, limit, expected", [
+    ("SELECT * FROM T", 100, "SELECT * FROM T FETCH FIRST 100 ROWS ONLY"),
+    ("SELECT * FROM T;", 100, "SELECT * FROM T FETCH FIRST 100 ROWS ONLY"),
+    ("SELECT * FROM T -- note", 10, "SELECT * FROM T -- note\nFETCH FIRST 10 ROWS ONLY"),
+    ("SELECT * FROM T FETCH FIRST 5 ROWS ONLY", 100, "SELECT * FROM T FETCH FIRST 5 ROWS ONLY"),
+    ("SELECT * FROM PACIENTES FETCH FIRST 500000 ROWS ONLY", 100,
+     "SELECT * FROM PACIENTES FETCH FIRST 100 ROWS ONLY"),
+    ("SELECT * FROM T LIMIT 1000;", 10, "SELECT * FROM T LIMIT 10"),
+    ("SELECT * FROM T WHERE ROWNUM < 1000", 10, "SELECT * FROM T WHERE ROWNUM < 1000"),
+    ("SELECT * FROM T FETCH FIRST 50 PERCENT ROWS ONLY", 10, "SELECT * FROM T FETCH FIRST 50 PERCENT ROWS ONLY"),
+    ("SELECT * FROM T;", None, "SELECT * FROM T"),
+    ("SELECT * FROM T ; ;", None, "SELECT * FROM T"),
+    ("SELECT ';' FROM T", None, "SELECT ';' FROM T"),
+])
+def test_apply_row_limit(sql, limit, expected):
+    assert apply_row_limit(sql, limit) == expected
+
+
+def test_strip_terminator_keeps_text_without_one():
+    sql = "SELECT 1 FROM DUAL "
+    assert strip_terminator(sql) is sql
+
+
+@pytest.mark.parametrize("sql, tables", [
+    ("SELECT * FROM SALUD_MENTAL_FEATURED", ("SALUD_MENTAL_FEATURED",)),
+    ("select a.x from hr.emp a join dept d on a.d = d.id, bonus b", ("HR.EMP", "DEPT", "BONUS")),
+    ("WITH t AS (SELECT EDAD FROM SALUD_MENTAL_FEATURED) SELECT * FROM t", ("SALUD_MENTAL_FEATURED",)),
+    ("SELECT * FROM (SELECT * FROM A) x LEFT OUTER JOIN B ON 1 = 1", ("A", "B")),
+    ("SELECT EXTRACT(YEAR FROM FECHA_INGRESO) FROM T", ("T",)),
+    ("SELECT 'FROM X' FROM \"Mixed\" -- FROM Y", ('"Mixed"',)),
+    ("SELECT a, b FROM (SELECT 1 a FROM DUAL) s, C WHERE x IN (SELECT y FROM D) ORDER BY a, b", ("DUAL", "C", "D")),
+    ("WITH t AS (SELECT 1 FROM A), u AS (SELECT 2 FROM t) SELECT * FROM u JOIN B USING (k, j)", ("A", "B")),
+])
+def test_referenced_tables(sql, tables):
+    assert parse_query(sql).tables == tables
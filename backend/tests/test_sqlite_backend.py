@@ -0,0 +1,94 @@
+import threading
+
+import oracledb
+import pytest
+
+from app.database.connection import is_call_timeout, is_query_error
+from app.database.sqlite_backend import translate_sql
+
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000000) "
+    "SELECT COUNT(*) FROM c"
+)
+
+
+@pytest.mark.parametrize("oracle, sqlite", [
+    ("SELECT * FROM T OFFSET :skip ROWS FETCH NEXT :limit ROWS ONLY", "SELECT * FROM T LIMIT :limit OFFSET :skip"),
+    ("SELECT * FROM T FETCH FIRST 20 ROWS ONLY", "SELECT * FROM T LIMIT 20"),
+    ("SELECT EXTRACT(YEAR FROM FECHA_INGRESO) FROM T",
+     "SELECT CAST(strftime('%Y', FECHA_INGRESO) AS INTEGER) FROM T"),
+    ("SELECT TO_CHAR(FECHA_INGRESO, 'YYYY-MM') FROM T", "SELECT strftime('%Y-%m', FECHA_INGRESO) FROM T"),
+    ("WHERE F >= ADD_MONTHS(SYSDATE, -12)", "WHERE F >= date(date('now'), '-12 months')"),
+    ("SELECT NVL(EDAD, 0) FROM DUAL", "SELECT IFNULL(EDAD, 0)"),
+    ("SELECT COUNT(*), MAX(ORA_ROWSCN) FROM T", "SELECT COUNT(*), MAX(rowid) FROM T"),
+    ("SELECT ROWIDTOCHAR(ROWID) FROM T WHERE ROWID > CHARTOROWID(:last_rowid)",
+     "SELECT rowid FROM T WHERE ROWID > :last_rowid"),
+])
+def test_translate_sql(oracle, sqlite):
+    assert translate_sql(oracle) == sqlite
+
+
+def test_service_statements_survive_the_shim(connection):
+    from app.services.health_data_service import WARMUP_STATEMENTS
+    from app.services.stats_engine import dashboard_stats_sql
+
+    cursor = connection.cursor()
+    for statement in WARMUP_STATEMENTS + (dashboard_stats_sql(),):
+        cursor.parse(statement)
+    cursor.close()
+
+
+@pytest.mark.parametrize("sql, full_code", [
+    ("SELECT NOPE FROM SALUD_MENTAL_FEATURED", "ORA-00904"),
+    ("SELECT * FROM NOPE", "ORA-00942"),
+    ("SELECT FROM WHERE", "ORA-00900"),
+    ("SELECT * FROM SALUD_MENTAL_FEATURED WHERE EDAD > :edad", "ORA-01008"),
+])
+def test_query_errors_are_raised_as_oracle_errors(connection, sql, full_code):
+    with pytest.raises(oracledb.DatabaseError) as info:
+        connection.cursor().execute(sql)
+
+    assert info.value.args[0].full_code == full_code
+    assert str(info.value.args[0]).startswith(full_code)
+    assert is_query_error(info.value)
+    assert not is_call_timeout(info.value)
+
+
+def test_call_timeout_raises_dpy_4024(connection):
+    connection.call_timeout = 100
+
+    with pytest.raises(oracledb.Error) as info:
+        connection.cursor().execute(SLOW_QUERY).fetchall()
+
+    assert is_call_timeout(info.value)
+    assert not is_query_error(info.value)
+
+
+def test_cancel_raises_ora_01013(connection):
+    timer = threading.Timer(0.1, connection.cancel)
+    timer.start()
+    try:
+        with pytest.raises(oracledb.Error) as info:
+            connection.cursor().execute(SLOW_QUERY).fetchall()
+    finally:
+        timer.cancel()
+
+    assert info.value.args[0].full_code == "ORA-01013"
+    assert not is_call_timeout(info.value)
+
+
+def test_bad_custom_query_is_a_400(client):
+    response = client.post("/api/v1/query/execute", json={"query": "SELECT NOPE FROM SALUD_MENTAL_FEATURED"})
+
+    assert response.status_code == 400
+    assert "ORA-00904" in response.json()["detail"]
+
+
+def test_statement_timeout_is_a_504(client, monkeypatch):
+    from app.database.connection import db_connection
+
+    # Connections of this request get a 100 ms call_timeout
+    monkeypatch.setattr(db_connection, "_call_timeout", lambda: 100)
+    response = client.post("/api/v1/query/execute", json={"query": SLOW_QUERY, "limit": 1})
+
+    assert response.status_code == 504
@@ -0,0 +1,26 @@
+from app.services.cache import statistics_cache
+
+
+def test_failed_section_is_empty_list_and_listed_in_errores(client, monkeypatch):
+    original = statistics_cache.get
+
+    async def get(method_name, *args):
+        if method_name == "get_servicio_stats":
+            raise RuntimeError("boom")
+        return await original(method_name, *args)
+
+    monkeypatch.setattr(statistics_cache, "get", get)
+    body = client.get("/api/v1/statistics/dashboard").json()
+
+    assert body["servicio"] == []
+    assert body["errores"] == {"servicio": "boom"}
+    assert body["parcial"] is True
+    assert body["edad"]
+
+
+def test_complete_dashboard_has_no_errores(client):
+    body = client.get("/api/v1/statistics/dashboard").json()
+
+    assert body["errores"] == {}
+    assert body["parcial"] is False
+    assert all(body[field] for field in ("diagnosticos", "edad", "sexo", "servicio"))
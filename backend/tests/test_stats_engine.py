@@ -0,0 +1,55 @@
+from app.services.health_data_service import HealthDataService
+from app.services.stats_engine import StatsEngine
+
+
+def _ties_unordered(rows):
+    """Per-dimension queries leave the order of equal totals unspecified."""
+    return sorted(sorted(row.items()) for row in rows)
+
+
+def test_engine_matches_per_query_path(connection):
+    engine = StatsEngine.compute(connection)
+
+    assert set(engine) == set(StatsEngine.METHODS.values())
+    for method, rows in engine.items():
+        expected = getattr(HealthDataService, method)(connection)
+        assert _ties_unordered(rows) == _ties_unordered(expected), method
+        assert [row["total"] for row in rows] == [row["total"] for row in expected], method
+
+
+def test_banded_sections_keep_band_order(connection):
+    engine = StatsEngine.compute(connection)
+
+    assert engine["get_edad_distribution"] == HealthDataService.get_edad_distribution(connection)
+    assert engine["get_duracion_estancia"] == HealthDataService.get_duracion_estancia(connection)
+
+
+def test_sexo_codes_are_not_merged():
+    rows = [
+        ("sexo", None, None, 1, None, None, None, None, 10),
+        ("sexo", None, None, 9, None, None, None, None, 4),
+        ("sexo", None, None, 0, None, None, None, None, 6),
+    ]
+
+    assert StatsEngine._shape(rows)["get_genero_distribution"] == [
+        {"sexo": "Hombre", "total": 10, "porcentaje": 50.0},
+        {"sexo": "Otro", "total": 6, "porcentaje": 30.0},
+        {"sexo": "Otro", "total": 4, "porcentaje": 20.0},
+    ]
+
+
+def test_circunstancia_uses_tipo_ingreso_key():
+    rows = [("circunstancia", None, None, None, 2, None, None, None, 3)]
+
+    assert StatsEngine._shape(rows)["get_tipo_ingreso_stats"] == [
+        {"tipo_ingreso": "2", "total": 3, "porcentaje": 100.0}
+    ]
+
+
+def test_servicio_keeps_top_20_with_percent_over_all():
+    rows = [("servicio", None, None, None, None, None, None, f"S{i:02d}", 1) for i in range(25)]
+
+    servicio = StatsEngine._shape(rows)["get_servicio_stats"]
+
+    assert len(servicio) == 20
+    assert all(row["porcentaje"] == 4.0 for row in servicio)
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import oracledb
+
+from app.database.connection import DatabaseConnection, db_connection
+from app.services.health_data_service import WARMUP_STATEMENTS
+
+BROKEN = "SELECT NOPE FROM SALUD_MENTAL_FEATURED"
+
+
+class ParseRecorder:
+    """Connection stand-in recording what the session callback parses."""
+
+    def __init__(self):
+        self.parsed = []
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def parse(self, statement):
+        if statement == BROKEN:
+            raise oracledb.DatabaseError(SimpleNamespace(full_code="ORA-00904", message="invalid identifier", code=904))
+        self.parsed.append(statement)
+
+    def close(self):
+        self.closed = True
+
+
+def test_session_callback_preparses_registered_statements(caplog, monkeypatch):
+    manager = DatabaseConnection()
+    monkeypatch.setattr(manager, "_warmup_statements", ("SELECT 1 FROM DUAL", BROKEN, "SELECT 2 FROM DUAL"))
+    connection = ParseRecorder()
+
+    manager._init_session(connection, None)
+
+    assert connection.parsed == ["SELECT 1 FROM DUAL", "SELECT 2 FROM DUAL"]
+    assert connection.closed
+    assert "Could not pre-parse warm-up statement" in caplog.text
+
+
+def test_startup_registers_the_service_statements(client):
+    assert set(WARMUP_STATEMENTS) <= set(db_connection._warmup_statements)
+
+
+def test_warm_up_reports_statements_the_backend_cannot_parse(caplog, monkeypatch):
+    monkeypatch.setattr(db_connection, "_warmup_statements", WARMUP_STATEMENTS + (BROKEN,))
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(db_connection.warm_up())
+
+    assert caplog.text.count("Warm-up statement not supported") == 1
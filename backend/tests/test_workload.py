@@ -0,0 +1,60 @@
+import pytest
+
+from app.services.workload import WorkloadStats, fingerprint
+
+
+@pytest.mark.parametrize("a, b", [
+    ("select * from t where a = 5 and b in ('x','y')", "SELECT *\nFROM T WHERE A = 7 AND B IN ('z', 'w', 'v');"),
+    ("SELECT * FROM T WHERE A = :a -- first", "select * from t where a = /* c */ 'q'"),
+])
+def test_literal_variants_share_a_fingerprint(a, b):
+    assert fingerprint(a) == fingerprint(b)
+
+
+def test_fingerprint_text():
+    assert fingerprint("select * from t where a = 5 and b in ('x','y')") == \
+        "SELECT * FROM T WHERE A = ? AND B IN (?, ...)"
+    assert fingerprint("SELECT A FROM T") != fingerprint("SELECT B FROM T")
+
+
+def test_track_aggregates_and_top_sorts():
+    stats = WorkloadStats(max_fingerprints=10)
+    for value in range(3):
+        with stats.track("query", f"SELECT * FROM T WHERE A = {value}") as run:
+            run.rows = 10
+    with pytest.raises(RuntimeError):
+        with stats.track("ai", "SELECT * FROM U"):
+            raise RuntimeError("boom")
+
+    by_calls = stats.top(sort="calls")["top"]
+    assert [(s["calls"], s["rows"], s["errors"]) for s in by_calls] == [(3, 30, 0), (1, 0, 1)]
+    assert [s["fingerprint"] for s in stats.top(source="ai")["top"]] == ["SELECT * FROM U"]
+    assert stats.top(sort="error_rate")["top"][0]["error_rate"] == 1.0
+
+
+def test_least_recently_seen_fingerprints_are_evicted():
+    stats = WorkloadStats(max_fingerprints=2)
+    for table in ("A", "B", "A", "C"):
+        stats.record("query", f"SELECT * FROM {table}", 0.001, 1)
+
+    assert {s["fingerprint"] for s in stats.top()["top"]} == {"SELECT * FROM A", "SELECT * FROM C"}
+    assert stats.evicted == 1
+
+
+def test_workload_endpoint_reports_custom_queries(client):
+    client.post("/api/v1/query/execute", json={"query": "SELECT COUNT(*) FROM SALUD_MENTAL_FEATURED WHERE EDAD > 81"})
+
+    response = client.get("/api/v1/query/workload", params={"source": "query", "sort": "calls"})
+
+    assert response.status_code == 200
+    assert any("EDAD > ?" in s["fingerprint"] for s in response.json()["top"])
+    assert client.get("/api/v1/query/workload", params={"sort": "nope"}).status_code == 400
+
+
+def test_schema_lookup_is_not_counted_as_a_custom_query(client):
+    from app.services.workload import query_workload
+
+    before = query_workload.top(limit=500)["calls"]
+    client.get("/api/v1/query/schema")
+
+    assert query_workload.top(limit=500)["calls"] == before
@@ -54,6 +54,20 @@ export interface TendenciaMensual {
   total: number;
 }
 
+export interface DashboardStats {
+  diagnosticos: DiagnosticoStats[];
+  edad: EdadStats[];
+  sexo: SexoStats[];
+  circunstancia_contacto: DiagnosticoStats[];
+  tendencia_mensual: TendenciaMensual[];
+  duracion_estancia: EstanciaStats[];
+  comunidad_autonoma: ComunidadStats[];
+  servicio: ServicioStats[];
+  errores: Record<string, string>;
+  parcial: boolean;
+  tiempo_ms: number;
+}
+
 export interface CustomQueryRequest {
   query: string;
   params?: Record<string, any>;
@@ -153,6 +167,15 @@ export async function getTendenciaMensual(year?: number): Promise<TendenciaMensu
   return fetchAPI<TendenciaMensual[]>(`/statistics/tendencia-mensual${yearParam}`);
 }
 
+/**
+ * All dashboard distributions in a single request.
+ * Sections that failed or timed out are empty arrays and listed in `errores`.
+ */
+export async function getDashboardStats(year?: number): Promise<DashboardStats> {
+  const yearParam = year ? `?year=${year}` : '';
+  return fetchAPI<DashboardStats>(`/statistics/dashboard${yearParam}`);
+}
+
 /**
  * Custom Query Endpoints
  */
@@ -378,6 +401,7 @@ export default {
   getServicioStats,
   getEstanciaStats,
   getTendenciaMensual,
+  getDashboardStats,
   executeCustomQuery,
   getQueryExamples,
   getTableSchema,